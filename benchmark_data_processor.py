@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmarks do processamento de dados do FalaChefe Python.
+Mede a escalabilidade das rotinas vetorizadas do DataProcessor.
+
+Uso:
+    python benchmark_data_processor.py
+    python benchmark_data_processor.py --businesses 100000 --months 12
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.core.financial_analysis import analyze_financial_frame
+from src.core.financial_forecast import forecast_financial_frame
+from src.core.cash_simulator import simulate_cash_runway
+from src.core.financial_statements import FinancialStatementEngine
+from src.core.transaction_categorizer import TransactionCategorizer
+
+
+def build_financial_frame(businesses: int, months: int, seed: int = 42) -> pd.DataFrame:
+    """Gera um lote sintético de dados financeiros mensais."""
+    rng = np.random.default_rng(seed)
+    rows = businesses * months
+
+    revenue = rng.lognormal(mean=10.5, sigma=0.6, size=rows)
+    return pd.DataFrame({
+        "business_id": np.repeat(np.arange(businesses), months),
+        "period": np.tile(pd.period_range("2025-01", periods=months, freq="M").astype(str), businesses),
+        "revenue": revenue,
+        "expense_operational": revenue * rng.uniform(0.3, 0.6, rows),
+        "expense_marketing": revenue * rng.uniform(0.05, 0.2, rows),
+        "expense_administrative": revenue * rng.uniform(0.05, 0.15, rows),
+        "cash_inflow": revenue,
+        "cash_outflow": revenue * rng.uniform(0.6, 1.1, rows)
+    })
+
+
+def build_ledger(rows: int, businesses: int, seed: int = 42) -> pd.DataFrame:
+    """Gera um ledger sintético de transações."""
+    rng = np.random.default_rng(seed)
+    categories = np.array(["Vendas", "Fornecedores", "Salários", "Aluguel", "Marketing", "Simples Nacional", "Juros", "Outros"])
+    return pd.DataFrame({
+        "business_id": rng.integers(0, businesses, rows).astype(str),
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 730, rows), unit="D"),
+        "amount": rng.normal(0, 1000, rows).round(2),
+        "category": categories[rng.integers(0, len(categories), rows)]
+    })
+
+
+def bench_financial_batch(businesses: int, months: int) -> None:
+    """Mede a análise financeira em lote para tamanhos crescentes."""
+    print("== Análise financeira em lote ==")
+    sizes = sorted({max(businesses // 100, 1), max(businesses // 10, 1), businesses})
+
+    for size in sizes:
+        frame = build_financial_frame(size, months)
+        start = time.perf_counter()
+        result = analyze_financial_frame(frame)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{size:>8} negócios x {months:>2} meses = {len(result):>9} linhas | "
+            f"{elapsed * 1000:9.1f} ms | {len(result) / elapsed:12,.0f} linhas/s"
+        )
+
+
+def bench_financial_forecast(businesses: int, months: int) -> None:
+    """Mede a previsão financeira em lote para tamanhos crescentes."""
+    print("== Previsão financeira em lote ==")
+    sizes = sorted({max(businesses // 100, 1), max(businesses // 10, 1), businesses})
+
+    for size in sizes:
+        frame = build_financial_frame(size, months)
+        start = time.perf_counter()
+        result = forecast_financial_frame(frame, horizon=12)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{size:>8} negócios x {months:>2} meses -> {len(result):>9} previsões | "
+            f"{elapsed * 1000:9.1f} ms | {size / elapsed:12,.0f} negócios/s"
+        )
+
+
+def bench_cash_runway(months: int, repeats: int = 20) -> None:
+    """Mede a simulação de caixa de um negócio (latência por chamada)."""
+    print("== Simulação de caixa (Monte Carlo) ==")
+    frame = build_financial_frame(1, months)
+    revenue = frame["revenue"].to_numpy()
+    expenses = frame[["expense_operational", "expense_marketing", "expense_administrative"]].sum(axis=1).to_numpy()
+
+    for paths in (10000, 20000, 50000):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            simulate_cash_runway(revenue.sum() * 0.1, revenue, expenses, months=12, paths=paths)
+        elapsed = (time.perf_counter() - start) / repeats
+        print(f"{paths:>8} trajetórias x 12 meses | {elapsed * 1000:9.1f} ms por negócio")
+
+
+def bench_ledger_statements(rows: int, businesses: int) -> None:
+    """Mede a geração de DRE e fluxo de caixa a partir de um ledger."""
+    print("== DRE e fluxo de caixa a partir do ledger ==")
+    ledger = build_ledger(rows, businesses)
+    engine = FinancialStatementEngine()
+
+    start = time.perf_counter()
+    engine.append(ledger)
+    income_statement = engine.income_statement()
+    engine.cash_flow_statement()
+    elapsed = time.perf_counter() - start
+    print(f"{rows:>9} transações -> {len(income_statement):>7} DREs | {elapsed * 1000:9.1f} ms | {rows / elapsed:12,.0f} linhas/s")
+
+    increment = ledger.iloc[: max(rows // 100, 1)]
+    start = time.perf_counter()
+    engine.append(increment)
+    engine.summary("0")
+    elapsed = time.perf_counter() - start
+    print(f"{len(increment):>9} transações novas (incremental) + resumo | {elapsed * 1000:9.1f} ms")
+
+
+def bench_categorizer(rows: int, seed: int = 42) -> None:
+    """Mede a categorização em lote de descrições de extrato (PIX e cartão)."""
+    print("== Categorização de transações ==")
+    rng = np.random.default_rng(seed)
+    templates = ["PIX RECEBIDO CLIENTE {}", "COMPRA CARTAO IFOOD *{}", "POSTO IPIRANGA {}", "UBER *TRIP {}",
+                 "PAGAMENTO FORNECEDOR ATACADAO {}", "CONTA DE LUZ CEMIG {}", "TARIFA BANCARIA {}", "META ADS {}"]
+    descriptions = [templates[index].format(code) for index, code in
+                    zip(rng.integers(0, len(templates), rows), rng.integers(0, 100000, rows))]
+    amounts = np.where(rng.random(rows) < 0.3, 1.0, -1.0) * rng.uniform(5, 500, rows)
+
+    categorizer = TransactionCategorizer()
+    for label in ("frio", "cache quente"):
+        start = time.perf_counter()
+        categorizer.categorize(descriptions, amounts=amounts)
+        elapsed = time.perf_counter() - start
+        print(f"{rows:>9} descrições ({label:>12}) | {elapsed * 1000:9.1f} ms | {rows / elapsed:12,.0f} descrições/s")
+
+    stats = categorizer.stats()
+    print(f"regras: {stats['rules']} | avaliações de regra/s: {stats['rule_evaluations_per_second']:,.0f} | "
+          f"cache: {stats['cache']['hit_rate']:.0%}")
+
+
+def main():
+    """Função principal do benchmark."""
+    parser = argparse.ArgumentParser(description="FalaChefe v4 - Benchmarks do DataProcessor")
+    parser.add_argument("--businesses", type=int, default=100000, help="Número de negócios")
+    parser.add_argument("--months", type=int, default=12, help="Meses de histórico por negócio")
+    parser.add_argument("--ledger-rows", type=int, default=2000000, help="Transações no ledger sintético")
+    args = parser.parse_args()
+
+    bench_financial_batch(args.businesses, args.months)
+    bench_financial_forecast(args.businesses, args.months)
+    bench_cash_runway(args.months)
+    bench_ledger_statements(args.ledger_rows, max(args.businesses // 20, 1))
+    bench_categorizer(args.ledger_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ import asyncio
 import logging
 import sys
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, Optional
 import argparse
 from datetime import datetime
 import json
@@ -24,9 +24,11 @@ sys.path.insert(0, str(project_root))
 from src.core.data_processor import DataProcessor
 from src.core.api_client import FalaChefeAPIClient
 from src.core.hybrid_orchestrator import HybridOrchestrator, AgentSystem
+from src.core.streaming import CHUNK, DONE, StreamCollector
 from src.analytics.conversation_analyzer import ConversationAnalyzer
 from src.automation.business_automation import BusinessAutomation
 from src.utils.config import Config
+from src.utils.deadline import deadline_scope
 from src.utils.logger import setup_logger
 
 
@@ -53,6 +55,19 @@ class FalaChefePython:
         
         self.logger.info("FalaChefe Python com orquestrador híbrido inicializado")
     
+    async def start(self) -> Dict[str, Any]:
+        """
+        Inicializa o sistema de agentes antes de atender requisições.
+        
+        Returns:
+            Sistema ativo e duração da inicialização
+        """
+        report = await self.orchestrator.start(prewarm_fallback=self.config.prewarm_fallback_system)
+        self.logger.info(
+            f"Sistema de agentes pronto em {report['startup_seconds']}s: {report['active_system']}"
+        )
+        return report
+    
     async def process_conversation(self, conversation_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Processa uma conversa do WhatsApp usando o orquestrador híbrido.
@@ -72,11 +87,14 @@ class FalaChefePython:
             user_id = conversation_data.get('user_id', 'unknown')
             session_id = conversation_data.get('session_id', 'default')
             agent_name = conversation_data.get('agent_name')  # Opcional
+            priority = conversation_data.get('priority', 'normal')  # high, normal ou low
             
-            # Processa com orquestrador híbrido (escolhe automaticamente)
-            response = await self.orchestrator.process_message(
-                message, user_id, session_id, agent_name
-            )
+            # Processa com orquestrador híbrido (escolhe automaticamente); o prazo
+            # da requisição segue por todas as camadas e vira timeout em cada chamada
+            with deadline_scope(self.config.processing_timeout):
+                response = await self.orchestrator.process_message(
+                    message, user_id, session_id, agent_name, priority
+                )
             
             # Analisa a conversa para insights
             analysis = await self.conversation_analyzer.analyze_conversation(conversation_data, response)
@@ -95,6 +113,49 @@ class FalaChefePython:
             self.logger.error(f"Erro ao processar conversa: {str(e)}")
             return {"error": str(e), "processed_by": "error_fallback"}
     
+    async def stream_conversation(self, conversation_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Versão streaming de ``process_conversation``: repassa os trechos da
+        resposta assim que chegam e termina com o mesmo resultado completo.
+        
+        Args:
+            conversation_data: Dados da conversa do WhatsApp
+            
+        Yields:
+            Eventos "chunk" com o texto e, por último, um evento "done" com
+            resposta, análise e sistema usado
+        """
+        try:
+            self.logger.info(f"Processando conversa (streaming): {conversation_data.get('id', 'unknown')}")
+            
+            collector = StreamCollector()
+            async for event in self.orchestrator.stream_message(
+                conversation_data.get('message', ''),
+                conversation_data.get('user_id', 'unknown'),
+                conversation_data.get('session_id', 'default'),
+                conversation_data.get('agent_name'),
+                conversation_data.get('priority', 'normal')
+            ):
+                collector.add(event)
+                if event["type"] == CHUNK:
+                    yield event
+            
+            # Análise e atualização só depois da resposta inteira (texto juntado uma única vez)
+            response = collector.result()
+            analysis = await self.conversation_analyzer.analyze_conversation(conversation_data, response)
+            await self.data_processor.update_conversation_data(conversation_data, response, analysis)
+            
+            yield {
+                "type": DONE,
+                "response": response,
+                "analysis": analysis,
+                "processed_by": response.get('system_used', 'hybrid_orchestrator')
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Erro ao processar conversa (streaming): {str(e)}")
+            yield {"type": DONE, "error": str(e), "processed_by": "error_fallback"}
+    
     async def analyze_financial_data(self, data_source: str) -> Dict[str, Any]:
         """
         Analisa dados financeiros complementando o agente Leo do Agent Squad.
@@ -114,9 +175,16 @@ class FalaChefePython:
             # Processa dados com Python (análise avançada)
             analysis = await self.data_processor.analyze_financial_data(financial_data)
             
-            # Integra com o agente Leo do Agent Squad
-            leo_insights = await self.agent_squad_integration.get_leo_insights(analysis)
-            
+            # Integra com o agente Leo via orquestrador híbrido
+            leo_response = await self.orchestrator.process_message(
+                f"Comente esta análise financeira: {json.dumps(analysis, ensure_ascii=False, default=str)}",
+                "system", f"financial_{data_source}", "leo", "low"
+            )
+            leo_insights = {
+                "summary": leo_response.get("message", ""),
+                "system_used": leo_response.get("system_used")
+            } if leo_response.get("success") else {}
+
             # Gera relatório combinado
             report = await self.data_processor.generate_financial_report(analysis, leo_insights)
             
@@ -236,6 +304,7 @@ class FalaChefePython:
                 return {
                     "success": True,
                     "active_system": status.get("active_system"),
+                    "switch": status.get("last_switch"),
                     "message": f"Sistema alterado para: {status.get('active_system')}"
                 }
             else:
@@ -324,6 +393,7 @@ async def main():
     try:
         # Inicializa o FalaChefe
         falachefe = FalaChefePython(args.config)
+        await falachefe.start()
         
         # Executa baseado no modo
         if args.mode == "health":
@@ -0,0 +1,97 @@
+/**
+ * Worker persistente do orquestrador TypeScript para o bridge Python (src/core/node_bridge.py)
+ * Uso: npx tsx scripts/agent-squad-worker.ts
+ *
+ * Protocolo: frames JSON prefixados pelo tamanho (uint32 big-endian) em stdin/stdout.
+ * Requisição: { id, method, params }; resposta: { id, result } ou { id, error }.
+ * Em "route", params.shadow === "true" marca uma chamada de tráfego sombra.
+ */
+
+// stdout é reservado aos frames: qualquer log vai para stderr
+console.log = console.info = console.debug = (...args: unknown[]) => console.error(...args);
+
+type Request = { id: number; method: string; params: Record<string, string> };
+type Handler = (params: Record<string, string>) => Promise<unknown>;
+
+function send(message: Record<string, unknown>) {
+  const body = Buffer.from(JSON.stringify(message), "utf8");
+  const header = Buffer.alloc(4);
+  header.writeUInt32BE(body.length, 0);
+  process.stdout.write(Buffer.concat([header, body]));
+}
+
+async function loadHandlers(): Promise<Record<string, Handler>> {
+  // Import dinâmico: os módulos do orquestrador só carregam depois do redirecionamento de logs
+  const { getOrchestrator, getShadowOrchestrator, processMessageWithSpecificAgent } = await import(
+    "../src/lib/orchestrator/agent-squad"
+  );
+  const { extractAgentMessage } = await import("../src/lib/orchestrator/response");
+
+  getOrchestrator();
+
+  return {
+    ping: async () => ({ pong: Date.now() }),
+    route: async ({ message, userId, sessionId, agentName, shadow }) => {
+      // Tráfego sombra: orquestrador com histórico descartável (nada vai para o banco)
+      const orchestrator = shadow === "true" ? getShadowOrchestrator() : getOrchestrator();
+
+      if (agentName) {
+        const result = await processMessageWithSpecificAgent(
+          message,
+          userId,
+          sessionId,
+          agentName as "leo" | "max" | "lia",
+          orchestrator
+        );
+        return { message: result.message, agent_name: result.agentName };
+      }
+
+      const response = await orchestrator.routeRequest(message, userId, sessionId);
+      return {
+        message: (await extractAgentMessage(response)) || "Resposta não disponível",
+        agent_name: response?.metadata?.agentName ?? "unknown",
+      };
+    },
+  };
+}
+
+async function main() {
+  let handlers: Record<string, Handler>;
+  try {
+    handlers = await loadHandlers();
+  } catch (error) {
+    send({ event: "error", error: error instanceof Error ? error.message : String(error) });
+    process.exit(1);
+  }
+
+  const handle = async ({ id, method, params }: Request) => {
+    const handler = handlers[method];
+    if (!handler) {
+      send({ id, error: `Método desconhecido: ${method}` });
+      return;
+    }
+    try {
+      send({ id, result: await handler(params ?? {}) });
+    } catch (error) {
+      send({ id, error: error instanceof Error ? error.message : String(error) });
+    }
+  };
+
+  // Vários frames podem chegar no mesmo chunk (ou um frame em vários chunks)
+  let buffer = Buffer.alloc(0);
+  process.stdin.on("data", (chunk: Buffer) => {
+    buffer = Buffer.concat([buffer, chunk]);
+    while (buffer.length >= 4) {
+      const size = buffer.readUInt32BE(0);
+      if (buffer.length < 4 + size) break;
+      const frame = buffer.subarray(4, 4 + size);
+      buffer = buffer.subarray(4 + size);
+      void handle(JSON.parse(frame.toString("utf8")) as Request);
+    }
+  });
+  process.stdin.on("end", () => process.exit(0));
+
+  send({ event: "ready", pid: process.pid });
+}
+
+void main();
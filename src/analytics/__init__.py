@@ -3,7 +3,12 @@ Módulos de analytics do FalaChefe Python.
 """
 
 from .conversation_analyzer import ConversationAnalyzer
+from .conversation_store import ConversationStore
+from .topic_sketch import SpaceSaving, TopicTracker
 
 __all__ = [
-    "ConversationAnalyzer"
+    "ConversationAnalyzer",
+    "ConversationStore",
+    "SpaceSaving",
+    "TopicTracker"
 ]
@@ -8,8 +8,10 @@ import json
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import re
-from collections import Counter
+from collections import Counter, OrderedDict
 
+from .running_aggregates import ConversationMetrics, RunningAggregates
+from .rolling_windows import RollingWindowAggregates, to_epoch
 from ..utils.config import Config
 from ..utils.logger import get_component_logger
 
@@ -25,8 +27,17 @@ class ConversationAnalyzer:
         self.config = config
         self.logger = get_component_logger("conversation_analyzer")
         
-        # Cache de análises
-        self.analysis_cache = {}
+        # Cache de análises (limitado; o mais antigo é removido primeiro)
+        self.analysis_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.cache_size = config.conversation_cache_size
+        
+        # Agregados incrementais mantidos em sincronia com o cache
+        self.aggregates = RunningAggregates()
+        self.insight_counts: Counter = Counter()
+        self.recommendation_counts: Counter = Counter()
+        
+        # Agregados por janela de tempo (buckets por minuto/hora/dia)
+        self.windows = RollingWindowAggregates()
         
         # Padrões para análise
         self.sentiment_patterns = {
@@ -65,8 +76,8 @@ class ConversationAnalyzer:
                 "recommendations": await self._generate_recommendations(conversation_data, response)
             }
             
-            # Cache da análise
-            self.analysis_cache[conversation_data.get("id", "unknown")] = analysis
+            # Cache da análise e janelas de tempo
+            self._cache_analysis(conversation_data.get("id", "unknown"), analysis, to_epoch(conversation_data.get("timestamp")))
             
             self.logger.info("Análise de conversa concluída")
             return analysis
@@ -75,6 +86,38 @@ class ConversationAnalyzer:
             self.logger.error(f"Erro na análise de conversa: {str(e)}")
             return {"error": str(e)}
     
+    def _cache_analysis(self, conversation_id: str, analysis: Dict[str, Any], epoch: float) -> None:
+        """Grava a análise no cache atualizando os agregados e as janelas em O(1)."""
+        previous = self.analysis_cache.pop(conversation_id, None)
+        if previous is not None:
+            # Reanálise: substitui a versão anterior também nas janelas
+            self._update_aggregates(previous, -1)
+            self.windows.remove(previous["metrics"], previous["epoch"])
+        
+        entry = {"analysis": analysis, "metrics": ConversationMetrics.from_analysis(analysis), "epoch": epoch}
+        self.analysis_cache[conversation_id] = entry
+        self._update_aggregates(entry, 1)
+        self.windows.add(entry["metrics"], epoch)
+        
+        # As janelas não dependem do cache: a análise removida continua nelas
+        while len(self.analysis_cache) > self.cache_size:
+            _, evicted = self.analysis_cache.popitem(last=False)
+            self._update_aggregates(evicted, -1)
+    
+    def _update_aggregates(self, entry: Dict[str, Any], sign: int) -> None:
+        """Inclui (sign=1) ou remove (sign=-1) uma análise em cache dos agregados."""
+        if sign > 0:
+            self.aggregates.add(entry["metrics"])
+        else:
+            self.aggregates.remove(entry["metrics"])
+        
+        analysis = entry["analysis"]
+        for counter, key in ((self.insight_counts, "insights"), (self.recommendation_counts, "recommendations")):
+            for item in analysis.get(key, []):
+                counter[item] += sign
+                if counter[item] <= 0:
+                    del counter[item]
+    
     async def _analyze_message(self, message: str) -> Dict[str, Any]:
         """Analisa a mensagem do usuário."""
         try:
@@ -337,7 +380,7 @@ class ConversationAnalyzer:
         Obtém analytics agregados das conversas.
         
         Args:
-            time_period: Período de análise (1d, 7d, 30d)
+            time_period: Período de análise (1d, 7d, 30d, ou qualquer "Nm/Nh/Nd")
             
         Returns:
             Analytics agregados
@@ -345,8 +388,9 @@ class ConversationAnalyzer:
         try:
             self.logger.info(f"Gerando analytics para período: {time_period}")
             
-            # Simula analytics baseado no cache
-            total_conversations = len(self.analysis_cache)
+            # Soma dos buckets pré-agregados do período
+            window = self.windows.window(time_period)
+            total_conversations = window.count
             
             if total_conversations == 0:
                 return {
@@ -359,10 +403,10 @@ class ConversationAnalyzer:
             analytics = {
                 "period": time_period,
                 "total_conversations": total_conversations,
-                "agent_distribution": self._get_agent_distribution(),
-                "sentiment_distribution": self._get_sentiment_distribution(),
-                "intent_distribution": self._get_intent_distribution(),
-                "average_metrics": self._get_average_metrics(),
+                "agent_distribution": self._get_agent_distribution(window),
+                "sentiment_distribution": self._get_sentiment_distribution(window),
+                "intent_distribution": self._get_intent_distribution(window),
+                "average_metrics": self._get_average_metrics(window),
                 "top_insights": self._get_top_insights(),
                 "recommendations": self._get_aggregate_recommendations()
             }
@@ -373,88 +417,30 @@ class ConversationAnalyzer:
             self.logger.error(f"Erro ao gerar analytics: {str(e)}")
             return {"error": str(e)}
     
-    def _get_agent_distribution(self) -> Dict[str, int]:
-        """Calcula distribuição por agente."""
-        distribution = {"leo": 0, "max": 0, "lia": 0, "unknown": 0}
-        
-        for analysis in self.analysis_cache.values():
-            agent = analysis.get("agent_used", "unknown")
-            if agent in distribution:
-                distribution[agent] += 1
-        
-        return distribution
+    def _get_agent_distribution(self, aggregates: Optional[RunningAggregates] = None) -> Dict[str, int]:
+        """Calcula distribuição por agente (padrão: conversas em cache)."""
+        return (aggregates or self.aggregates).agent_distribution()
     
-    def _get_sentiment_distribution(self) -> Dict[str, int]:
-        """Calcula distribuição por sentimento."""
-        distribution = {"positive": 0, "negative": 0, "neutral": 0}
-        
-        for analysis in self.analysis_cache.values():
-            sentiment = analysis.get("message_analysis", {}).get("sentiment", {}).get("label", "neutral")
-            if sentiment in distribution:
-                distribution[sentiment] += 1
-        
-        return distribution
+    def _get_sentiment_distribution(self, aggregates: Optional[RunningAggregates] = None) -> Dict[str, int]:
+        """Calcula distribuição por sentimento (padrão: conversas em cache)."""
+        return (aggregates or self.aggregates).sentiment_distribution()
     
-    def _get_intent_distribution(self) -> Dict[str, int]:
-        """Calcula distribuição por intenção."""
-        distribution = {}
-        
-        for analysis in self.analysis_cache.values():
-            intent = analysis.get("message_analysis", {}).get("intent", {}).get("label", "unknown")
-            distribution[intent] = distribution.get(intent, 0) + 1
-        
-        return distribution
+    def _get_intent_distribution(self, aggregates: Optional[RunningAggregates] = None) -> Dict[str, int]:
+        """Calcula distribuição por intenção (padrão: conversas em cache)."""
+        return (aggregates or self.aggregates).intent_distribution()
     
-    def _get_average_metrics(self) -> Dict[str, float]:
-        """Calcula métricas médias."""
-        if not self.analysis_cache:
-            return {}
-        
-        total_conversations = len(self.analysis_cache)
-        
-        avg_response_time = sum(
-            analysis.get("conversation_metrics", {}).get("response_time_seconds", 0)
-            for analysis in self.analysis_cache.values()
-        ) / total_conversations
-        
-        avg_satisfaction = sum(
-            analysis.get("conversation_metrics", {}).get("user_satisfaction", 0)
-            for analysis in self.analysis_cache.values()
-        ) / total_conversations
-        
-        avg_success_rate = sum(
-            analysis.get("conversation_metrics", {}).get("success_rate", 0)
-            for analysis in self.analysis_cache.values()
-        ) / total_conversations
-        
-        return {
-            "avg_response_time_seconds": round(avg_response_time, 2),
-            "avg_user_satisfaction": round(avg_satisfaction, 2),
-            "avg_success_rate": round(avg_success_rate, 2)
-        }
+    def _get_average_metrics(self, aggregates: Optional[RunningAggregates] = None) -> Dict[str, float]:
+        """Calcula métricas médias (padrão: conversas em cache)."""
+        return (aggregates or self.aggregates).averages()
     
     def _get_top_insights(self) -> List[str]:
         """Obtém insights mais frequentes."""
-        all_insights = []
-        
-        for analysis in self.analysis_cache.values():
-            all_insights.extend(analysis.get("insights", []))
-        
-        # Conta frequência dos insights
-        insight_counts = Counter(all_insights)
-        
         # Retorna os 5 mais frequentes
-        return [insight for insight, count in insight_counts.most_common(5)]
+        return [insight for insight, count in self.insight_counts.most_common(5)]
     
     def _get_aggregate_recommendations(self) -> List[str]:
         """Obtém recomendações agregadas."""
-        all_recommendations = []
-        
-        for analysis in self.analysis_cache.values():
-            all_recommendations.extend(analysis.get("recommendations", []))
-        
-        # Remove duplicatas e retorna únicas
-        return list(set(all_recommendations))
+        return list(self.recommendation_counts)
     
     async def health_check(self) -> Dict[str, Any]:
         """
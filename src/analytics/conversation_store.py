@@ -0,0 +1,323 @@
+"""
+Armazenamento colunar de conversas do FalaChefe Python.
+Mantém métricas das conversas em arrays tipados do NumPy para analytics vetorizados.
+"""
+
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .running_aggregates import ConversationMetrics
+
+
+_TIME_PERIOD_PATTERN = re.compile(r"^\s*(\d+)\s*([smhdw])\s*$", re.IGNORECASE)
+
+_TIME_UNITS = {
+    "s": 1,
+    "m": 60,
+    "h": 3600,
+    "d": 86400,
+    "w": 604800
+}
+
+
+def parse_time_period(time_period: Optional[str]) -> Optional[float]:
+    """
+    Converte um período textual ("7d", "24h", "30m") em segundos.
+
+    Args:
+        time_period: Período de análise; "all" ou None indicam todo o histórico
+
+    Returns:
+        Duração em segundos ou None para todo o histórico
+    """
+    if time_period is None or str(time_period).lower() == "all":
+        return None
+
+    match = _TIME_PERIOD_PATTERN.match(str(time_period))
+    if not match:
+        raise ValueError(f"Período inválido: {time_period}. Use formatos como 7d, 24h ou 30m")
+
+    amount, unit = match.groups()
+    return int(amount) * _TIME_UNITS[unit.lower()]
+
+
+class _Dictionary:
+    """Codificação por dicionário para colunas categóricas (string -> código inteiro)."""
+
+    def __init__(self, initial: Optional[List[str]] = None):
+        self.values: List[str] = []
+        self.index: Dict[str, int] = {}
+        for value in initial or []:
+            self.encode(value)
+        self.fixed = len(self.values)
+
+    def encode(self, value: str) -> int:
+        code = self.index.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.index[value] = code
+        return code
+
+    def compact(self, codes: np.ndarray) -> np.ndarray:
+        """Mantém só os valores iniciais e os usados em ``codes``; retorna os códigos remapeados."""
+        keep = sorted(set(range(self.fixed)) | set(np.unique(codes).tolist()))
+        mapping = np.zeros(len(self.values), dtype=np.int32)
+        mapping[keep] = np.arange(len(keep), dtype=np.int32)
+
+        self.values = [self.values[code] for code in keep]
+        self.index = {value: code for code, value in enumerate(self.values)}
+        return mapping[codes]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class ConversationStore:
+    """
+    Store colunar em memória para métricas das conversas mais recentes.
+
+    Cada coluna é um array NumPy tipado com crescimento amortizado; colunas
+    categóricas (usuário, agente, sentimento, intenção) são codificadas por
+    dicionário para permitir group-bys com ``np.bincount``.
+
+    Cada conversa ocupa uma única linha (regravações sobrescrevem a linha) e,
+    acima de ``max_rows``, a conversa gravada há mais tempo cede a linha, como
+    no cache de conversas do ``DataProcessor``. Valores dos dicionários que não
+    aparecem mais em nenhuma linha são descartados periodicamente.
+    """
+
+    # Latência e satisfação em float64: ``get`` devolve exatamente o que foi
+    # somado às janelas, para a regravação poder descontá-lo
+    _NUMERIC_COLUMNS = {
+        "timestamp": np.float64,
+        "latency": np.float64,
+        "tokens": np.int32,
+        "success": np.bool_,
+        "satisfaction": np.float64
+    }
+
+    _CATEGORICAL_COLUMNS = ("user", "agent", "sentiment", "intent")
+
+    def __init__(self, max_rows: int = 10000, initial_capacity: int = 1024):
+        """
+        Inicializa o store.
+
+        Args:
+            max_rows: Conversas mantidas (as gravadas há mais tempo saem primeiro)
+            initial_capacity: Linhas pré-alocadas
+        """
+        self.max_rows = max(int(max_rows), 1)
+        self._capacity = min(max(int(initial_capacity), 1), self.max_rows)
+        self._size = 0
+
+        # Conversa -> linha, da gravação mais antiga para a mais recente
+        self._rows: "OrderedDict[str, int]" = OrderedDict()
+
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.zeros(self._capacity, dtype=dtype)
+            for name, dtype in self._NUMERIC_COLUMNS.items()
+        }
+        for name in self._CATEGORICAL_COLUMNS:
+            self._columns[name] = np.zeros(self._capacity, dtype=np.int32)
+
+        self._dictionaries: Dict[str, _Dictionary] = {
+            "user": _Dictionary(),
+            "agent": _Dictionary(["leo", "max", "lia", "unknown"]),
+            "sentiment": _Dictionary(["positive", "negative", "neutral"]),
+            "intent": _Dictionary(["unknown"])
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, conversation_id: object) -> bool:
+        return str(conversation_id) in self._rows
+
+    def get(self, conversation_id: str) -> Optional[Tuple[ConversationMetrics, float]]:
+        """
+        Retorna as métricas gravadas de uma conversa.
+
+        Args:
+            conversation_id: ID da conversa
+
+        Returns:
+            (métricas, timestamp) ou None se a conversa não está no store
+        """
+        row = self._rows.get(str(conversation_id))
+        if row is None:
+            return None
+
+        columns = self._columns
+        decode = {name: self._dictionaries[name].values[columns[name][row]] for name in ("agent", "sentiment", "intent")}
+        metrics = ConversationMetrics(
+            agent=decode["agent"],
+            sentiment=decode["sentiment"],
+            intent=decode["intent"],
+            latency=float(columns["latency"][row]),
+            satisfaction=float(columns["satisfaction"][row]),
+            success=bool(columns["success"][row]),
+            tokens=int(columns["tokens"][row])
+        )
+        return metrics, float(columns["timestamp"][row])
+
+    def _ensure_capacity(self, required: int) -> None:
+        """Dobra a capacidade das colunas quando necessário (até ``max_rows``)."""
+        if required <= self._capacity:
+            return
+
+        new_capacity = self._capacity
+        while new_capacity < required:
+            new_capacity *= 2
+        new_capacity = min(new_capacity, self.max_rows)
+
+        for name, column in self._columns.items():
+            grown = np.zeros(new_capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+        self._capacity = new_capacity
+
+    def _row_for(self, conversation_id: str) -> int:
+        """Linha da conversa: a que ela já ocupa, uma nova ou a da conversa gravada há mais tempo."""
+        row = self._rows.pop(conversation_id, None)
+        if row is None:
+            if self._size < self.max_rows:
+                self._ensure_capacity(self._size + 1)
+                row = self._size
+                self._size += 1
+            else:
+                _, row = self._rows.popitem(last=False)
+
+        self._rows[conversation_id] = row
+        return row
+
+    def _compact_dictionaries(self) -> None:
+        """Descarta valores sem linhas quando o dicionário passa do dobro das linhas (custo amortizado O(1))."""
+        for name in self._CATEGORICAL_COLUMNS:
+            dictionary = self._dictionaries[name]
+            if len(dictionary) > dictionary.fixed + 2 * self.max_rows:
+                column = self._columns[name]
+                column[:self._size] = dictionary.compact(column[:self._size])
+
+    def upsert(
+        self,
+        conversation_id: str,
+        timestamp: float,
+        user: str,
+        agent: str,
+        latency: float = 0.0,
+        sentiment: str = "neutral",
+        intent: str = "unknown",
+        tokens: int = 0,
+        success: bool = True,
+        satisfaction: float = 0.0
+    ) -> None:
+        """Grava as métricas de uma conversa, substituindo as anteriores da mesma conversa."""
+        row = self._row_for(str(conversation_id))
+
+        self._columns["timestamp"][row] = timestamp
+        self._columns["latency"][row] = latency
+        self._columns["tokens"][row] = tokens
+        self._columns["success"][row] = success
+        self._columns["satisfaction"][row] = satisfaction
+        self._columns["user"][row] = self._dictionaries["user"].encode(str(user))
+        self._columns["agent"][row] = self._dictionaries["agent"].encode(str(agent))
+        self._columns["sentiment"][row] = self._dictionaries["sentiment"].encode(str(sentiment))
+        self._columns["intent"][row] = self._dictionaries["intent"].encode(str(intent))
+
+        self._compact_dictionaries()
+
+    def _window_mask(self, time_period: Optional[str], now: Optional[float]) -> Optional[np.ndarray]:
+        """Retorna a máscara booleana das linhas dentro do período (None = todas)."""
+        seconds = parse_time_period(time_period)
+        if seconds is None:
+            return None
+
+        reference = time.time() if now is None else now
+        return self._columns["timestamp"][:self._size] >= reference - seconds
+
+    def _column(self, name: str, mask: Optional[np.ndarray]) -> np.ndarray:
+        column = self._columns[name][:self._size]
+        return column if mask is None else column[mask]
+
+    def _distribution(self, name: str, mask: Optional[np.ndarray]) -> Dict[str, int]:
+        dictionary = self._dictionaries[name]
+        counts = np.bincount(self._column(name, mask), minlength=len(dictionary))
+        return {value: int(counts[code]) for code, value in enumerate(dictionary.values)}
+
+    def value_counts(self, column: str, time_period: Optional[str] = None, now: Optional[float] = None) -> Dict[str, int]:
+        """Conta ocorrências de cada valor de uma coluna categórica no período."""
+        if column not in self._dictionaries:
+            raise ValueError(f"Coluna categórica desconhecida: {column}")
+        return self._distribution(column, self._window_mask(time_period, now))
+
+    def analytics(self, time_period: Optional[str] = None, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Calcula analytics agregados das conversas no período.
+
+        Args:
+            time_period: Período de análise (7d, 30d, 90d, ...) ou None para tudo
+            now: Timestamp de referência (epoch em segundos)
+
+        Returns:
+            Métricas agregadas calculadas de forma vetorizada
+        """
+        mask = self._window_mask(time_period, now)
+        latency = self._column("latency", mask)
+        total = int(latency.shape[0])
+
+        if total == 0:
+            return {
+                "total_conversations": 0,
+                "agent_distribution": self._distribution("agent", mask),
+                "sentiment_distribution": self._distribution("sentiment", mask),
+                "intent_distribution": {},
+                "avg_latency_seconds": 0.0,
+                "p95_latency_seconds": 0.0,
+                "success_rate": 0.0,
+                "avg_satisfaction": 0.0,
+                "total_tokens": 0,
+                "unique_users": 0
+            }
+
+        intent_distribution = {
+            intent: count
+            for intent, count in self._distribution("intent", mask).items()
+            if count > 0
+        }
+
+        return {
+            "total_conversations": total,
+            "agent_distribution": self._distribution("agent", mask),
+            "sentiment_distribution": self._distribution("sentiment", mask),
+            "intent_distribution": intent_distribution,
+            "avg_latency_seconds": float(latency.mean()),
+            "p95_latency_seconds": float(np.percentile(latency, 95)),
+            "success_rate": float(self._column("success", mask).mean()),
+            "avg_satisfaction": float(self._column("satisfaction", mask).mean()),
+            "total_tokens": int(self._column("tokens", mask).sum(dtype=np.int64)),
+            "unique_users": int(np.count_nonzero(np.bincount(self._column("user", mask))))
+        }
+
+    def to_frame(self, time_period: Optional[str] = None, now: Optional[float] = None) -> pd.DataFrame:
+        """Exporta as conversas do período como DataFrame com colunas categóricas."""
+        mask = self._window_mask(time_period, now)
+
+        data = {name: self._column(name, mask) for name in self._NUMERIC_COLUMNS}
+        for name in self._CATEGORICAL_COLUMNS:
+            data[name] = pd.Categorical.from_codes(
+                self._column(name, mask),
+                categories=pd.Index(self._dictionaries[name].values)
+            )
+
+        return pd.DataFrame(data)
+
+    def memory_usage(self) -> Tuple[int, int]:
+        """Retorna (linhas, bytes alocados) do store."""
+        return self._size, sum(column.nbytes for column in self._columns.values())
@@ -0,0 +1,153 @@
+"""
+Janelas deslizantes de métricas do FalaChefe Python.
+Ring buffers por minuto, hora e dia com agregados pré-calculados por bucket.
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .conversation_store import parse_time_period
+from .running_aggregates import RunningAggregates
+
+
+def to_epoch(timestamp: Any) -> float:
+    """Converte timestamps (epoch, ISO ou datetime) para epoch em segundos."""
+    if isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+        return float(timestamp)
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    if isinstance(timestamp, str):
+        try:
+            return datetime.fromisoformat(timestamp).timestamp()
+        except ValueError:
+            pass
+    return time.time()
+
+
+class _BucketRing:
+    """Ring buffer de buckets de tamanho fixo para uma resolução."""
+
+    def __init__(self, resolution: int, slots: int, factory: Callable[[], Any] = RunningAggregates):
+        self.resolution = resolution
+        self.slots = slots
+        self.factory = factory
+        self.starts: List[Optional[int]] = [None] * slots
+        self.buckets: List[Optional[Any]] = [None] * slots
+
+    @property
+    def coverage(self) -> int:
+        """Duração máxima (segundos) que o ring consegue responder."""
+        return self.resolution * self.slots
+
+    def _slot(self, timestamp: float, create: bool) -> Optional[Any]:
+        start = int(timestamp // self.resolution) * self.resolution
+        index = (start // self.resolution) % self.slots
+
+        if self.starts[index] != start:
+            # Bucket de outro ciclo (ou vazio): só reaproveita se o novo for mais recente
+            if not create or (self.starts[index] is not None and self.starts[index] > start):
+                return None
+            self.starts[index] = start
+            self.buckets[index] = self.factory()
+
+        return self.buckets[index]
+
+    def add(self, value: Any, timestamp: float) -> None:
+        bucket = self._slot(timestamp, create=True)
+        if bucket is not None:
+            bucket.add(value)
+
+    def remove(self, value: Any, timestamp: float) -> None:
+        bucket = self._slot(timestamp, create=False)
+        if bucket is not None:
+            bucket.remove(value)
+
+    def merge(self, since: float, until: float) -> Any:
+        """Soma os buckets que se sobrepõem a [since, until]."""
+        merged = self.factory()
+        for start, bucket in zip(self.starts, self.buckets):
+            if start is not None and bucket is not None and start + self.resolution > since and start <= until:
+                merged.merge(bucket)
+        return merged
+
+
+class RollingWindowAggregates:
+    """
+    Agregados de conversas em janelas de tempo arbitrárias.
+
+    Cada registro é somado em um bucket por minuto, por hora e por dia. Uma
+    consulta usa a resolução mais fina que cobre a janela pedida e soma apenas
+    os buckets dela, então o custo é O(buckets) e a memória é fixa
+    independentemente do volume. Buckets antigos são sobrescritos
+    automaticamente quando o ring dá a volta.
+
+    O tipo do bucket é definido por ``factory`` (padrão: ``RunningAggregates``);
+    qualquer classe com ``add``, ``remove`` e ``merge`` pode ser usada.
+    """
+
+    DEFAULT_RESOLUTIONS = (
+        ("minute", 60, 180),     # 3 horas
+        ("hour", 3600, 24 * 14),  # 14 dias
+        ("day", 86400, 400)       # ~13 meses
+    )
+
+    def __init__(
+        self,
+        resolutions: Tuple[Tuple[str, int, int], ...] = DEFAULT_RESOLUTIONS,
+        factory: Callable[[], Any] = RunningAggregates
+    ):
+        """Inicializa os rings de cada resolução."""
+        self.rings: Dict[str, _BucketRing] = {
+            name: _BucketRing(resolution, slots, factory)
+            for name, resolution, slots in sorted(resolutions, key=lambda item: item[1])
+        }
+
+    def add(self, value: Any, timestamp: Optional[float] = None) -> None:
+        """Inclui um registro em todas as resoluções."""
+        timestamp = time.time() if timestamp is None else timestamp
+        for ring in self.rings.values():
+            ring.add(value, timestamp)
+
+    def remove(self, value: Any, timestamp: float) -> None:
+        """Remove um registro dos buckets que ainda existem."""
+        for ring in self.rings.values():
+            ring.remove(value, timestamp)
+
+    def _ring_for(self, seconds: Optional[float]) -> _BucketRing:
+        rings = list(self.rings.values())
+        if seconds is None:
+            return rings[-1]
+        for ring in rings:
+            if ring.coverage >= seconds:
+                return ring
+        return rings[-1]
+
+    def window(self, time_period: Optional[str] = None, now: Optional[float] = None) -> Any:
+        """
+        Retorna os agregados de uma janela ("15m", "24h", "7d", "30d", ...).
+
+        Args:
+            time_period: Período da janela; None ou "all" usa toda a retenção
+            now: Timestamp de referência (epoch em segundos)
+
+        Returns:
+            Agregados somados dos buckets da janela (precisão de um bucket nas bordas)
+        """
+        seconds = parse_time_period(time_period)
+        reference = time.time() if now is None else now
+        ring = self._ring_for(seconds)
+
+        since = reference - (seconds if seconds is not None else ring.coverage)
+        return ring.merge(since, reference)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna informações sobre os rings."""
+        return {
+            name: {
+                "resolution_seconds": ring.resolution,
+                "slots": ring.slots,
+                "active_buckets": sum(1 for start in ring.starts if start is not None)
+            }
+            for name, ring in self.rings.items()
+        }
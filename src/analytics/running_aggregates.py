@@ -0,0 +1,145 @@
+"""
+Agregados incrementais de conversas do FalaChefe Python.
+Mantém contadores e somas atualizados em O(1) a cada registro inserido ou removido.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+
+AGENTS = ("leo", "max", "lia", "unknown")
+SENTIMENTS = ("positive", "negative", "neutral")
+
+
+@dataclass(frozen=True)
+class ConversationMetrics:
+    """Métricas de uma conversa usadas pelos agregados."""
+
+    agent: str = "unknown"
+    sentiment: str = "neutral"
+    intent: str = "unknown"
+    latency: float = 0.0
+    satisfaction: float = 0.0
+    success: bool = False
+    tokens: int = 0
+
+    @classmethod
+    def from_analysis(cls, analysis: Dict[str, Any], response: Optional[Dict[str, Any]] = None) -> "ConversationMetrics":
+        """
+        Extrai métricas de uma análise do ConversationAnalyzer (e da resposta, se houver).
+
+        Args:
+            analysis: Análise da conversa
+            response: Resposta do agente (opcional)
+
+        Returns:
+            Métricas normalizadas da conversa
+        """
+        analysis = analysis if isinstance(analysis, dict) else {}
+        message_analysis = analysis.get("message_analysis", {}) or {}
+        metrics = analysis.get("conversation_metrics", {}) or {}
+
+        if response is not None:
+            usage = response.get("usage", {}) or {}
+            agent = response.get("agent_name", "unknown")
+            latency = response.get("processing_time", metrics.get("response_time_seconds", 0.0))
+            success = bool(response.get("success", False))
+            tokens = usage.get("total_tokens", response.get("tokens", 0))
+        else:
+            agent = analysis.get("agent_used", "unknown")
+            latency = metrics.get("response_time_seconds", 0.0)
+            success = (metrics.get("success_rate", 0.0) or 0.0) > 0
+            tokens = 0
+
+        return cls(
+            agent=str(agent),
+            sentiment=str(message_analysis.get("sentiment", {}).get("label", "neutral")),
+            intent=str(message_analysis.get("intent", {}).get("label", "unknown")),
+            latency=float(latency or 0.0),
+            satisfaction=float(metrics.get("user_satisfaction", 0.0) or 0.0),
+            success=success,
+            tokens=int(tokens or 0)
+        )
+
+
+class RunningAggregates:
+    """
+    Contadores e somas de métricas de conversas.
+
+    ``add`` é chamado quando um registro é gravado e ``remove`` quando ele é
+    removido do cache, de modo que as consultas não dependem do tamanho do
+    histórico.
+    """
+
+    def __init__(self):
+        """Inicializa os agregados vazios."""
+        self.count = 0
+        self.agent_counts: Counter = Counter()
+        self.sentiment_counts: Counter = Counter()
+        self.intent_counts: Counter = Counter()
+        self.latency_sum = 0.0
+        self.satisfaction_sum = 0.0
+        self.success_count = 0
+        self.tokens_sum = 0
+
+    def add(self, metrics: ConversationMetrics) -> None:
+        """Inclui um registro nos agregados."""
+        self._apply(metrics, 1)
+
+    def remove(self, metrics: ConversationMetrics) -> None:
+        """Remove um registro previamente incluído."""
+        self._apply(metrics, -1)
+
+    def _apply(self, metrics: ConversationMetrics, sign: int) -> None:
+        self.count += sign
+        self.agent_counts[metrics.agent] += sign
+        self.sentiment_counts[metrics.sentiment] += sign
+        self.intent_counts[metrics.intent] += sign
+        self.latency_sum += sign * metrics.latency
+        self.satisfaction_sum += sign * metrics.satisfaction
+        self.success_count += sign * int(metrics.success)
+        self.tokens_sum += sign * metrics.tokens
+
+        if sign < 0:
+            for counter, key in (
+                (self.agent_counts, metrics.agent),
+                (self.sentiment_counts, metrics.sentiment),
+                (self.intent_counts, metrics.intent)
+            ):
+                if counter[key] <= 0:
+                    del counter[key]
+
+    def merge(self, other: "RunningAggregates") -> None:
+        """Soma os agregados de outra instância a esta."""
+        self.count += other.count
+        self.agent_counts.update(other.agent_counts)
+        self.sentiment_counts.update(other.sentiment_counts)
+        self.intent_counts.update(other.intent_counts)
+        self.latency_sum += other.latency_sum
+        self.satisfaction_sum += other.satisfaction_sum
+        self.success_count += other.success_count
+        self.tokens_sum += other.tokens_sum
+
+    def agent_distribution(self) -> Dict[str, int]:
+        """Distribuição por agente (sempre com leo, max, lia e unknown)."""
+        return {agent: self.agent_counts.get(agent, 0) for agent in AGENTS}
+
+    def sentiment_distribution(self) -> Dict[str, int]:
+        """Distribuição por sentimento."""
+        return {sentiment: self.sentiment_counts.get(sentiment, 0) for sentiment in SENTIMENTS}
+
+    def intent_distribution(self) -> Dict[str, int]:
+        """Distribuição por intenção."""
+        return dict(self.intent_counts)
+
+    def averages(self) -> Dict[str, float]:
+        """Médias de latência, satisfação e sucesso."""
+        if self.count <= 0:
+            return {}
+
+        return {
+            "avg_response_time_seconds": round(self.latency_sum / self.count, 2),
+            "avg_user_satisfaction": round(self.satisfaction_sum / self.count, 2),
+            "avg_success_rate": round(self.success_count / self.count, 2)
+        }
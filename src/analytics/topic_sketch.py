@@ -0,0 +1,293 @@
+"""
+Tópicos frequentes das conversas do FalaChefe Python.
+Sketch Space-Saving sobre termos normalizados (unigramas e bigramas) com memória fixa.
+"""
+
+import heapq
+import re
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .rolling_windows import RollingWindowAggregates
+
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9]{2,}")
+
+# Palavras sem valor de tópico (já sem acentos, como saem de ``normalize_text``)
+STOPWORDS = frozenset("""
+    a o as os um uma uns umas de da do das dos em na no nas nos por pela pelo pelas pelos
+    para pra com sem sob sobre entre ate ao aos e ou mas nem que se como quando onde qual quais
+    quem cujo porque pois entao tambem ja ainda so apenas muito muita muitos muitas pouco mais
+    menos bem mal sim nao eu tu ele ela nos vos eles elas voce voces me te lhe lhes meu minha
+    meus minhas seu sua seus suas nosso nossa nossos nossas dele dela deles delas este esta
+    estes estas esse essa esses essas isto isso aquilo aquele aquela aqui ali la agora hoje
+    ser sou somos sao era eram foi foram sera seria estar estou estamos estao estava tem tenho
+    temos tinha ter ha haver fazer faco faz fiz pode posso podem poderia quero queria gostaria
+    preciso precisa vou vai vamos dar tudo todo toda todos todas algum alguma alguns algumas
+    cada outro outra outros outras mesmo mesma qualquer ola oi bom boa dia tarde noite obrigado
+    obrigada favor ajuda ajudar coisa coisas tipo ai
+""".split())
+
+
+def normalize_text(text: str) -> str:
+    """Remove acentos e converte para minúsculas."""
+    value = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii")
+    return value.lower()
+
+
+def extract_terms(text: str, bigrams: bool = True) -> List[str]:
+    """
+    Extrai os termos de tópico de uma mensagem.
+
+    Args:
+        text: Texto da mensagem
+        bigrams: Inclui pares de palavras consecutivas (após remover stopwords)
+
+    Returns:
+        Termos únicos da mensagem, na ordem em que aparecem
+    """
+    tokens = [token for token in _WORD_RE.findall(normalize_text(text)) if token not in STOPWORDS]
+    terms = list(tokens)
+    if bigrams:
+        terms.extend(f"{first} {second}" for first, second in zip(tokens, tokens[1:]) if first != second)
+
+    # Cada termo conta uma vez por mensagem
+    return list(dict.fromkeys(terms))
+
+
+class SpaceSaving:
+    """
+    Sketch Space-Saving para os itens mais frequentes de um fluxo.
+
+    Mantém no máximo ``capacity`` contadores. Quando um item novo chega com o
+    sketch cheio, ele herda o contador do item menos frequente (que sai), e
+    esse valor herdado fica registrado como erro máximo da contagem. Itens com
+    frequência acima de ``total / capacity`` nunca são perdidos.
+    """
+
+    def __init__(self, capacity: int = 100):
+        """Inicializa o sketch vazio."""
+        if capacity <= 0:
+            raise ValueError("capacity deve ser positivo")
+
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.total = 0
+
+        # Heap de mínimos com remoção preguiçosa: entradas cuja contagem não
+        # confere com ``counts`` são descartadas ao chegar no topo
+        self._heap: List[Tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def offer(self, item: str, count: int = 1) -> None:
+        """Conta ``count`` ocorrências de um item."""
+        self.total += count
+
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            floor, victim = self._pop_min()
+            del self.counts[victim]
+            del self.errors[victim]
+            self.counts[item] = floor + count
+            self.errors[item] = floor
+
+        heapq.heappush(self._heap, (self.counts[item], item))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def add(self, items: Iterable[str]) -> None:
+        """Conta uma ocorrência de cada item."""
+        for item in items:
+            self.offer(item)
+
+    def merge(self, other: "SpaceSaving") -> None:
+        """Soma outro sketch a este, mantendo os ``capacity`` maiores contadores."""
+        for item, count in other.counts.items():
+            self.counts[item] = self.counts.get(item, 0) + count
+            self.errors[item] = self.errors.get(item, 0) + other.errors.get(item, 0)
+        self.total += other.total
+
+        if len(self.counts) > self.capacity:
+            keep = heapq.nlargest(self.capacity, self.counts.items(), key=lambda entry: entry[1])
+            self.counts = dict(keep)
+            self.errors = {item: self.errors[item] for item in self.counts}
+
+        self._rebuild_heap()
+
+    def top_k(self, k: int = 10) -> List[Tuple[str, int, int]]:
+        """
+        Retorna os ``k`` itens mais frequentes.
+
+        Returns:
+            Lista de (item, contagem estimada, erro máximo), em ordem decrescente
+        """
+        top = heapq.nlargest(k, self.counts.items(), key=lambda entry: (entry[1], entry[0]))
+        return [(item, count, self.errors[item]) for item, count in top]
+
+    def _pop_min(self) -> Tuple[int, str]:
+        while True:
+            count, item = heapq.heappop(self._heap)
+            if self.counts.get(item) == count:
+                return count, item
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(count, item) for item, count in self.counts.items()]
+        heapq.heapify(self._heap)
+
+
+class TopicTracker:
+    """
+    Tópicos frequentes globais, por agente e por tenant.
+
+    O sketch global e os sketches por agente ficam em buckets por hora e por
+    dia, então consultas por período somam apenas os buckets da janela. Os
+    sketches por tenant usam só buckets diários (janelas menores que um dia
+    têm precisão de um bucket) e são limitados por LRU a ``max_tenants``. Os
+    buckets são criados sob demanda, e a memória total é fixa, independente
+    do volume.
+    """
+
+    RESOLUTIONS = (
+        ("hour", 3600, 48),   # 2 dias
+        ("day", 86400, 90)    # ~3 meses
+    )
+
+    # Tenants são muitos: só a resolução diária, para limitar a memória
+    TENANT_RESOLUTIONS = (
+        ("day", 86400, 90),
+    )
+
+    def __init__(self, capacity: int = 100, max_agents: int = 16, max_tenants: int = 1000):
+        """Inicializa os sketches."""
+        self.capacity = capacity
+        self.max_agents = max_agents
+        self.max_tenants = max_tenants
+
+        self.windows = self._new_windows()
+        self.agent_windows: "OrderedDict[str, RollingWindowAggregates]" = OrderedDict()
+        self.tenant_windows: "OrderedDict[str, RollingWindowAggregates]" = OrderedDict()
+
+    def _new_sketch(self) -> SpaceSaving:
+        return SpaceSaving(self.capacity)
+
+    def _new_windows(self) -> RollingWindowAggregates:
+        return RollingWindowAggregates(self.RESOLUTIONS, factory=self._new_sketch)
+
+    def _new_tenant_windows(self) -> RollingWindowAggregates:
+        return RollingWindowAggregates(self.TENANT_RESOLUTIONS, factory=self._new_sketch)
+
+    @staticmethod
+    def _touch(scopes: OrderedDict, key: str, factory, limit: int):
+        scope = scopes.get(key)
+        if scope is None:
+            scope = scopes[key] = factory()
+            while len(scopes) > limit:
+                scopes.popitem(last=False)
+        else:
+            scopes.move_to_end(key)
+        return scope
+
+    def add(
+        self,
+        text: str,
+        agent: Optional[str] = None,
+        tenant: Optional[str] = None,
+        timestamp: Optional[float] = None
+    ) -> int:
+        """
+        Registra os termos de uma mensagem.
+
+        Args:
+            text: Texto da mensagem
+            agent: Agente que atendeu a conversa
+            tenant: Empresa/tenant da conversa
+            timestamp: Epoch da conversa (padrão: agora)
+
+        Returns:
+            Quantidade de termos registrados
+        """
+        terms = extract_terms(text or "")
+        if not terms:
+            return 0
+
+        self.windows.add(terms, timestamp)
+        if agent:
+            self._touch(self.agent_windows, agent, self._new_windows, self.max_agents).add(terms, timestamp)
+        if tenant:
+            windows = self._touch(self.tenant_windows, tenant, self._new_tenant_windows, self.max_tenants)
+            windows.add(terms, timestamp)
+
+        return len(terms)
+
+    def sketch(
+        self,
+        time_period: Optional[str] = None,
+        agent: Optional[str] = None,
+        tenant: Optional[str] = None,
+        now: Optional[float] = None
+    ) -> SpaceSaving:
+        """Retorna o sketch do escopo pedido (tenant > agente > global)."""
+        if tenant is not None:
+            windows = self.tenant_windows.get(tenant)
+        elif agent is not None:
+            windows = self.agent_windows.get(agent)
+        else:
+            windows = self.windows
+        return windows.window(time_period, now) if windows else self._new_sketch()
+
+    def top_topics(
+        self,
+        k: int = 5,
+        time_period: Optional[str] = None,
+        agent: Optional[str] = None,
+        tenant: Optional[str] = None,
+        now: Optional[float] = None
+    ) -> List[Tuple[str, int]]:
+        """
+        Retorna os ``k`` tópicos mais frequentes do escopo.
+
+        Uma palavra isolada é omitida quando um bigrama que a contém aparece
+        quase com a mesma frequência (ex.: "fluxo caixa" substitui "caixa").
+
+        Args:
+            k: Quantidade de tópicos
+            time_period: Janela ("24h", "7d", "30d"...); para tenants, arredondada ao dia
+            agent: Filtra por agente
+            tenant: Filtra por tenant
+            now: Timestamp de referência (epoch em segundos)
+
+        Returns:
+            Lista de (tópico, contagem estimada)
+        """
+        candidates = self.sketch(time_period, agent, tenant, now).top_k(k * 3)
+
+        phrase_counts: Dict[str, int] = {}
+        for term, count, _ in candidates:
+            if " " in term:
+                for word in term.split(" "):
+                    phrase_counts[word] = max(phrase_counts.get(word, 0), count)
+
+        topics = []
+        for term, count, _ in candidates:
+            if " " not in term and phrase_counts.get(term, 0) >= 0.8 * count:
+                continue
+            topics.append((term, count))
+            if len(topics) == k:
+                break
+        return topics
+
+    def stats(self) -> Dict[str, int]:
+        """Retorna o tamanho dos escopos monitorados."""
+        return {
+            "agents": len(self.agent_windows),
+            "tenants": len(self.tenant_windows),
+            "capacity": self.capacity
+        }
@@ -0,0 +1,195 @@
+"""
+Controle de admissão do FalaChefe Python.
+Limita requisições em andamento e na fila, com classes de prioridade e descarte sob saturação.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Any, AsyncIterator, Dict, List
+
+from ..utils.deadline import remaining
+from ..utils.latency import LatencyTracker
+
+
+# Resposta imediata para requisições descartadas
+HIGH_DEMAND_REPLY = "Estamos com alta demanda no momento. Por favor, tente novamente em alguns instantes."
+
+
+class Priority(IntEnum):
+    """Classes de prioridade (menor valor = atendida antes)."""
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+    @classmethod
+    def parse(cls, value: Any) -> "Priority":
+        """Converte "high"/"normal"/"low" (ou um Priority) em Priority; padrão NORMAL."""
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls[str(value).upper()]
+        except KeyError:
+            return cls.NORMAL
+
+
+class Overloaded(Exception):
+    """Requisição descartada pelo controle de admissão."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Sistema saturado ({reason})")
+        self.reason = reason
+
+
+class AdmissionController:
+    """
+    Controle de admissão com fila por prioridade.
+
+    Até ``max_in_flight`` requisições são processadas ao mesmo tempo; as
+    demais esperam em uma fila de até ``max_queue`` posições, atendida por
+    prioridade e depois por ordem de chegada. Uma requisição é descartada
+    quando a fila está cheia (ou é a de menor prioridade quando chega uma
+    mais importante) ou quando espera mais que seu tempo máximo de fila,
+    limitado também pelo prazo da requisição.
+    """
+
+    # Multiplicador do tempo máximo de fila por prioridade
+    QUEUE_TIMEOUT_FACTORS = {Priority.HIGH: 2.0, Priority.NORMAL: 1.0, Priority.LOW: 0.5}
+
+    def __init__(self, max_in_flight: int = 32, max_queue: int = 64, queue_timeout: float = 5.0):
+        """
+        Inicializa o controle.
+
+        Args:
+            max_in_flight: Requisições processadas simultaneamente
+            max_queue: Requisições aguardando na fila
+            queue_timeout: Tempo máximo de fila (prioridade normal), em segundos
+        """
+        if max_in_flight <= 0:
+            raise ValueError("max_in_flight deve ser positivo")
+
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self.in_flight = 0
+        self.queued = 0
+        # Heap de [prioridade, ordem de chegada, future]; entradas já resolvidas são ignoradas
+        self._queue: List[list] = []
+        self._arrivals = itertools.count()
+
+        self.admitted = {priority.name.lower(): 0 for priority in Priority}
+        self.shed = {reason: 0 for reason in ("queue_full", "queue_timeout", "evicted")}
+        self.shed_by_priority = {priority.name.lower(): 0 for priority in Priority}
+        self.queue_wait = {priority: LatencyTracker() for priority in Priority}
+        self.peak_queued = 0
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.NORMAL) -> AsyncIterator[None]:
+        """Ocupa uma vaga durante o bloco (levanta ``Overloaded`` se a requisição for descartada)."""
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: Priority = Priority.NORMAL) -> None:
+        """Aguarda uma vaga ou levanta ``Overloaded``."""
+        if self.in_flight < self.max_in_flight and self.queued == 0:
+            self.in_flight += 1
+            self._admit(priority, 0.0)
+            return
+
+        if self.queued >= self.max_queue and not self._evict_below(priority):
+            self._shed(priority, "queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, [priority, next(self._arrivals), future])
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+
+        started = time.perf_counter()
+        timeout = remaining(self.queue_timeout * self.QUEUE_TIMEOUT_FACTORS[priority])
+        try:
+            await asyncio.wait_for(future, timeout)
+
+        except asyncio.TimeoutError:
+            # A vaga pode ter sido entregue no mesmo instante do timeout
+            if not self._granted(future):
+                if not future.cancelled():
+                    # Descartado por prioridade no mesmo instante (já contabilizado)
+                    raise Overloaded("evicted")
+                self.queued -= 1
+                self._shed(priority, "queue_timeout")
+
+        except asyncio.CancelledError:
+            if self._granted(future):
+                self.release()
+            elif not future.done() or future.cancelled():
+                self.queued -= 1
+            raise
+
+        self._admit(priority, time.perf_counter() - started)
+
+    def release(self) -> None:
+        """Libera uma vaga, entregando-a diretamente ao próximo da fila."""
+        while self._queue:
+            _, _, future = heapq.heappop(self._queue)
+            if not future.done():
+                self.queued -= 1
+                future.set_result(True)
+                return
+        self.in_flight -= 1
+
+    @staticmethod
+    def _granted(future: asyncio.Future) -> bool:
+        return future.done() and not future.cancelled() and future.exception() is None
+
+    def _evict_below(self, priority: Priority) -> bool:
+        """Descarta o último a chegar da menor prioridade na fila, se for menos importante que ``priority``."""
+        waiting = [entry for entry in self._queue if not entry[2].done()]
+        if not waiting:
+            return False
+
+        victim = max(waiting, key=lambda entry: (entry[0], entry[1]))
+        if victim[0] <= priority:
+            return False
+
+        victim[2].set_exception(Overloaded("evicted"))
+        self.queued -= 1
+        self.shed["evicted"] += 1
+        self.shed_by_priority[Priority(victim[0]).name.lower()] += 1
+        return True
+
+    def _admit(self, priority: Priority, waited: float) -> None:
+        self.admitted[priority.name.lower()] += 1
+        self.queue_wait[priority].record(waited)
+
+    def _shed(self, priority: Priority, reason: str) -> None:
+        self.shed[reason] += 1
+        self.shed_by_priority[priority.name.lower()] += 1
+        raise Overloaded(reason)
+
+    @property
+    def saturated(self) -> bool:
+        return self.in_flight >= self.max_in_flight and self.queued >= self.max_queue
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna ocupação, descartes e tempo de fila por prioridade."""
+        total_shed = sum(self.shed.values())
+        total = total_shed + sum(self.admitted.values())
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "peak_queued": self.peak_queued,
+            "admitted": dict(self.admitted),
+            "shed": dict(self.shed),
+            "shed_by_priority": dict(self.shed_by_priority),
+            "shed_rate": round(total_shed / total, 4) if total else 0.0,
+            "queue_wait": {priority.name.lower(): tracker.stats() for priority, tracker in self.queue_wait.items()}
+        }
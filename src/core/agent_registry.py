@@ -0,0 +1,106 @@
+"""
+Registro de agentes do FalaChefe Python.
+Agentes definidos na configuração, registrados no Agent Squad só com nome e descrição e criados no primeiro uso.
+"""
+
+import threading
+import time
+from typing import Any, AsyncIterable, Callable, Dict, List, Optional, Union
+
+from agent_squad.agents import Agent, AgentOptions
+from agent_squad.types import ConversationMessage
+
+
+# Cria o agente real a partir do nome e da definição
+AgentFactory = Callable[[str, Dict[str, Any]], Agent]
+
+
+class LazyAgent(Agent):
+    """
+    Agente criado sob demanda.
+
+    O classificador só precisa de nome e descrição, então o agente entra no
+    Agent Squad sem custo; o agente real (cliente, prompt, retriever) só é
+    criado quando uma mensagem é roteada para ele.
+    """
+
+    def __init__(self, name: str, definition: Dict[str, Any], factory: AgentFactory):
+        """
+        Inicializa o agente sob demanda.
+
+        Args:
+            name: Nome do agente
+            definition: Definição vinda da configuração (descrição, modelo, temperatura...)
+            factory: Cria o agente real
+        """
+        super().__init__(AgentOptions(name=name, description=definition["description"]))
+        self.definition = definition
+        self._factory = factory
+        self._agent: Optional[Agent] = None
+        self._lock = threading.Lock()
+        self.build_seconds: Optional[float] = None
+        self.requests = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._agent is not None
+
+    @property
+    def agent(self) -> Agent:
+        """Agente real, criado no primeiro acesso."""
+        if self._agent is None:
+            with self._lock:
+                if self._agent is None:
+                    started = time.perf_counter()
+                    self._agent = self._factory(self.name, self.definition)
+                    self.build_seconds = time.perf_counter() - started
+        return self._agent
+
+    def is_streaming_enabled(self) -> bool:
+        return self.definition.get("streaming", True)
+
+    async def process_request(
+        self,
+        input_text: str,
+        user_id: str,
+        session_id: str,
+        chat_history: List[ConversationMessage],
+        additional_params: Optional[Dict[str, Any]] = None
+    ) -> Union[ConversationMessage, AsyncIterable[Any]]:
+        self.requests += 1
+        return await self.agent.process_request(input_text, user_id, session_id, chat_history, additional_params)
+
+
+class AgentRegistry:
+    """Agentes ativos segundo a configuração (os desativados ficam de fora do roteamento)."""
+
+    def __init__(self, definitions: Dict[str, Dict[str, Any]], factory: AgentFactory):
+        """
+        Inicializa o registro.
+
+        Args:
+            definitions: Definições por nome (ver ``Config.get_agent_configs``)
+            factory: Cria o agente real a partir do nome e da definição
+        """
+        self.agents: Dict[str, LazyAgent] = {
+            name: LazyAgent(name, definition, factory)
+            for name, definition in definitions.items()
+            if definition.get("enabled", True)
+        }
+        self.disabled = [name for name in definitions if name not in self.agents]
+
+    def get(self, name: str) -> Optional[LazyAgent]:
+        return self.agents.get(name.lower())
+
+    def stats(self) -> Dict[str, Any]:
+        """Estado de cada agente: carregado, ainda não usado ou desativado."""
+        status = {
+            name: {
+                "status": "ready" if agent.loaded else "lazy",
+                "requests": agent.requests,
+                "build_seconds": round(agent.build_seconds, 4) if agent.build_seconds is not None else None
+            }
+            for name, agent in self.agents.items()
+        }
+        status.update({name: {"status": "disabled"} for name in self.disabled})
+        return status
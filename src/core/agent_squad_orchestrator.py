@@ -4,16 +4,80 @@ Implementa os mesmos agentes (Leo, Max, Lia) do TypeScript em Python.
 """
 
 import asyncio
-from typing import Dict, Any, Optional, List
+import copy
+import time
+from typing import Dict, Any, AsyncIterable, AsyncIterator, Optional, List, Set, Tuple, Union
 from datetime import datetime
 import json
 
 from agent_squad.orchestrator import AgentSquad
 from agent_squad.agents import OpenAIAgent, OpenAIAgentOptions
+from agent_squad.classifiers import ClassifierResult, OpenAIClassifier, OpenAIClassifierOptions
+from agent_squad.types import ConversationMessage
 
 from ..utils.config import Config
+from ..utils.deadline import TIMEOUT_REPLY, DeadlineExceeded, call_timeout, deadline_scope, stream_with_deadline, with_deadline
+from ..utils.latency import LatencyTracker
 from ..utils.logger import get_component_logger
+from .agent_registry import AgentRegistry, LazyAgent
+from .chat_history import InMemoryChatHistory, SQLiteChatHistory, WindowedChatStorage, message_text
+from .intent_classifier import IntentPrediction, LocalIntentClassifier
 from .knowledge_retrievers import LeoKnowledgeRetriever, MaxKnowledgeRetriever, LiaKnowledgeRetriever
+from .openai_pool import SharedOpenAIClient
+from .streaming import chunk_event, collect_stream, done_event
+
+
+class _PooledOpenAIAgent(OpenAIAgent):
+    """
+    Agente OpenAI cujas chamadas ao SDK síncrono rodam nas threads do pool compartilhado.
+
+    Cada chamada leva como timeout o que resta do prazo da requisição, para a
+    thread não ficar presa depois que o chamador desistiu.
+    """
+
+    def __init__(self, options: OpenAIAgentOptions, openai: SharedOpenAIClient):
+        super().__init__(options)
+        self.openai = openai
+
+    def _with_timeout(self, request_options: Dict[str, Any]) -> Dict[str, Any]:
+        return {**request_options, "timeout": call_timeout(self.openai.timeout)}
+
+    async def process_request(
+        self,
+        input_text: str,
+        user_id: str,
+        session_id: str,
+        chat_history: List[ConversationMessage],
+        additional_params: Optional[Dict[str, str]] = None
+    ) -> Union[ConversationMessage, AsyncIterable[Any]]:
+        response = await self.openai.run(
+            super().process_request(input_text, user_id, session_id, chat_history, additional_params)
+        )
+        if isinstance(response, ConversationMessage):
+            return response
+        return self.openai.stream(response)
+
+    async def handle_single_response(self, request_options: Dict[str, Any]) -> ConversationMessage:
+        return await super().handle_single_response(self._with_timeout(request_options))
+
+    def handle_streaming_response(self, request_options: Dict[str, Any]) -> AsyncIterator[Any]:
+        return super().handle_streaming_response(self._with_timeout(request_options))
+
+
+class _PooledOpenAIClassifier(OpenAIClassifier):
+    """Classificador LLM sobre o cliente compartilhado, com a chamada síncrona fora do event loop."""
+
+    def __init__(self, options: OpenAIClassifierOptions, openai: SharedOpenAIClient):
+        super().__init__(options)
+        # As opções não aceitam cliente
+        self.client = openai.client
+        self.openai = openai
+
+    async def process_request(self, input_text: str, chat_history: List[ConversationMessage]) -> ClassifierResult:
+        # Cópia rasa com o timeout desta chamada: o cliente compartilhado não é alterado
+        classifier = copy.copy(self)
+        classifier.client = self.client.with_options(timeout=call_timeout(self.openai.timeout))
+        return await self.openai.run(OpenAIClassifier.process_request(classifier, input_text, chat_history))
 
 
 class FalaChefeAgentSquadOrchestrator:
@@ -27,19 +91,53 @@ class FalaChefeAgentSquadOrchestrator:
         self.config = config
         self.logger = get_component_logger("orchestrator")
         
+        # Agentes ativos, por nome (criados no primeiro uso)
+        self.registry: Optional[AgentRegistry] = None
+        self.agents: Dict[str, LazyAgent] = {}
+        
+        # Pré-classificador local: mensagens óbvias vão direto ao agente, sem o classificador LLM
+        self.pre_classifier: Optional[LocalIntentClassifier] = None
+        if config.local_classifier_enabled:
+            self.pre_classifier = LocalIntentClassifier(
+                threshold=config.local_classifier_threshold,
+                audit_rate=config.local_classifier_audit_rate
+            )
+        self._background: Set[asyncio.Task] = set()
+        
+        # Latência por caminho de despacho: agente pedido, pré-classificador ou classificador LLM
+        self.dispatch_latency = {path: LatencyTracker() for path in ("direct", "pre_classifier", "llm_classifier")}
+        
+        # Cliente OpenAI único: agentes e classificador usam o mesmo pool de conexões
+        self.openai = SharedOpenAIClient(
+            config.openai_api_key,
+            max_connections=config.openai_max_connections,
+            max_keepalive_connections=config.openai_max_keepalive_connections,
+            keepalive_expiry=config.openai_keepalive_expiry,
+            timeout=config.openai_request_timeout
+        )
+        
+        # Histórico limitado: últimas trocas + resumo gerado em background
+        self.chat_history = self._create_chat_history()
+        
         # Inicializa o Agent Squad Framework
-        self.agent_squad = self._initialize_agent_squad()
+        self.agent_squad = self._initialize_agent_squad(self.chat_history)
+        
+        # Agent Squad das chamadas sombra (criado na primeira), com histórico descartável
+        self._shadow_agent_squad: Optional[AgentSquad] = None
         
         # Registra os agentes especializados
         self._register_agents()
         
         self.logger.info("Agent Squad Python orquestrador inicializado")
     
-    def _initialize_agent_squad(self) -> AgentSquad:
+    def _initialize_agent_squad(self, storage: WindowedChatStorage) -> AgentSquad:
         """Inicializa o Agent Squad Framework."""
         try:
+            # Classificador LLM sobre o cliente compartilhado
+            classifier = _PooledOpenAIClassifier(OpenAIClassifierOptions(api_key=self.config.openai_api_key), self.openai)
+            
             # Cria o Agent Squad com configuração básica
-            agent_squad = AgentSquad()
+            agent_squad = AgentSquad(classifier=classifier, storage=storage)
             
             return agent_squad
             
@@ -47,142 +145,322 @@ class FalaChefeAgentSquadOrchestrator:
             self.logger.error(f"Erro ao inicializar Agent Squad: {str(e)}")
             raise
     
+    def _shadow_squad(self) -> AgentSquad:
+        """
+        Agent Squad das chamadas sombra: mesmos agentes, histórico próprio.
+        
+        O histórico fica só em memória, sem resumo e limitado a poucas sessões
+        de vida curta, então o tráfego sombra não grava no histórico real (nem
+        no SQLite) e não gera chamadas extras de resumo.
+        """
+        if self._shadow_agent_squad is None:
+            storage = InMemoryChatHistory(
+                max_turns=self.config.chat_history_max_turns,
+                token_budget=self.config.chat_history_token_budget,
+                idle_ttl=300.0,
+                max_sessions=256
+            )
+            self._shadow_agent_squad = self._initialize_agent_squad(storage)
+            for agent in self.agents.values():
+                self._shadow_agent_squad.add_agent(agent)
+        return self._shadow_agent_squad
+    
+    def _create_chat_history(self) -> WindowedChatStorage:
+        """Cria o histórico de conversa configurado (memória ou SQLite)."""
+        options = {
+            "max_turns": self.config.chat_history_max_turns,
+            "token_budget": self.config.chat_history_token_budget,
+            "idle_ttl": self.config.chat_history_idle_ttl,
+            "max_sessions": self.config.chat_history_max_sessions,
+            "summarizer": self._summarize_history
+        }
+        if self.config.chat_history_backend == "sqlite":
+            return SQLiteChatHistory(self.config.chat_history_path, **options)
+        return InMemoryChatHistory(**options)
+    
+    async def _summarize_history(self, summary: str, messages: List[ConversationMessage]) -> str:
+        """Atualiza o resumo da conversa com as mensagens que saíram da janela (em background)."""
+        transcript = "\n".join(f"{message.role}: {message_text(message)}" for message in messages)
+        prompt = (
+            "Atualize o resumo de uma conversa entre um empreendedor e um mentor de negócios. "
+            "Mantenha fatos, números, decisões e pendências; no máximo 120 palavras, em português.\n\n"
+            f"Resumo atual:\n{summary or '(vazio)'}\n\nNovas mensagens:\n{transcript}"
+        )
+        # O SDK é síncrono: a chamada roda nas threads do pool, fora do event loop. O
+        # resumo roda em background, sem o prazo da requisição: vale o timeout do pool
+        response = await self.openai.call(
+            self.openai.client.chat.completions.create,
+            model=self.config.chat_history_summary_model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.2,
+            max_tokens=300,
+            timeout=self.openai.timeout
+        )
+        return response.choices[0].message.content.strip()
+    
     def _register_agents(self) -> None:
-        """Registra os agentes especializados."""
+        """Registra os agentes ativos na configuração (o agente real só é criado quando recebe uma mensagem)."""
         try:
-            # Cria e registra o agente Leo (Financeiro)
-            leo_agent = self._create_leo_agent()
-            self.agent_squad.add_agent(leo_agent)
-            
-            # Cria e registra o agente Max (Marketing)
-            max_agent = self._create_max_agent()
-            self.agent_squad.add_agent(max_agent)
+            self.registry = AgentRegistry(self.config.get_agent_configs(), self._create_agent)
+            self.agents = self.registry.agents
+            for agent in self.agents.values():
+                self.agent_squad.add_agent(agent)
             
-            # Cria e registra o agente Lia (RH)
-            lia_agent = self._create_lia_agent()
-            self.agent_squad.add_agent(lia_agent)
-            
-            self.logger.info("Agentes registrados: Leo (Financeiro), Max (Marketing), Lia (RH)")
+            self.logger.info(
+                f"Agentes registrados: {', '.join(self.agents) or 'nenhum'}"
+                + (f" (desativados: {', '.join(self.registry.disabled)})" if self.registry.disabled else "")
+            )
             
         except Exception as e:
             self.logger.error(f"Erro ao registrar agentes: {str(e)}")
             raise
     
-    def _create_leo_agent(self) -> OpenAIAgent:
-        """Cria o agente Leo (Financeiro)."""
+    def _create_agent(self, name: str, definition: Dict[str, Any]) -> OpenAIAgent:
+        """Cria um agente a partir da sua definição na configuração."""
         try:
-            # Configuração do agente Leo
-            leo_options = OpenAIAgentOptions(
-                name="leo",
-                description="Mentor financeiro experiente e confiável. Ajuda a entender números, evitar erros financeiros e planejar o caixa.",
-                model="gpt-3.5-turbo",
+            options = OpenAIAgentOptions(
+                name=name,
+                description=definition["description"],
+                model=definition["model"],
                 api_key=self.config.openai_api_key,
-                temperature=0.4,  # Respostas precisas
-                max_tokens=800
+                client=self.openai.client,
+                streaming=True,
+                inference_config={"temperature": definition["temperature"], "maxTokens": definition["max_tokens"]}
             )
             
-            return OpenAIAgent(leo_options)
+            self.logger.info(f"Agente {name} criado no primeiro uso")
+            return _PooledOpenAIAgent(options, self.openai)
             
         except Exception as e:
-            self.logger.error(f"Erro ao criar agente Leo: {str(e)}")
+            self.logger.error(f"Erro ao criar agente {name}: {str(e)}")
             raise
     
-    def _create_max_agent(self) -> OpenAIAgent:
-        """Cria o agente Max (Marketing)."""
-        try:
-            # Configuração do agente Max
-            max_options = OpenAIAgentOptions(
-                name="max",
-                description="Especialista em marketing e vendas. Ajuda a criar campanhas, gerar leads e aumentar vendas.",
-                model="gpt-3.5-turbo",
-                api_key=self.config.openai_api_key,
-                temperature=0.6,  # Criatividade moderada
-                max_tokens=800
-            )
-            
-            return OpenAIAgent(max_options)
+    async def process_message(
+        self,
+        message: str,
+        user_id: str,
+        session_id: str,
+        agent_name: Optional[str] = None,
+        shadow: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Processa uma mensagem usando o Agent Squad Framework.
+        
+        Args:
+            message: Mensagem do usuário
+            user_id: ID do usuário
+            session_id: ID da sessão
+            agent_name: Nome do agente específico (opcional)
+            shadow: Chamada de tráfego sombra (ver ``stream_message``)
             
-        except Exception as e:
-            self.logger.error(f"Erro ao criar agente Max: {str(e)}")
-            raise
+        Returns:
+            Resposta processada pelo agente apropriado
+        """
+        return await collect_stream(self.stream_message(message, user_id, session_id, agent_name, shadow))
     
-    def _create_lia_agent(self) -> OpenAIAgent:
-        """Cria o agente Lia (RH)."""
-        try:
-            # Configuração do agente Lia
-            lia_options = OpenAIAgentOptions(
-                name="lia",
-                description="Especialista em recursos humanos. Ajuda com gestão de pessoas, processos de RH e desenvolvimento de equipe.",
-                model="gpt-3.5-turbo",
-                api_key=self.config.openai_api_key,
-                temperature=0.5,  # Equilíbrio entre precisão e empatia
-                max_tokens=800
-            )
-            
-            return OpenAIAgent(lia_options)
+    async def process_message_with_specific_agent(self, message: str, user_id: str, session_id: str, agent_name: str) -> Dict[str, Any]:
+        """
+        Processa uma mensagem diretamente com um agente, sem classificação (uma única chamada ao LLM).
+        
+        Args:
+            message: Mensagem do usuário
+            user_id: ID do usuário
+            session_id: ID da sessão
+            agent_name: Nome do agente ("leo", "max" ou "lia")
             
-        except Exception as e:
-            self.logger.error(f"Erro ao criar agente Lia: {str(e)}")
-            raise
+        Returns:
+            Resposta processada pelo agente pedido
+        """
+        return await self.process_message(message, user_id, session_id, agent_name)
     
-    async def process_message(self, message: str, user_id: str, session_id: str, agent_name: Optional[str] = None) -> Dict[str, Any]:
+    async def stream_message(
+        self,
+        message: str,
+        user_id: str,
+        session_id: str,
+        agent_name: Optional[str] = None,
+        shadow: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Processa uma mensagem usando o Agent Squad Framework.
+        Processa uma mensagem repassando os trechos da resposta à medida que o agente os gera.
         
         Args:
             message: Mensagem do usuário
             user_id: ID do usuário
             session_id: ID da sessão
             agent_name: Nome do agente específico (opcional)
+            shadow: Chamada de tráfego sombra: usa um histórico descartável e não
+                alimenta métricas, auditoria nem o reajuste do pré-classificador
             
-        Returns:
-            Resposta processada pelo agente apropriado
+        Yields:
+            Eventos "chunk" com o texto e, por último, um evento "done" com os metadados
         """
+        started = time.perf_counter()
+        path = None
         try:
             self.logger.info(f"Processando mensagem para usuário {user_id}, sessão {session_id}")
             
-            # Processa a mensagem usando o Agent Squad
-            response = await self.agent_squad.route_request(
-                message,
-                user_id,
-                session_id,
-                {},
-                True  # streaming
-            )
+            # O prazo é fixado na chegada: o escopo não pode atravessar os yields
+            with deadline_scope(self.config.processing_timeout) as stop:
+                # Processa a mensagem (agente pedido, pré-classificação local ou classificação LLM + agente)
+                response, path = await self._route(message, user_id, session_id, agent_name, shadow)
             
             # Extrai informações da resposta
             agent_name_used = response.metadata.agent_name if hasattr(response, 'metadata') else 'unknown'
             
-            # Processa resposta streaming
-            response_content = ""
+            # Repassa a resposta streaming dentro do tempo máximo do agente
             if hasattr(response, 'output'):
-                async for chunk in response.output:
-                    if hasattr(chunk, 'text'):
-                        response_content += chunk.text
-            
-            result = {
-                "message": response_content,
-                "agent_name": agent_name_used,
-                "user_id": user_id,
-                "session_id": session_id,
-                "timestamp": datetime.now().isoformat(),
-                "success": True
-            }
+                max_time = self.config.get_agent_config(str(agent_name_used).lower()).get("max_processing_time")
+                async for text in stream_with_deadline(self._iter_text(response.output), cap=max_time, until=stop):
+                    yield chunk_event(text, agent_name_used)
             
             self.logger.info(f"Mensagem processada pelo agente {agent_name_used}")
-            return result
+            if not shadow:
+                self.dispatch_latency[path].record(time.perf_counter() - started)
+            yield done_event(
+                agent_name=agent_name_used,
+                user_id=user_id,
+                session_id=session_id,
+                timestamp=datetime.now().isoformat(),
+                success=True
+            )
+            
+        except DeadlineExceeded as e:
+            self.logger.warning(f"Prazo esgotado para sessão {session_id}: {str(e)}")
+            if path is not None and not shadow:
+                self.dispatch_latency[path].record(time.perf_counter() - started, success=False)
+            yield done_event(
+                message=TIMEOUT_REPLY,
+                agent_name="system",
+                user_id=user_id,
+                session_id=session_id,
+                timestamp=datetime.now().isoformat(),
+                success=False,
+                timed_out=True,
+                error=str(e)
+            )
             
         except Exception as e:
             self.logger.error(f"Erro ao processar mensagem: {str(e)}")
-            return {
-                "message": "Desculpe, ocorreu um erro ao processar sua mensagem.",
-                "agent_name": "system",
-                "user_id": user_id,
-                "session_id": session_id,
-                "timestamp": datetime.now().isoformat(),
-                "success": False,
-                "error": str(e)
-            }
+            if path is not None and not shadow:
+                self.dispatch_latency[path].record(time.perf_counter() - started, success=False)
+            yield done_event(
+                message="Desculpe, ocorreu um erro ao processar sua mensagem.",
+                agent_name="system",
+                user_id=user_id,
+                session_id=session_id,
+                timestamp=datetime.now().isoformat(),
+                success=False,
+                error=str(e)
+            )
+    
+    async def _route(
+        self,
+        message: str,
+        user_id: str,
+        session_id: str,
+        agent_name: Optional[str] = None,
+        shadow: bool = False
+    ) -> Tuple[Any, str]:
+        """
+        Escolhe o agente e processa a mensagem.
+        
+        Com ``agent_name``, a mensagem vai direto ao agente pedido, sem
+        classificação. Senão, quando o pré-classificador local tem confiança
+        suficiente, vai direto ao agente previsto; nos demais casos, o Agent
+        Squad classifica com o LLM e a escolha dele alimenta as métricas e o
+        reajuste do pré-classificador. Chamadas sombra seguem o mesmo caminho
+        no Agent Squad sombra, sem aprendizado nem auditoria.
+        
+        Returns:
+            Resposta do Agent Squad e o caminho usado ("direct", "pre_classifier" ou "llm_classifier")
+        """
+        if agent_name:
+            agent = self.agents.get(agent_name.lower())
+            if agent is None:
+                raise ValueError(f"Agente desconhecido ou desativado: {agent_name}")
+            return await self._dispatch_to(agent, message, user_id, session_id, 1.0, shadow), "direct"
+        
+        prediction = self.pre_classifier.predict(message) if self.pre_classifier else None
+        agent = self.agents.get(prediction.agent) if prediction and prediction.confident else None
+        
+        if agent is not None:
+            response = await self._dispatch_to(agent, message, user_id, session_id, prediction.confidence, shadow)
+            if not shadow:
+                self.pre_classifier.record_bypass()
+                if self.pre_classifier.should_audit():
+                    self._spawn(self._audit_bypass(message, user_id, session_id, prediction))
+            return response, "pre_classifier"
+        
+        squad = self._shadow_squad() if shadow else self.agent_squad
+        response = await with_deadline(squad.route_request(
+            message,
+            user_id,
+            session_id,
+            {},
+            True  # streaming
+        ))
+        if prediction is not None and hasattr(response, 'metadata') and not shadow:
+            self._record_llm_choice(message, prediction, response.metadata.agent_name)
+        return response, "llm_classifier"
+    
+    async def _dispatch_to(
+        self,
+        agent: LazyAgent,
+        message: str,
+        user_id: str,
+        session_id: str,
+        confidence: float,
+        shadow: bool = False
+    ):
+        """Envia a mensagem a um agente já escolhido, sem passar pelo classificador do Agent Squad."""
+        squad = self._shadow_squad() if shadow else self.agent_squad
+        return await with_deadline(squad.agent_process_request(
+            message,
+            user_id,
+            session_id,
+            ClassifierResult(selected_agent=agent, confidence=confidence),
+            {},
+            True  # streaming
+        ))
+    
+    async def _audit_bypass(self, message: str, user_id: str, session_id: str, prediction: IntentPrediction) -> None:
+        """Confere com o classificador LLM uma mensagem desviada (em background)."""
+        try:
+            with deadline_scope(self.config.processing_timeout):
+                result = await with_deadline(self.agent_squad.classify_request(message, user_id, session_id))
+            selected = result.selected_agent.name if result.selected_agent else None
+            self._record_llm_choice(message, prediction, selected, audit=True)
+        except Exception as e:
+            self.logger.info(f"Auditoria do pré-classificador falhou: {str(e)}")
+    
+    def _record_llm_choice(self, message: str, prediction: IntentPrediction, llm_agent: Optional[str], audit: bool = False) -> None:
+        """Registra a escolha do LLM e reajusta o pré-classificador em thread quando há exemplos novos suficientes."""
+        if self.pre_classifier.record_llm_choice(message, prediction, llm_agent, audit=audit):
+            self._spawn(asyncio.to_thread(self.pre_classifier.refit))
+    
+    def _spawn(self, coroutine) -> None:
+        task = asyncio.create_task(coroutine)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+    
+    async def _iter_text(self, output) -> AsyncIterator[str]:
+        """Texto de cada trecho de uma resposta streaming (ou a mensagem inteira, se o agente não fizer streaming)."""
+        if not hasattr(output, '__aiter__'):
+            content = getattr(output, 'content', None) or []
+            yield "".join(part.get('text', '') for part in content if isinstance(part, dict))
+            return
+        
+        async for chunk in output:
+            if hasattr(chunk, 'text'):
+                yield chunk.text
+    
+    def close(self) -> None:
+        """Fecha o histórico e o pool de conexões compartilhado (ex.: ao aposentar o sistema Python numa troca)."""
+        self.chat_history.close()
+        if self._shadow_agent_squad is not None:
+            self._shadow_agent_squad.storage.close()
+        self.openai.close()
     
     async def health_check(self) -> Dict[str, Any]:
         """
@@ -194,18 +472,14 @@ class FalaChefeAgentSquadOrchestrator:
         try:
             health_status = {
                 "orchestrator": "healthy",
-                "agents": {},
+                "agents": self.registry.stats(),
+                "pre_classifier": self.pre_classifier.stats() if self.pre_classifier else {"enabled": False},
+                "dispatch_latency": {path: tracker.stats() for path, tracker in self.dispatch_latency.items()},
+                "openai_pool": self.openai.stats(),
+                "chat_history": await self.chat_history.stats(),
                 "timestamp": datetime.now().isoformat()
             }
             
-            # Verifica cada agente
-            for agent_name in ["leo", "max", "lia"]:
-                try:
-                    # Tenta obter o agente (implementação específica do Agent Squad)
-                    health_status["agents"][agent_name] = "healthy"
-                except Exception as e:
-                    health_status["agents"][agent_name] = f"error: {str(e)}"
-            
             return health_status
             
         except Exception as e:
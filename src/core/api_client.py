@@ -10,6 +10,7 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 
 from ..utils.config import Config
+from ..utils.deadline import call_timeout
 from ..utils.logger import get_component_logger
 
 
@@ -47,6 +48,10 @@ class FalaChefeAPIClient:
             timeout = aiohttp.ClientTimeout(total=30)
             self.session = aiohttp.ClientSession(timeout=timeout)
     
+    def _request_timeout(self, default: float = 30) -> aiohttp.ClientTimeout:
+        """Timeout da chamada: o que resta do prazo da requisição, limitado a ``default`` (DeadlineExceeded se acabou)."""
+        return aiohttp.ClientTimeout(total=call_timeout(default))
+    
     async def _close_session(self):
         """Fecha sessão HTTP."""
         if self.session:
@@ -85,7 +90,7 @@ class FalaChefeAPIClient:
             
             self.logger.info(f"Enviando mensagem WhatsApp para {phone_number}")
             
-            async with self.session.post(url, headers=headers, json=payload) as response:
+            async with self.session.post(url, headers=headers, json=payload, timeout=self._request_timeout()) as response:
                 if response.status == 200:
                     result = await response.json()
                     self.logger.info("Mensagem WhatsApp enviada com sucesso")
@@ -188,7 +193,7 @@ class FalaChefeAPIClient:
             
             self.logger.info(f"Salvando dados no Supabase: {table}")
             
-            async with self.session.post(url, headers=headers, json=data) as response:
+            async with self.session.post(url, headers=headers, json=data, timeout=self._request_timeout()) as response:
                 if response.status in [200, 201]:
                     result = await response.json()
                     self.logger.info("Dados salvos no Supabase com sucesso")
@@ -241,7 +246,7 @@ class FalaChefeAPIClient:
             
             self.logger.info(f"Buscando dados do Supabase: {table}")
             
-            async with self.session.get(url, headers=headers, params=params) as response:
+            async with self.session.get(url, headers=headers, params=params, timeout=self._request_timeout()) as response:
                 if response.status == 200:
                     result = await response.json()
                     self.logger.info("Dados obtidos do Supabase com sucesso")
@@ -295,7 +300,7 @@ class FalaChefeAPIClient:
             
             self.logger.info("Chamando API do OpenAI")
             
-            async with self.session.post(url, headers=headers, json=payload) as response:
+            async with self.session.post(url, headers=headers, json=payload, timeout=self._request_timeout()) as response:
                 if response.status == 200:
                     result = await response.json()
                     self.logger.info("Resposta do OpenAI obtida com sucesso")
@@ -0,0 +1,125 @@
+"""
+Simulação de caixa do FalaChefe Python.
+Monte Carlo vetorizado de receitas e despesas para estimar o fôlego de caixa (runway).
+"""
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from .financial_forecast import MIN_HISTORY, forecast_series
+
+
+# Volatilidade mensal usada quando o histórico é curto demais para estimá-la
+DEFAULT_REVENUE_VOLATILITY = 0.10
+DEFAULT_EXPENSE_VOLATILITY = 0.05
+# Correlação entre choques de receita e despesa (custos acompanham vendas)
+DEFAULT_CORRELATION = 0.5
+PERCENTILES = (10, 50, 90)
+
+
+def _as_history(values: Any) -> np.ndarray:
+    """Converte um valor ou lista de valores mensais em array (sem NaN)."""
+    history = np.atleast_1d(np.asarray(values if values is not None else [], dtype=np.float64))
+    return history[~np.isnan(history)]
+
+
+def _volatility(history: np.ndarray, default: float) -> float:
+    """Desvio padrão dos retornos logarítmicos mensais (ou ``default``)."""
+    positive = history[history > 0]
+    if len(positive) < MIN_HISTORY:
+        return default
+    return float(np.std(np.diff(np.log(positive)), ddof=1))
+
+
+def _baseline(revenue: np.ndarray, expenses: np.ndarray, months: int) -> np.ndarray:
+    """Trajetória esperada (2 x meses) de receita e despesa."""
+    if min(len(revenue), len(expenses)) >= MIN_HISTORY:
+        length = min(len(revenue), len(expenses))
+        forecast = forecast_series(np.vstack([revenue[-length:], expenses[-length:]]), horizon=months)
+        return np.clip(forecast.forecast, 0, None)
+
+    last = [revenue[-1] if len(revenue) else 0.0, expenses[-1] if len(expenses) else 0.0]
+    return np.repeat(np.asarray(last)[:, None], months, axis=1)
+
+
+def _runway_percentiles(runway: np.ndarray, months: int) -> np.ndarray:
+    """Percentis do runway (meses inteiros) pela distribuição acumulada, sem ordenar as trajetórias."""
+    cumulative = np.cumsum(np.bincount(runway, minlength=months + 2)) / len(runway)
+    return np.searchsorted(cumulative, np.asarray(PERCENTILES) / 100.0)
+
+
+def simulate_cash_runway(
+    opening_balance: float,
+    revenue: Sequence[float],
+    expenses: Sequence[float],
+    months: int = 12,
+    paths: int = 20000,
+    correlation: float = DEFAULT_CORRELATION,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Simula ``paths`` trajetórias de caixa e resume o runway.
+
+    A trajetória esperada vem da previsão por suavização exponencial (ou do
+    último mês quando o histórico é curto). Sobre ela, receita e despesa
+    recebem choques log-normais correlacionados que se acumulam mês a mês
+    (passeio aleatório multiplicativo com média preservada). Todas as
+    trajetórias são sorteadas em uma única operação de array.
+
+    Args:
+        opening_balance: Saldo de caixa atual
+        revenue: Receita mensal (histórico em ordem cronológica ou valor único)
+        expenses: Despesa mensal (histórico em ordem cronológica ou valor único)
+        months: Horizonte da simulação em meses
+        paths: Quantidade de trajetórias simuladas
+        correlation: Correlação entre choques de receita e despesa
+        seed: Semente do gerador (resultados reprodutíveis)
+
+    Returns:
+        Percentis de runway e de saldo e probabilidade de saldo negativo por mês
+    """
+    revenue_history = _as_history(revenue)
+    expense_history = _as_history(expenses)
+    baseline = _baseline(revenue_history, expense_history, months)
+    volatility = np.array([
+        _volatility(revenue_history, DEFAULT_REVENUE_VOLATILITY),
+        _volatility(expense_history, DEFAULT_EXPENSE_VOLATILITY)
+    ])
+
+    rng = np.random.default_rng(seed)
+    shocks = rng.standard_normal((2, paths, months), dtype=np.float32)
+    shocks[1] = correlation * shocks[0] + np.sqrt(1.0 - correlation ** 2) * shocks[1]
+
+    # Fator acumulado exp(soma de (sigma * z - sigma² / 2)): média 1 em cada mês
+    sigma = volatility[:, None, None].astype(np.float32)
+    factors = np.exp(np.cumsum(sigma * shocks - 0.5 * sigma ** 2, axis=2))
+    flows = baseline[:, None, :] * factors
+
+    balance = opening_balance + np.cumsum(flows[0] - flows[1], axis=1)
+    negative = balance < 0
+
+    # Runway: primeiro mês com saldo negativo (months + 1 quando não acontece no horizonte)
+    ever_negative = negative.any(axis=1)
+    runway = np.where(ever_negative, negative.argmax(axis=1) + 1, months + 1)
+    runway_percentiles = _runway_percentiles(runway, months)
+    balance_percentiles = np.percentile(balance, PERCENTILES, axis=0)
+
+    return {
+        "months": months,
+        "paths": paths,
+        "opening_balance": float(opening_balance),
+        "expected_net_flow": [round(float(value), 2) for value in baseline[0] - baseline[1]],
+        "volatility": {"revenue": round(float(volatility[0]), 4), "expenses": round(float(volatility[1]), 4)},
+        # None = caixa não fica negativo dentro do horizonte nesse percentil
+        "runway_months": {
+            f"p{percentile}": None if value > months else float(value)
+            for percentile, value in zip(PERCENTILES, runway_percentiles)
+        },
+        "balance_percentiles": {
+            f"p{percentile}": [round(float(value), 2) for value in row]
+            for percentile, row in zip(PERCENTILES, balance_percentiles)
+        },
+        "probability_negative_by_month": [round(float(value), 4) for value in negative.mean(axis=0)],
+        "probability_negative_within_horizon": round(float(ever_negative.mean()), 4)
+    }
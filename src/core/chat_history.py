@@ -0,0 +1,469 @@
+"""
+Histórico de conversa do FalaChefe Python.
+Janela das últimas trocas por sessão + resumo acumulado gerado em background, em memória (LRU) ou SQLite.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from agent_squad.storage import ChatStorage
+from agent_squad.types import ConversationMessage, ParticipantRole, TimestampedMessage
+
+from ..utils.logger import get_component_logger
+
+
+# Recebe o resumo atual e as mensagens que saíram da janela; retorna o novo resumo
+Summarizer = Callable[[str, List[ConversationMessage]], Awaitable[str]]
+
+SUMMARY_PREFIX = "[Resumo da conversa até aqui]"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa barata de tokens (~4 caracteres por token)."""
+    return (len(text) + 3) // 4
+
+
+def message_text(message: Union[ConversationMessage, Dict[str, Any]]) -> str:
+    """Texto de uma mensagem (partes de texto do conteúdo, juntadas)."""
+    content = message.get("content") if isinstance(message, dict) else message.content
+    return " ".join(part.get("text", "") for part in content or [] if isinstance(part, dict))
+
+
+@dataclass
+class _Session:
+    """Janela, resumo e mensagens aguardando resumo de um par sessão/agente."""
+
+    user_id: str
+    session_id: str
+    agent_id: str
+    messages: List[Dict[str, Any]] = field(default_factory=list)
+    summary: str = ""
+    # Mensagens que saíram da janela e ainda não entraram no resumo
+    pending: List[Dict[str, Any]] = field(default_factory=list)
+    next_seq: int = 0
+    last_access: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "messages": self.messages,
+            "summary": self.summary,
+            "pending": self.pending,
+            "next_seq": self.next_seq
+        }, ensure_ascii=False)
+
+    @classmethod
+    def from_row(cls, user_id: str, session_id: str, agent_id: str, data: str, last_access: float) -> "_Session":
+        return cls(user_id, session_id, agent_id, last_access=last_access, **json.loads(data))
+
+
+class WindowedChatStorage(ChatStorage):
+    """
+    Histórico limitado para o Agent Squad.
+
+    Cada par sessão/agente guarda só as últimas ``max_turns`` trocas
+    (pergunta + resposta). As mensagens que saem da janela são incorporadas
+    a um resumo acumulado por ``summarizer``, em background: a leitura do
+    histórico nunca espera por uma chamada ao LLM. O histórico entregue ao
+    agente (resumo + janela) respeita ``token_budget``, e sessões sem acesso
+    há mais de ``idle_ttl`` segundos são descartadas.
+
+    Subclasses implementam o armazenamento das sessões.
+    """
+
+    LOCK_STRIPES = 64
+
+    def __init__(
+        self,
+        max_turns: int = 6,
+        token_budget: int = 2000,
+        idle_ttl: float = 3600.0,
+        summarizer: Optional[Summarizer] = None
+    ):
+        """
+        Inicializa o histórico.
+
+        Args:
+            max_turns: Trocas mantidas literalmente por sessão/agente
+            token_budget: Tokens (estimados) do histórico entregue ao agente
+            idle_ttl: Segundos sem acesso até a sessão ser descartada
+            summarizer: Gera o resumo acumulado (None descarta o que sai da janela)
+        """
+        super().__init__()
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.idle_ttl = idle_ttl
+        self.summarizer = summarizer
+        self.logger = get_component_logger("chat_history")
+
+        self._locks = [asyncio.Lock() for _ in range(self.LOCK_STRIPES)]
+        self._summarizing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._swept_at = time.time()
+
+        self.evicted = 0
+        self.summaries = 0
+        self.summary_failures = 0
+        self.trimmed_for_budget = 0
+
+    # Armazenamento (subclasses)
+
+    @abstractmethod
+    async def _get(self, key: str) -> Optional[_Session]:
+        """Sessão armazenada na chave, ou None."""
+
+    @abstractmethod
+    async def _put(self, key: str, session: _Session) -> None:
+        """Grava a sessão na chave."""
+
+    async def _touch(self, key: str, session: _Session) -> None:
+        """Registra o acesso à sessão."""
+
+    @abstractmethod
+    async def _session_keys(self, user_id: str, session_id: str) -> List[str]:
+        """Chaves das sessões (uma por agente) do usuário/sessão."""
+
+    @abstractmethod
+    async def _evict_idle(self, before: float) -> int:
+        """Remove as sessões sem acesso desde ``before`` e retorna quantas saíram."""
+
+    @abstractmethod
+    async def _count(self) -> int:
+        """Quantidade de sessões armazenadas."""
+
+    # Interface ChatStorage
+
+    @staticmethod
+    def _key(user_id: str, session_id: str, agent_id: str) -> str:
+        return f"{user_id}#{session_id}#{agent_id}"
+
+    def _lock(self, key: str) -> asyncio.Lock:
+        return self._locks[hash(key) % self.LOCK_STRIPES]
+
+    async def save_chat_message(
+        self,
+        user_id: str,
+        session_id: str,
+        agent_id: str,
+        new_message: Union[ConversationMessage, TimestampedMessage],
+        max_history_size: Optional[int] = None
+    ) -> bool:
+        return await self.save_chat_messages(user_id, session_id, agent_id, [new_message], max_history_size)
+
+    async def save_chat_messages(
+        self,
+        user_id: str,
+        session_id: str,
+        agent_id: str,
+        new_messages: Union[List[ConversationMessage], List[TimestampedMessage]],
+        max_history_size: Optional[int] = None
+    ) -> bool:
+        key = self._key(user_id, session_id, agent_id)
+        async with self._lock(key):
+            session = await self._get(key) or _Session(user_id, session_id, agent_id)
+            for message in new_messages:
+                # Mensagens consecutivas do mesmo papel não são salvas (como no InMemoryChatStorage)
+                if session.messages and session.messages[-1]["role"] == message.role:
+                    continue
+                session.messages.append({
+                    "role": message.role,
+                    "content": message.content,
+                    "timestamp": getattr(message, "timestamp", None) or int(time.time() * 1000),
+                    "seq": session.next_seq
+                })
+                session.next_seq += 1
+
+            overflow = len(session.messages) - self.max_turns * 2
+            if overflow > 0:
+                if self.summarizer is not None:
+                    session.pending.extend(session.messages[:overflow])
+                    # Se o resumo atrasar, o que passar de uma janela extra é descartado
+                    del session.pending[:-self.max_turns * 2]
+                del session.messages[:overflow]
+
+            session.last_access = time.time()
+            await self._put(key, session)
+
+        if session.pending:
+            self._schedule_summary(key)
+        await self._maybe_sweep()
+        return True
+
+    async def fetch_chat(
+        self,
+        user_id: str,
+        session_id: str,
+        agent_id: str,
+        max_history_size: Optional[int] = None
+    ) -> List[ConversationMessage]:
+        key = self._key(user_id, session_id, agent_id)
+        session = await self._get(key)
+        if session is None:
+            return []
+
+        session.last_access = time.time()
+        await self._touch(key, session)
+
+        window = [ConversationMessage(role=message["role"], content=message["content"]) for message in session.messages]
+        if max_history_size is not None:
+            window = self.trim_conversation(window, max_history_size)
+
+        summary = []
+        if session.summary:
+            text = f"{SUMMARY_PREFIX}: {session.summary}"[:self.token_budget * 4]
+            summary = [ConversationMessage(role=ParticipantRole.USER.value, content=[{"text": text}])]
+
+        used = sum(estimate_tokens(message_text(message)) for message in summary)
+        return summary + self._fit_budget(window, self.token_budget - used)
+
+    async def fetch_all_chats(self, user_id: str, session_id: str) -> List[ConversationMessage]:
+        """Janelas de todos os agentes da sessão, em ordem cronológica (usado pelo classificador)."""
+        messages = []
+        for key in await self._session_keys(user_id, session_id):
+            session = await self._get(key)
+            if session is None:
+                continue
+            for message in session.messages:
+                content = message["content"] or []
+                if content and message["role"] == ParticipantRole.ASSISTANT.value:
+                    content = [{"text": f"[{session.agent_id}] {message_text(message)}"}]
+                messages.append((message["timestamp"], ConversationMessage(role=message["role"], content=content)))
+
+        messages.sort(key=lambda item: item[0])
+        return self._fit_budget([message for _, message in messages], self.token_budget)
+
+    def _fit_budget(self, window: List[ConversationMessage], budget: int) -> List[ConversationMessage]:
+        """Descarta as mensagens mais antigas até caber no orçamento; a janela sempre começa pelo usuário."""
+        window = list(window)
+        tokens = sum(estimate_tokens(message_text(message)) for message in window)
+        while window and tokens > budget:
+            tokens -= estimate_tokens(message_text(window.pop(0)))
+            self.trimmed_for_budget += 1
+        while window and window[0].role != ParticipantRole.USER.value:
+            window.pop(0)
+        return window
+
+    # Resumo em background
+
+    def _schedule_summary(self, key: str) -> None:
+        if self.summarizer is None or key in self._summarizing:
+            return
+        self._summarizing.add(key)
+        task = asyncio.create_task(self._summarize(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _summarize(self, key: str) -> None:
+        """Incorpora ao resumo as mensagens que saíram da janela, sem bloquear leituras e gravações."""
+        try:
+            while True:
+                session = await self._get(key)
+                if session is None or not session.pending:
+                    return
+                batch = list(session.pending)
+                summary = await self.summarizer(
+                    session.summary,
+                    [ConversationMessage(role=message["role"], content=message["content"]) for message in batch]
+                )
+
+                async with self._lock(key):
+                    session = await self._get(key)
+                    if session is None:
+                        return
+                    last_seq = batch[-1]["seq"]
+                    session.pending = [message for message in session.pending if message["seq"] > last_seq]
+                    session.summary = summary
+                    await self._put(key, session)
+                self.summaries += 1
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.summary_failures += 1
+            self.logger.warning(f"Falha ao resumir histórico de {key}: {str(e)}")
+        finally:
+            self._summarizing.discard(key)
+
+    async def wait_for_summaries(self) -> None:
+        """Aguarda os resumos em andamento."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    # Descarte de sessões ociosas
+
+    async def _maybe_sweep(self) -> None:
+        if time.time() - self._swept_at >= max(self.idle_ttl / 10, 1.0):
+            await self.evict_idle()
+
+    async def evict_idle(self) -> int:
+        """Descarta as sessões sem acesso há mais de ``idle_ttl`` segundos (e as que passam do limite)."""
+        self._swept_at = time.time()
+        evicted = await self._evict_idle(self._swept_at - self.idle_ttl)
+        self.evicted += evicted
+        return evicted
+
+    def close(self) -> None:
+        """Cancela os resumos em andamento."""
+        for task in list(self._tasks):
+            task.cancel()
+
+    async def stats(self) -> Dict[str, Any]:
+        """Sessões ativas, descartes e resumos."""
+        return {
+            "sessions": await self._count(),
+            "max_turns": self.max_turns,
+            "token_budget": self.token_budget,
+            "evicted": self.evicted,
+            "summaries": self.summaries,
+            "summary_failures": self.summary_failures,
+            "summarizing": len(self._summarizing),
+            "trimmed_for_budget": self.trimmed_for_budget
+        }
+
+
+class InMemoryChatHistory(WindowedChatStorage):
+    """Histórico em memória, com no máximo ``max_sessions`` pares sessão/agente (LRU)."""
+
+    def __init__(self, max_sessions: int = 10000, **kwargs: Any):
+        """
+        Inicializa o histórico em memória.
+
+        Args:
+            max_sessions: Pares sessão/agente mantidos (os menos usados saem primeiro)
+            **kwargs: Parâmetros de ``WindowedChatStorage``
+        """
+        super().__init__(**kwargs)
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        # (usuário, sessão) -> chaves dos agentes, para fetch_all_chats sem varrer tudo
+        self._index: Dict[tuple, Set[str]] = {}
+
+    async def _get(self, key: str) -> Optional[_Session]:
+        session = self._sessions.get(key)
+        if session is not None:
+            self._sessions.move_to_end(key)
+        return session
+
+    async def _put(self, key: str, session: _Session) -> None:
+        self._sessions[key] = session
+        self._sessions.move_to_end(key)
+        self._index.setdefault((session.user_id, session.session_id), set()).add(key)
+        while len(self._sessions) > self.max_sessions:
+            self._drop(next(iter(self._sessions)))
+            self.evicted += 1
+
+    async def _session_keys(self, user_id: str, session_id: str) -> List[str]:
+        return list(self._index.get((user_id, session_id), ()))
+
+    async def _evict_idle(self, before: float) -> int:
+        # Ordem de acesso: as ociosas estão no início
+        idle = []
+        for key, session in self._sessions.items():
+            if session.last_access >= before:
+                break
+            idle.append(key)
+        for key in idle:
+            self._drop(key)
+        return len(idle)
+
+    def _drop(self, key: str) -> None:
+        session = self._sessions.pop(key)
+        keys = self._index.get((session.user_id, session.session_id))
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._index[(session.user_id, session.session_id)]
+
+    async def _count(self) -> int:
+        return len(self._sessions)
+
+
+class SQLiteChatHistory(WindowedChatStorage):
+    """Histórico em SQLite (uma linha por par sessão/agente), acessado fora do event loop."""
+
+    def __init__(self, path: str = "data/chat_history.db", max_sessions: int = 100000, **kwargs: Any):
+        """
+        Inicializa o histórico em SQLite.
+
+        Args:
+            path: Arquivo do banco (":memory:" para testes)
+            max_sessions: Pares sessão/agente mantidos (os menos usados saem primeiro)
+            **kwargs: Parâmetros de ``WindowedChatStorage``
+        """
+        super().__init__(**kwargs)
+        self.max_sessions = max_sessions
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._db_lock:
+            self._conn.executescript("""
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS chat_sessions (
+                    key TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    agent_id TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    last_access REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_chat_sessions_session ON chat_sessions (user_id, session_id);
+                CREATE INDEX IF NOT EXISTS idx_chat_sessions_access ON chat_sessions (last_access);
+            """)
+
+    def _execute(self, sql: str, params: Iterable[Any] = ()) -> Tuple[List[tuple], int]:
+        with self._db_lock:
+            cursor = self._conn.execute(sql, tuple(params))
+            rows = cursor.fetchall()
+            self._conn.commit()
+            return rows, cursor.rowcount
+
+    async def _run(self, sql: str, params: Iterable[Any] = ()) -> Tuple[List[tuple], int]:
+        """Executa em thread: o SQLite não bloqueia o event loop."""
+        return await asyncio.to_thread(self._execute, sql, params)
+
+    async def _get(self, key: str) -> Optional[_Session]:
+        rows, _ = await self._run(
+            "SELECT user_id, session_id, agent_id, data, last_access FROM chat_sessions WHERE key = ?", (key,)
+        )
+        return _Session.from_row(*rows[0]) if rows else None
+
+    async def _put(self, key: str, session: _Session) -> None:
+        await self._run(
+            "INSERT OR REPLACE INTO chat_sessions (key, user_id, session_id, agent_id, data, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, session.user_id, session.session_id, session.agent_id, session.to_json(), session.last_access)
+        )
+
+    async def _touch(self, key: str, session: _Session) -> None:
+        await self._run("UPDATE chat_sessions SET last_access = ? WHERE key = ?", (session.last_access, key))
+
+    async def _session_keys(self, user_id: str, session_id: str) -> List[str]:
+        rows, _ = await self._run("SELECT key FROM chat_sessions WHERE user_id = ? AND session_id = ?", (user_id, session_id))
+        return [row[0] for row in rows]
+
+    async def _evict_idle(self, before: float) -> int:
+        _, idle = await self._run("DELETE FROM chat_sessions WHERE last_access < ?", (before,))
+        _, overflow = await self._run(
+            "DELETE FROM chat_sessions WHERE key IN "
+            "(SELECT key FROM chat_sessions ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_sessions,)
+        )
+        return idle + overflow
+
+    async def _count(self) -> int:
+        rows, _ = await self._run("SELECT COUNT(*) FROM chat_sessions")
+        return rows[0][0]
+
+    def close(self) -> None:
+        """Cancela os resumos em andamento e fecha o banco."""
+        super().close()
+        with self._db_lock:
+            self._conn.close()
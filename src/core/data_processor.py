@@ -4,12 +4,26 @@ Gerencia dados de conversas, análises e integração com banco de dados.
 """
 
 import asyncio
+import copy
 import json
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 import pandas as pd
 import numpy as np
 
+from ..analytics.conversation_store import ConversationStore
+from ..analytics.running_aggregates import ConversationMetrics, RunningAggregates
+from ..analytics.rolling_windows import RollingWindowAggregates, to_epoch
+from ..analytics.topic_sketch import TopicTracker
+from .financial_analysis import analyze_financial_frame, financial_dict_to_frame, analysis_row_to_dict
+from .financial_forecast import forecast_financial_frame, forecast_history
+from .cash_simulator import simulate_cash_runway
+from .financial_loader import FinancialDataLoader, resolve_columns
+from .financial_statements import FinancialStatementEngine
+from .transaction_categorizer import TransactionCategorizer
+from ..utils.cache import TTLCache, content_hash
 from ..utils.config import Config
 from ..utils.logger import get_component_logger
 
@@ -25,16 +39,42 @@ class DataProcessor:
         self.config = config
         self.logger = get_component_logger("data_processor")
         
-        # Cache de dados
-        self.conversation_cache = {}
+        # Cache de dados (conversas limitadas; a mais antiga é removida primeiro)
+        self.conversation_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.conversation_cache_size = config.conversation_cache_size
         self.analysis_cache = {}
         
+        # Agregados incrementais das conversas em cache
+        self.aggregates = RunningAggregates()
+        
+        # Agregados por janela de tempo (buckets por minuto/hora/dia)
+        self.windows = RollingWindowAggregates()
+        
+        # Store colunar para analytics vetorizados. Guarda mais conversas que o
+        # cache (linhas compactas) e identifica regravações nas janelas e tópicos
+        self.conversation_store = ConversationStore(max_rows=max(config.conversation_store_size, self.conversation_cache_size))
+        
+        # Tópicos frequentes (sketches de memória fixa por janela, agente e tenant)
+        self.topics = TopicTracker()
+        
+        # Carregador de ledgers e motor de DRE/fluxo de caixa (criados sob demanda)
+        self._financial_loader: Optional[FinancialDataLoader] = None
+        self._statement_engine: Optional[FinancialStatementEngine] = None
+        self._categorizer: Optional[TransactionCategorizer] = None
+        
+        # Relatórios financeiros memoizados por hash do conteúdo (criado sob demanda)
+        self._report_cache: Optional[TTLCache] = None
+        
         self.logger.info("DataProcessor inicializado")
     
     async def load_financial_data(self, data_source: str) -> Dict[str, Any]:
         """
         Carrega dados financeiros de uma fonte específica.
         
+        Arquivos CSV, Excel (.xlsx) e Parquet são lidos em blocos e agregados
+        por mês; o resultado fica em cache enquanto o arquivo não mudar.
+        Outras fontes retornam dados de demonstração.
+        
         Args:
             data_source: Fonte dos dados (arquivo, API, etc.)
             
@@ -44,8 +84,12 @@ class DataProcessor:
         try:
             self.logger.info(f"Carregando dados financeiros: {data_source}")
             
-            # Simula carregamento de dados financeiros
-            # Em produção, aqui você integraria com APIs reais
+            if Path(data_source).is_file():
+                financial_data = await asyncio.to_thread(self.financial_loader.load, data_source)
+                self.logger.info("Dados financeiros carregados com sucesso")
+                return financial_data
+            
+            # Dados de demonstração para fontes que não são arquivos
             financial_data = {
                 "revenue": {
                     "current_month": 50000.0,
@@ -77,6 +121,116 @@ class DataProcessor:
             self.logger.error(f"Erro ao carregar dados financeiros: {str(e)}")
             return {"error": str(e)}
     
+    @property
+    def financial_loader(self) -> FinancialDataLoader:
+        """Carregador de ledgers configurado a partir da configuração."""
+        if self._financial_loader is None:
+            self._financial_loader = FinancialDataLoader(
+                cache_dir=self.config.financial_cache_dir,
+                chunk_size=self.config.financial_chunk_size
+            )
+        return self._financial_loader
+    
+    @property
+    def statement_engine(self) -> FinancialStatementEngine:
+        """Motor de demonstrações financeiras (DRE e fluxo de caixa)."""
+        if self._statement_engine is None:
+            self._statement_engine = FinancialStatementEngine(chunk_size=self.config.financial_chunk_size)
+        return self._statement_engine
+    
+    async def append_ledger(self, ledger: Union[pd.DataFrame, str]) -> Dict[str, Any]:
+        """
+        Anexa transações ao motor de demonstrações financeiras.
+        
+        Apenas transações novas devem ser enviadas: os totais existentes são
+        atualizados sem reprocessar o histórico.
+        
+        Args:
+            ledger: DataFrame de transações ou caminho de arquivo CSV/Excel/Parquet
+            
+        Returns:
+            Quantidade de transações incluídas e estatísticas do motor
+        """
+        try:
+            if isinstance(ledger, pd.DataFrame):
+                appended = await asyncio.to_thread(self.statement_engine.append, ledger)
+            else:
+                appended = await asyncio.to_thread(self.statement_engine.append_file, ledger)
+            
+            self.logger.info(f"Ledger atualizado: {appended} transações incluídas")
+            return {"appended": appended, **self.statement_engine.stats()}
+            
+        except Exception as e:
+            self.logger.error(f"Erro ao anexar ledger: {str(e)}")
+            return {"error": str(e)}
+    
+    @property
+    def categorizer(self) -> TransactionCategorizer:
+        """Categorizador de transações (regras compiladas com cache de descrições)."""
+        if self._categorizer is None:
+            self._categorizer = TransactionCategorizer()
+        return self._categorizer
+    
+    async def categorize_transactions(self, transactions: pd.DataFrame) -> Union[pd.DataFrame, Dict[str, Any]]:
+        """
+        Categoriza um lote de transações pela descrição.
+        
+        Args:
+            transactions: DataFrame com descrição (description/descricao/historico)
+                e, opcionalmente, tipo (type/tipo) e valor (amount/valor)
+            
+        Returns:
+            Cópia do DataFrame com as colunas category, category_type e category_confidence
+        """
+        try:
+            columns = resolve_columns(transactions)
+            if "description" not in columns:
+                raise ValueError("Transações precisam de uma coluna de descrição (description/descricao/historico)")
+            
+            result = await asyncio.to_thread(
+                self.categorizer.categorize,
+                transactions[columns["description"]],
+                transactions[columns["type"]] if "type" in columns else None,
+                transactions[columns["amount"]] if "amount" in columns else None
+            )
+            
+            stats = self.categorizer.stats()
+            self.logger.info(
+                f"{len(transactions)} transações categorizadas "
+                f"({stats['descriptions_per_second']:.0f} descrições/s, cache {stats['cache']['hit_rate']:.0%})"
+            )
+            return transactions.assign(
+                category=result["category"].to_numpy(),
+                category_type=result["type"].to_numpy(),
+                category_confidence=result["confidence"].to_numpy()
+            )
+            
+        except Exception as e:
+            self.logger.error(f"Erro ao categorizar transações: {str(e)}")
+            return {"error": str(e)}
+    
+    async def build_financial_statements(self, business_id: Optional[str] = None, freq: str = "M",
+                                         opening_balance: float = 0.0) -> Dict[str, pd.DataFrame]:
+        """
+        Gera DRE e fluxo de caixa por negócio e período a partir do ledger acumulado.
+        
+        Args:
+            business_id: Negócio (None = todos)
+            freq: "M" (mensal), "Q" (trimestral) ou "Y" (anual)
+            opening_balance: Saldo inicial de cada negócio
+            
+        Returns:
+            DataFrames ``income_statement`` e ``cash_flow_statement`` indexados por (business_id, period)
+        """
+        engine = self.statement_engine
+        income_statement = await asyncio.to_thread(engine.income_statement, business_id, freq)
+        cash_flow_statement = await asyncio.to_thread(engine.cash_flow_statement, business_id, freq, opening_balance)
+        
+        return {
+            "income_statement": income_statement,
+            "cash_flow_statement": cash_flow_statement
+        }
+    
     async def analyze_financial_data(self, financial_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analisa dados financeiros usando técnicas avançadas de Python.
@@ -90,49 +244,22 @@ class DataProcessor:
         try:
             self.logger.info("Iniciando análise financeira avançada")
             
+            # Reaproveita o pipeline vetorizado com um lote de uma linha
+            frame = financial_dict_to_frame(financial_data)
+            result = analyze_financial_frame(frame)
+            sections = [name for name in ("revenue", "expenses", "cash_flow") if name in financial_data]
+            
             analysis = {
                 "timestamp": datetime.now().isoformat(),
-                "revenue_analysis": {},
-                "expense_analysis": {},
-                "cash_flow_analysis": {},
-                "recommendations": []
+                **analysis_row_to_dict(result.iloc[0], sections)
             }
             
-            # Análise de receita
-            if "revenue" in financial_data:
-                revenue = financial_data["revenue"]
-                analysis["revenue_analysis"] = {
-                    "growth_trend": "positive" if revenue.get("growth_rate", 0) > 0 else "negative",
-                    "growth_rate": revenue.get("growth_rate", 0),
-                    "monthly_revenue": revenue.get("current_month", 0),
-                    "projected_annual": revenue.get("current_month", 0) * 12
-                }
-            
-            # Análise de despesas
-            if "expenses" in financial_data:
-                expenses = financial_data["expenses"]
-                total_expenses = expenses.get("total", 0)
-                analysis["expense_analysis"] = {
-                    "total_expenses": total_expenses,
-                    "expense_breakdown": {
-                        "operational": expenses.get("operational", 0) / total_expenses if total_expenses > 0 else 0,
-                        "marketing": expenses.get("marketing", 0) / total_expenses if total_expenses > 0 else 0,
-                        "administrative": expenses.get("administrative", 0) / total_expenses if total_expenses > 0 else 0
-                    },
-                    "expense_efficiency": "good" if total_expenses < financial_data.get("revenue", {}).get("current_month", 0) * 0.8 else "needs_optimization"
-                }
-            
-            # Análise de fluxo de caixa
-            if "cash_flow" in financial_data:
-                cash_flow = financial_data["cash_flow"]
-                analysis["cash_flow_analysis"] = {
-                    "net_cash_flow": cash_flow.get("net", 0),
-                    "cash_flow_health": "healthy" if cash_flow.get("net", 0) > 0 else "concerning",
-                    "liquidity_ratio": cash_flow.get("inflow", 0) / cash_flow.get("outflow", 1) if cash_flow.get("outflow", 0) > 0 else 0
-                }
-            
-            # Gera recomendações
-            analysis["recommendations"] = self._generate_financial_recommendations(analysis)
+            # Com histórico mensal, a projeção anual vem da previsão (e não de receita * 12)
+            forecast = forecast_history(financial_data.get("history") or {})
+            if forecast is not None:
+                analysis["forecast"] = forecast
+                if analysis["revenue_analysis"]:
+                    analysis["revenue_analysis"]["projected_annual"] = forecast["projected_annual_revenue"]
             
             self.logger.info("Análise financeira concluída")
             return analysis
@@ -141,50 +268,147 @@ class DataProcessor:
             self.logger.error(f"Erro na análise financeira: {str(e)}")
             return {"error": str(e)}
     
-    def _generate_financial_recommendations(self, analysis: Dict[str, Any]) -> List[str]:
-        """Gera recomendações baseadas na análise financeira."""
-        recommendations = []
+    async def analyze_financial_batch(self, financial_frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Analisa dados financeiros de muitos negócios e períodos em uma única passada vetorizada.
         
-        # Recomendações baseadas no crescimento
-        if analysis.get("revenue_analysis", {}).get("growth_rate", 0) < 0.05:
-            recommendations.append("Considere estratégias para aumentar a receita, como novos produtos ou expansão de mercado")
+        Args:
+            financial_frame: DataFrame com colunas business_id, period, revenue,
+                expense_* e cash_* (ver ``analyze_financial_frame``)
+            
+        Returns:
+            DataFrame com crescimento, despesas, liquidez e recomendações por linha
+        """
+        self.logger.info(f"Iniciando análise financeira em lote: {len(financial_frame)} linhas")
         
-        # Recomendações baseadas nas despesas
-        if analysis.get("expense_analysis", {}).get("expense_efficiency") == "needs_optimization":
-            recommendations.append("Revise as despesas operacionais para melhorar a eficiência financeira")
+        result = await asyncio.to_thread(analyze_financial_frame, financial_frame)
         
-        # Recomendações baseadas no fluxo de caixa
-        if analysis.get("cash_flow_analysis", {}).get("cash_flow_health") == "concerning":
-            recommendations.append("Implemente controles de fluxo de caixa mais rigorosos e considere uma reserva de emergência")
+        self.logger.info("Análise financeira em lote concluída")
+        return result
+    
+    async def forecast_financial_batch(self, financial_frame: pd.DataFrame, horizon: int = 12, confidence: float = 0.95) -> pd.DataFrame:
+        """
+        Projeta receita, despesas e resultado de muitos negócios em uma única passada vetorizada.
+        
+        Args:
+            financial_frame: DataFrame com business_id, period (AAAA-MM), revenue e expense_*
+            horizon: Meses a prever
+            confidence: Nível de confiança dos intervalos
+            
+        Returns:
+            DataFrame com previsão pontual e intervalo por negócio e mês futuro
+        """
+        self.logger.info(f"Iniciando previsão financeira em lote: {len(financial_frame)} linhas, {horizon} meses")
+        
+        result = await asyncio.to_thread(forecast_financial_frame, financial_frame, horizon=horizon, confidence=confidence)
         
-        return recommendations
+        self.logger.info("Previsão financeira em lote concluída")
+        return result
     
-    async def generate_financial_report(self, analysis: Dict[str, Any], leo_insights: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def simulate_cash_runway(self, financial_data: Dict[str, Any], opening_balance: Optional[float] = None,
+                                   months: int = 12, paths: int = 20000, seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Simula o caixa dos próximos meses (Monte Carlo) para responder sobre runway.
+        
+        Usa o histórico mensal quando disponível (``history`` do carregador de
+        ledgers); caso contrário, parte da receita e despesa do mês atual.
+        
+        Args:
+            financial_data: Dados financeiros do negócio
+            opening_balance: Saldo atual (padrão: cash_flow.balance, ou 0)
+            months: Horizonte em meses
+            paths: Quantidade de trajetórias simuladas
+            seed: Semente do gerador (resultados reprodutíveis)
+            
+        Returns:
+            Percentis de runway, percentis de saldo e probabilidade de saldo negativo por mês
+        """
+        try:
+            history = financial_data.get("history") or {}
+            revenue = history.get("revenue") or financial_data.get("revenue", {}).get("current_month", 0.0)
+            expenses = history.get("expenses") or financial_data.get("expenses", {}).get("total", 0.0)
+            if opening_balance is None:
+                opening_balance = financial_data.get("cash_flow", {}).get("balance", 0.0)
+            
+            simulation = await asyncio.to_thread(
+                simulate_cash_runway, opening_balance, revenue, expenses, months=months, paths=paths, seed=seed
+            )
+            
+            self.logger.info(
+                f"Simulação de caixa concluída: {paths} trajetórias, "
+                f"P(saldo negativo em {months} meses) = {simulation['probability_negative_within_horizon']:.1%}"
+            )
+            return {"timestamp": datetime.now().isoformat(), **simulation}
+            
+        except Exception as e:
+            self.logger.error(f"Erro na simulação de caixa: {str(e)}")
+            return {"error": str(e)}
+    
+    @property
+    def report_cache(self) -> TTLCache:
+        """Cache de relatórios financeiros (tamanho e TTL vindos da configuração)."""
+        if self._report_cache is None:
+            self._report_cache = TTLCache(
+                max_size=self.config.report_cache_size,
+                ttl_seconds=self.config.report_cache_ttl_seconds
+            )
+        return self._report_cache
+    
+    async def generate_financial_report(self, analysis: Dict[str, Any], leo_insights: Optional[Dict[str, Any]] = None,
+                                        business_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Gera relatório financeiro combinando análise Python com insights do Leo.
         
+        Quando há transações no motor de demonstrações, o relatório inclui a
+        DRE e o fluxo de caixa do último período.
+        
+        O relatório é memoizado pelo hash do conteúdo (análise, insights,
+        negócio e versão do ledger, ignorando timestamps): o ``report_id`` é o
+        mesmo para o mesmo conteúdo e chamadas repetidas vêm do cache.
+        
         Args:
             analysis: Análise financeira do Python
             leo_insights: Insights do agente Leo (opcional)
+            business_id: Negócio das demonstrações (None = consolidado)
             
         Returns:
             Relatório financeiro completo
         """
         try:
+            ledger_rows = len(self._statement_engine) if self._statement_engine is not None else 0
+            digest = content_hash({
+                "analysis": analysis,
+                "leo_insights": leo_insights or {},
+                "business_id": business_id,
+                "ledger_rows": ledger_rows
+            })
+            
+            cached = self.report_cache.get(digest)
+            if cached is not None:
+                self.logger.debug(f"Relatório financeiro em cache: {cached['report_id']}")
+                return copy.deepcopy(cached)
+            
             self.logger.info("Gerando relatório financeiro")
             
+            statements = {}
+            if ledger_rows:
+                statements = await asyncio.to_thread(self._statement_engine.summary, business_id)
+            
             report = {
-                "report_id": f"fin_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                "report_id": f"fin_{digest[:16]}",
                 "timestamp": datetime.now().isoformat(),
                 "executive_summary": self._generate_executive_summary(analysis),
                 "detailed_analysis": analysis,
+                "financial_statements": statements,
                 "leo_insights": leo_insights or {},
                 "recommendations": analysis.get("recommendations", []),
                 "next_steps": self._generate_next_steps(analysis)
             }
             
+            self.report_cache.set(digest, report)
+            
             self.logger.info("Relatório financeiro gerado com sucesso")
-            return report
+            return copy.deepcopy(report)
             
         except Exception as e:
             self.logger.error(f"Erro ao gerar relatório financeiro: {str(e)}")
@@ -228,13 +452,46 @@ class DataProcessor:
         try:
             conversation_id = conversation_data.get('id', 'unknown')
             
-            # Atualiza cache
+            metrics = ConversationMetrics.from_analysis(analysis, response)
+            epoch = to_epoch(conversation_data.get("timestamp"))
+            
+            # Atualiza cache e agregados (remove a versão anterior, se houver)
+            previous = self.conversation_cache.pop(conversation_id, None)
+            if previous is not None:
+                self.aggregates.remove(previous["metrics"])
+            
+            # As janelas vão além do cache: a versão anterior vem do store, que
+            # ainda a conhece mesmo depois de a conversa sair do cache
+            stored = self.conversation_store.get(conversation_id)
+            if stored is not None:
+                self.windows.remove(*stored)
+            
             self.conversation_cache[conversation_id] = {
                 "conversation": conversation_data,
                 "response": response,
                 "analysis": analysis,
+                "metrics": metrics,
+                "epoch": epoch,
                 "timestamp": datetime.now().isoformat()
             }
+            self.aggregates.add(metrics)
+            self.windows.add(metrics, epoch)
+            
+            while len(self.conversation_cache) > self.conversation_cache_size:
+                _, evicted = self.conversation_cache.popitem(last=False)
+                self.aggregates.remove(evicted["metrics"])
+            
+            # Registra métricas no store colunar (uma linha por conversa)
+            self._record_in_store(conversation_id, conversation_data, metrics, epoch)
+            
+            # Atualiza os tópicos com o texto da mensagem (somente na primeira gravação)
+            if stored is None:
+                self.topics.add(
+                    conversation_data.get("message", ""),
+                    agent=metrics.agent,
+                    tenant=self._tenant_of(conversation_data),
+                    timestamp=epoch
+                )
             
             # Em produção, aqui você salvaria no banco de dados
             self.logger.debug(f"Dados da conversa {conversation_id} atualizados")
@@ -242,12 +499,39 @@ class DataProcessor:
         except Exception as e:
             self.logger.error(f"Erro ao atualizar dados da conversa: {str(e)}")
     
-    async def get_conversation_analytics(self, time_period: str = "30d") -> Dict[str, Any]:
+    def _record_in_store(self, conversation_id: str, conversation_data: Dict[str, Any], metrics: ConversationMetrics,
+                         epoch: float) -> None:
+        """Grava as métricas da conversa no store colunar (substituindo a versão anterior)."""
+        self.conversation_store.upsert(
+            conversation_id,
+            timestamp=epoch,
+            user=conversation_data.get("user_id", "unknown"),
+            agent=metrics.agent,
+            latency=metrics.latency,
+            sentiment=metrics.sentiment,
+            intent=metrics.intent,
+            tokens=metrics.tokens,
+            success=metrics.success,
+            satisfaction=metrics.satisfaction
+        )
+    
+    @staticmethod
+    def _tenant_of(conversation_data: Dict[str, Any]) -> Optional[str]:
+        """Identifica o tenant (empresa) da conversa, se informado."""
+        tenant = conversation_data.get("tenant_id") or conversation_data.get("company_id")
+        return str(tenant) if tenant else None
+    
+    async def get_conversation_analytics(self, time_period: str = "30d", detailed: bool = False) -> Dict[str, Any]:
         """
         Obtém analytics das conversas processadas.
         
+        As métricas principais vêm das janelas pré-agregadas (custo O(buckets)).
+        Com ``detailed=True`` inclui também p95 de latência e usuários únicos,
+        calculados de forma vetorizada no store colunar (conversas em cache).
+        
         Args:
             time_period: Período de análise (7d, 30d, 90d)
+            detailed: Inclui métricas que exigem varrer o store colunar
             
         Returns:
             Analytics das conversas
@@ -255,43 +539,79 @@ class DataProcessor:
         try:
             self.logger.info(f"Gerando analytics para período: {time_period}")
             
-            # Simula analytics baseado no cache
-            total_conversations = len(self.conversation_cache)
+            window = self.windows.window(time_period)
+            averages = window.averages()
             
             analytics = {
                 "period": time_period,
-                "total_conversations": total_conversations,
-                "agent_distribution": self._calculate_agent_distribution(),
+                "total_conversations": window.count,
+                "agent_distribution": self._calculate_agent_distribution(time_period, window),
+                "sentiment_distribution": window.sentiment_distribution(),
+                "intent_distribution": window.intent_distribution(),
                 "conversation_metrics": {
-                    "avg_response_time": "2.5s",
-                    "success_rate": 0.95,
-                    "user_satisfaction": 4.2
+                    "avg_response_time": f"{averages.get('avg_response_time_seconds', 0.0):.1f}s",
+                    "success_rate": averages.get("avg_success_rate", 0.0),
+                    "user_satisfaction": averages.get("avg_user_satisfaction", 0.0),
+                    "total_tokens": window.tokens_sum
                 },
-                "topics": self._extract_top_topics(),
+                "topics": self._extract_top_topics(time_period),
                 "recommendations": self._generate_analytics_recommendations()
             }
             
+            if detailed:
+                stats = self.conversation_store.analytics(time_period)
+                analytics["conversation_metrics"]["p95_response_time"] = f"{stats['p95_latency_seconds']:.1f}s"
+                analytics["conversation_metrics"]["unique_users"] = stats["unique_users"]
+            
             return analytics
             
         except Exception as e:
             self.logger.error(f"Erro ao gerar analytics: {str(e)}")
             return {"error": str(e)}
     
-    def _calculate_agent_distribution(self) -> Dict[str, int]:
+    def _calculate_agent_distribution(self, time_period: Optional[str] = None, window: Optional[RunningAggregates] = None) -> Dict[str, int]:
         """Calcula distribuição de conversas por agente."""
-        distribution = {"leo": 0, "max": 0, "lia": 0, "unknown": 0}
-        
-        for conv_data in self.conversation_cache.values():
-            agent = conv_data.get("response", {}).get("agent_name", "unknown")
-            if agent in distribution:
-                distribution[agent] += 1
+        if time_period is None:
+            # Conversas em cache: contadores incrementais, O(1)
+            return self.aggregates.agent_distribution()
         
-        return distribution
+        # Janela de tempo: soma dos buckets do período
+        return (window or self.windows.window(time_period)).agent_distribution()
     
-    def _extract_top_topics(self) -> List[str]:
+    def _extract_top_topics(self, time_period: Optional[str] = None, agent: Optional[str] = None,
+                            tenant: Optional[str] = None, limit: int = 5) -> List[str]:
         """Extrai tópicos mais frequentes das conversas."""
-        # Simula extração de tópicos
-        return ["finanças", "marketing", "vendas", "rh", "gestão"]
+        return [topic for topic, _ in self.topics.top_topics(limit, time_period, agent, tenant)]
+    
+    async def get_top_topics(self, time_period: str = "30d", agent: Optional[str] = None,
+                             tenant: Optional[str] = None, limit: int = 10) -> Dict[str, Any]:
+        """
+        Obtém os tópicos mais frequentes das mensagens.
+        
+        As contagens são estimativas do sketch Space-Saving (podem superestimar
+        termos raros, nunca perdem os frequentes).
+        
+        Args:
+            time_period: Período de análise (24h, 7d, 30d); por dia para tenants
+            agent: Filtra por agente (leo, max, lia)
+            tenant: Filtra por tenant/empresa
+            limit: Quantidade de tópicos
+            
+        Returns:
+            Tópicos com contagem estimada
+        """
+        try:
+            topics = self.topics.top_topics(limit, time_period, agent, tenant)
+            return {
+                "period": time_period,
+                "agent": agent,
+                "tenant": tenant,
+                "topics": [{"topic": topic, "count": count} for topic, count in topics]
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Erro ao extrair tópicos: {str(e)}")
+            return {"error": str(e)}
     
     def _generate_analytics_recommendations(self) -> List[str]:
         """Gera recomendações baseadas nos analytics."""
@@ -314,6 +634,8 @@ class DataProcessor:
                 "status": "healthy",
                 "cache_size": len(self.conversation_cache),
                 "analysis_cache_size": len(self.analysis_cache),
+                "store_rows": len(self.conversation_store),
+                "report_cache": self._report_cache.stats() if self._report_cache is not None else {},
                 "timestamp": datetime.now().isoformat()
             }
             
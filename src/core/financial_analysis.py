@@ -0,0 +1,187 @@
+"""
+Análise financeira vetorizada do FalaChefe Python.
+Calcula crescimento, despesas, liquidez e recomendações para muitos negócios e períodos de uma vez.
+"""
+
+from typing import Dict, Any, List
+
+import numpy as np
+import pandas as pd
+
+
+EXPENSE_CATEGORIES = ("operational", "marketing", "administrative")
+
+RECOMMENDATION_GROWTH = "Considere estratégias para aumentar a receita, como novos produtos ou expansão de mercado"
+RECOMMENDATION_EXPENSES = "Revise as despesas operacionais para melhorar a eficiência financeira"
+RECOMMENDATION_CASH_FLOW = "Implemente controles de fluxo de caixa mais rigorosos e considere uma reserva de emergência"
+
+# Combinações possíveis de recomendações indexadas por bitmask (crescimento=1, despesas=2, caixa=4)
+_RECOMMENDATION_TABLE = np.empty(8, dtype=object)
+for _mask in range(8):
+    _RECOMMENDATION_TABLE[_mask] = tuple(
+        text for bit, text in (
+            (1, RECOMMENDATION_GROWTH),
+            (2, RECOMMENDATION_EXPENSES),
+            (4, RECOMMENDATION_CASH_FLOW)
+        ) if _mask & bit
+    )
+
+
+def _column(frame: pd.DataFrame, name: str) -> np.ndarray:
+    """Retorna a coluna como float64 (NaN quando ausente)."""
+    if name in frame:
+        return pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=np.float64)
+    return np.full(len(frame), np.nan)
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Divide elemento a elemento retornando 0 quando o denominador não é positivo."""
+    result = np.zeros_like(numerator, dtype=np.float64)
+    valid = denominator > 0
+    np.divide(numerator, denominator, out=result, where=valid)
+    return result
+
+
+def analyze_financial_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Analisa um lote de dados financeiros com operações vetorizadas.
+
+    Colunas aceitas (todas opcionais exceto ``revenue``):
+        business_id, period, revenue, previous_revenue, growth_rate,
+        expense_operational, expense_marketing, expense_administrative, expense_total,
+        cash_inflow, cash_outflow, cash_net
+
+    Quando ``growth_rate`` e ``previous_revenue`` não são informados, o crescimento
+    é calculado em relação ao período anterior do mesmo negócio. Seções sem
+    nenhuma coluna informada (despesas ou caixa) ficam como NaN e não geram
+    recomendações.
+
+    Args:
+        frame: DataFrame com uma linha por negócio e período
+
+    Returns:
+        DataFrame com uma linha de análise por negócio e período
+    """
+    if "revenue" not in frame:
+        raise ValueError("Coluna obrigatória ausente: revenue")
+
+    data = frame.reset_index(drop=True)
+    if "business_id" not in data:
+        data = data.assign(business_id="default")
+    if "period" in data:
+        data = data.sort_values(["business_id", "period"], kind="stable").reset_index(drop=True)
+
+    revenue = np.nan_to_num(_column(data, "revenue"))
+
+    # Crescimento: taxa explícita > receita anterior informada > período anterior do negócio
+    previous_revenue = _column(data, "previous_revenue")
+    missing_previous = np.isnan(previous_revenue)
+    if missing_previous.any():
+        shifted = data.groupby("business_id", sort=False)["revenue"].shift(1)
+        previous_revenue = np.where(missing_previous, pd.to_numeric(shifted, errors="coerce").to_numpy(dtype=np.float64), previous_revenue)
+
+    computed_growth = _safe_divide(revenue - np.nan_to_num(previous_revenue), np.nan_to_num(previous_revenue))
+    explicit_growth = _column(data, "growth_rate")
+    growth_rate = np.where(np.isnan(explicit_growth), computed_growth, explicit_growth)
+
+    # Despesas
+    has_expenses = any(f"expense_{name}" in data for name in (*EXPENSE_CATEGORIES, "total"))
+    parts = {name: np.nan_to_num(_column(data, f"expense_{name}")) for name in EXPENSE_CATEGORIES}
+    total_expenses = _column(data, "expense_total")
+    total_expenses = np.where(np.isnan(total_expenses), sum(parts.values()), total_expenses)
+    if not has_expenses:
+        total_expenses = np.full(len(data), np.nan)
+
+    # Fluxo de caixa
+    has_cash_flow = any(f"cash_{name}" in data for name in ("inflow", "outflow", "net"))
+    inflow = np.nan_to_num(_column(data, "cash_inflow"))
+    outflow = np.nan_to_num(_column(data, "cash_outflow"))
+    net_cash_flow = _column(data, "cash_net")
+    net_cash_flow = np.where(np.isnan(net_cash_flow), inflow - outflow, net_cash_flow)
+    if not has_cash_flow:
+        net_cash_flow = np.full(len(data), np.nan)
+
+    needs_optimization = has_expenses & ~(total_expenses < revenue * 0.8)
+    concerning_cash = has_cash_flow & ~(net_cash_flow > 0)
+    low_growth = growth_rate < 0.05
+
+    recommendation_mask = low_growth.astype(np.int8) | (needs_optimization.astype(np.int8) << 1) | (concerning_cash.astype(np.int8) << 2)
+
+    result = pd.DataFrame({
+        "business_id": data["business_id"].to_numpy(),
+        "growth_rate": growth_rate,
+        "growth_trend": np.where(growth_rate > 0, "positive", "negative"),
+        "monthly_revenue": revenue,
+        "projected_annual": revenue * 12,
+        "total_expenses": total_expenses,
+        "expense_efficiency": np.where(needs_optimization, "needs_optimization", "good"),
+        "net_cash_flow": net_cash_flow,
+        "cash_flow_health": np.where(net_cash_flow > 0, "healthy", "concerning"),
+        "liquidity_ratio": _safe_divide(inflow, outflow),
+        "recommendations": _RECOMMENDATION_TABLE[recommendation_mask]
+    })
+    if "period" in data:
+        result.insert(1, "period", data["period"].to_numpy())
+    for name in EXPENSE_CATEGORIES:
+        result[f"share_{name}"] = _safe_divide(parts[name], np.nan_to_num(total_expenses))
+
+    return result
+
+
+def financial_dict_to_frame(financial_data: Dict[str, Any]) -> pd.DataFrame:
+    """Converte o formato aninhado de dados financeiros em um DataFrame de uma linha."""
+    row: Dict[str, Any] = {}
+
+    revenue = financial_data.get("revenue")
+    row["revenue"] = revenue.get("current_month", 0) if revenue else 0
+    row["growth_rate"] = revenue.get("growth_rate", 0) if revenue else 0
+
+    expenses = financial_data.get("expenses")
+    if expenses is not None:
+        row["expense_total"] = expenses.get("total", 0)
+        for name in EXPENSE_CATEGORIES:
+            row[f"expense_{name}"] = expenses.get(name, 0)
+
+    cash_flow = financial_data.get("cash_flow")
+    if cash_flow is not None:
+        row["cash_inflow"] = cash_flow.get("inflow", 0)
+        row["cash_outflow"] = cash_flow.get("outflow", 0)
+        row["cash_net"] = cash_flow.get("net", 0)
+
+    return pd.DataFrame([row])
+
+
+def analysis_row_to_dict(row: pd.Series, sections: List[str]) -> Dict[str, Any]:
+    """Converte uma linha de análise no formato de dicionário usado pelos relatórios."""
+    analysis: Dict[str, Any] = {
+        "revenue_analysis": {},
+        "expense_analysis": {},
+        "cash_flow_analysis": {}
+    }
+
+    if "revenue" in sections:
+        analysis["revenue_analysis"] = {
+            "growth_trend": row["growth_trend"],
+            "growth_rate": float(row["growth_rate"]),
+            "monthly_revenue": float(row["monthly_revenue"]),
+            "projected_annual": float(row["projected_annual"])
+        }
+
+    if "expenses" in sections:
+        analysis["expense_analysis"] = {
+            "total_expenses": float(row["total_expenses"]),
+            "expense_breakdown": {
+                name: float(row[f"share_{name}"]) for name in EXPENSE_CATEGORIES
+            },
+            "expense_efficiency": row["expense_efficiency"]
+        }
+
+    if "cash_flow" in sections:
+        analysis["cash_flow_analysis"] = {
+            "net_cash_flow": float(row["net_cash_flow"]),
+            "cash_flow_health": row["cash_flow_health"],
+            "liquidity_ratio": float(row["liquidity_ratio"])
+        }
+
+    analysis["recommendations"] = list(row["recommendations"])
+    return analysis
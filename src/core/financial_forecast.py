@@ -0,0 +1,274 @@
+"""
+Previsão financeira vetorizada do FalaChefe Python.
+Suavização exponencial (Holt amortecido e Holt-Winters aditivo) ajustada para muitos negócios de uma vez.
+"""
+
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .financial_analysis import EXPENSE_CATEGORIES, _column
+
+
+# Grade de parâmetros avaliada em paralelo para cada série (beta é fração de alpha)
+ALPHA_GRID = (0.1, 0.3, 0.5, 0.7, 0.9)
+BETA_FRACTIONS = (0.0, 0.1, 0.3)
+GAMMA = 0.1
+PHI = 0.98
+MIN_HISTORY = 3
+
+
+@dataclass
+class SeriesForecast:
+    """Previsões de um lote de séries (uma linha por série, uma coluna por passo)."""
+
+    forecast: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    alpha: np.ndarray
+    beta: np.ndarray
+    sigma: np.ndarray
+    seasonal: bool
+
+
+def _row_mean(values: np.ndarray) -> np.ndarray:
+    """Média por linha ignorando NaN (NaN quando a linha não tem valores)."""
+    counts = (~np.isnan(values)).sum(axis=1)
+    totals = np.nansum(values, axis=1)
+    return np.divide(totals, counts, out=np.full(len(values), np.nan), where=counts > 0)
+
+
+def _initial_state(values: np.ndarray, season_length: int, seasonal: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Estado inicial (nível, tendência, sazonalidade) de cada série."""
+    series_count = values.shape[0]
+
+    if seasonal:
+        # Médias dos dois primeiros ciclos (centradas em (m - 1) / 2 e 3m/2 - 1/2)
+        first = _row_mean(values[:, :season_length])
+        second = _row_mean(values[:, season_length:2 * season_length])
+        trend = np.nan_to_num((second - first) / season_length)
+        center = (season_length - 1) / 2
+        offsets = np.arange(season_length) - center
+        season = np.nan_to_num(values[:, :season_length] - (first[:, None] + trend[:, None] * offsets))
+        # Nível "antes" do primeiro mês, para que a primeira previsão seja nível + tendência
+        level = np.nan_to_num(first) - trend * (center + 1)
+        return level, trend, season
+
+    # Sem sazonalidade: nível no primeiro valor observado, tendência zero
+    valid = ~np.isnan(values)
+    first_index = valid.argmax(axis=1)
+    level = np.nan_to_num(values[np.arange(series_count), first_index])
+    return level, np.zeros(series_count), np.zeros((series_count, 1))
+
+
+def _fit_block(values: np.ndarray, season_length: int, seasonal: bool) -> Tuple[np.ndarray, ...]:
+    """Avalia a grade de parâmetros em um bloco de séries e retorna o melhor estado de cada uma."""
+    series_count, length = values.shape
+    period = season_length if seasonal else 1
+    gamma = GAMMA if seasonal else 0.0
+
+    alphas = np.repeat(ALPHA_GRID, len(BETA_FRACTIONS))
+    betas = alphas * np.tile(BETA_FRACTIONS, len(ALPHA_GRID))
+    combos = len(alphas)
+
+    level0, trend0, season0 = _initial_state(values, season_length, seasonal)
+    level = np.broadcast_to(level0, (combos, series_count)).copy()
+    trend = np.broadcast_to(trend0, (combos, series_count)).copy()
+    season = np.broadcast_to(season0, (combos, series_count, period)).copy()
+    sse = np.zeros((combos, series_count))
+    alpha_column = alphas[:, None]
+    beta_column = betas[:, None]
+
+    for step in range(length):
+        slot = step % period
+        observed = values[:, step]
+        valid = ~np.isnan(observed)
+
+        error = np.where(valid, observed - (level + PHI * trend + season[:, :, slot]), 0.0)
+        level = level + PHI * trend + alpha_column * error
+        trend = PHI * trend + beta_column * error
+        season[:, :, slot] += gamma * error
+        sse += error ** 2
+
+    best = sse.argmin(axis=0)
+    columns = np.arange(series_count)
+    return level[best, columns], trend[best, columns], season[best, columns], alphas[best], betas[best], sse[best, columns]
+
+
+def forecast_series(
+    values: np.ndarray,
+    horizon: int = 12,
+    season_length: int = 12,
+    confidence: float = 0.95,
+    block_size: int = 16384
+) -> SeriesForecast:
+    """
+    Ajusta suavização exponencial a cada linha e projeta ``horizon`` passos.
+
+    Todas as combinações de parâmetros da grade são avaliadas ao mesmo tempo
+    para todas as séries (um laço apenas sobre os meses), e cada série fica
+    com a combinação de menor erro quadrático um passo à frente. Séries com
+    pelo menos dois ciclos completos usam Holt-Winters aditivo; as demais,
+    Holt com tendência amortecida. Meses ausentes (NaN) não atualizam o estado.
+
+    Args:
+        values: Matriz (séries x meses), em ordem cronológica
+        horizon: Quantidade de meses a prever
+        season_length: Tamanho do ciclo sazonal
+        confidence: Nível de confiança dos intervalos
+        block_size: Séries ajustadas por vez (limita a memória da grade)
+
+    Returns:
+        Previsões pontuais, intervalos e parâmetros escolhidos por série
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    length = values.shape[1]
+    seasonal = length >= 2 * season_length
+    period = season_length if seasonal else 1
+    gamma = GAMMA if seasonal else 0.0
+
+    blocks = [
+        _fit_block(values[start:start + block_size], season_length, seasonal)
+        for start in range(0, len(values), block_size)
+    ]
+    level, trend, season, alpha, beta, sse = (np.concatenate(parts) for parts in zip(*blocks))
+
+    observations = (~np.isnan(values)).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sigma = np.sqrt(sse / (observations - 1))
+    sigma = np.where(observations >= MIN_HISTORY, sigma, np.nan)
+
+    steps = np.arange(1, horizon + 1)
+    damping = np.cumsum(PHI ** steps)
+    slots = (length + steps - 1) % period
+    forecast = level[:, None] + damping[None, :] * trend[:, None] + season[:, slots]
+
+    # Variância h passos à frente do modelo ETS aditivo amortecido:
+    # sigma² * (1 + soma de c_j² para j < h), c_j = alpha + beta * phi_j (+ gamma a cada ciclo)
+    coefficients = alpha[:, None] + beta[:, None] * np.concatenate(([0.0], damping[:-1]))[None, :]
+    coefficients[:, 0] = 0.0
+    if seasonal:
+        coefficients += gamma * (((steps - 1) % period == 0) & (steps > 1))[None, :]
+    variance = 1.0 + np.cumsum(coefficients ** 2, axis=1)
+    width = NormalDist().inv_cdf(0.5 + confidence / 2) * sigma[:, None] * np.sqrt(variance)
+
+    return SeriesForecast(
+        forecast=forecast,
+        lower=forecast - width,
+        upper=forecast + width,
+        alpha=alpha,
+        beta=beta,
+        sigma=sigma,
+        seasonal=seasonal
+    )
+
+
+def _future_periods(last_period: Any, horizon: int) -> List[str]:
+    """Rótulos dos meses futuros (ou "+n" quando o período não é um mês)."""
+    try:
+        start = pd.Period(str(last_period), freq="M") + 1
+        return [str(period) for period in pd.period_range(start, periods=horizon, freq="M")]
+    except (ValueError, TypeError):
+        return [f"+{step}" for step in range(1, horizon + 1)]
+
+
+def _total_expenses(frame: pd.DataFrame) -> np.ndarray:
+    """Despesa total por linha (``expense_total`` ou soma das categorias)."""
+    total = _column(frame, "expense_total")
+    parts = sum(np.nan_to_num(_column(frame, f"expense_{name}")) for name in EXPENSE_CATEGORIES)
+    return np.where(np.isnan(total), parts, total)
+
+
+def forecast_financial_frame(
+    frame: pd.DataFrame,
+    horizon: int = 12,
+    confidence: float = 0.95,
+    season_length: int = 12
+) -> pd.DataFrame:
+    """
+    Projeta receita, despesas e resultado de todos os negócios de um lote.
+
+    Args:
+        frame: DataFrame com business_id, period (AAAA-MM), revenue e expense_*
+        horizon: Meses a prever
+        confidence: Nível de confiança dos intervalos
+        season_length: Tamanho do ciclo sazonal
+
+    Returns:
+        DataFrame com uma linha por negócio e mês previsto
+    """
+    if "revenue" not in frame or "period" not in frame:
+        raise ValueError("Colunas obrigatórias ausentes: period, revenue")
+
+    data = frame if "business_id" in frame else frame.assign(business_id="default")
+    business_codes, business_ids = pd.factorize(data["business_id"], sort=True)
+    period_codes, periods = pd.factorize(data["period"].astype(str), sort=True)
+
+    shape = (len(business_ids), len(periods))
+    revenue = np.full(shape, np.nan)
+    revenue[business_codes, period_codes] = _column(data, "revenue")
+    expenses = np.full(shape, np.nan)
+    expenses[business_codes, period_codes] = _total_expenses(data)
+
+    revenue_forecast = forecast_series(revenue, horizon, season_length, confidence)
+    expense_forecast = forecast_series(expenses, horizon, season_length, confidence)
+
+    result = pd.DataFrame({
+        "business_id": np.repeat(np.asarray(business_ids), horizon),
+        "period": np.tile(_future_periods(periods[-1], horizon), len(business_ids)),
+        "step": np.tile(np.arange(1, horizon + 1), len(business_ids))
+    })
+    for name, forecast in (("revenue", revenue_forecast), ("expenses", expense_forecast)):
+        result[f"{name}_forecast"] = np.clip(forecast.forecast, 0, None).ravel()
+        result[f"{name}_lower"] = np.clip(forecast.lower, 0, None).ravel()
+        result[f"{name}_upper"] = np.clip(forecast.upper, 0, None).ravel()
+    result["net_forecast"] = result["revenue_forecast"] - result["expenses_forecast"]
+
+    return result
+
+
+def forecast_history(
+    history: Dict[str, Any],
+    horizon: int = 12,
+    confidence: float = 0.95
+) -> Optional[Dict[str, Any]]:
+    """
+    Projeta o histórico mensal de um único negócio (formato do ``FinancialDataLoader``).
+
+    Args:
+        history: Dicionário com periods, revenue e expenses
+        horizon: Meses a prever
+        confidence: Nível de confiança dos intervalos
+
+    Returns:
+        Previsão por mês e receita anual projetada, ou None se o histórico for curto
+    """
+    revenue = history.get("revenue") or []
+    if len(revenue) < MIN_HISTORY:
+        return None
+
+    expenses = history.get("expenses") or [np.nan] * len(revenue)
+    values = np.array([revenue, expenses], dtype=np.float64)
+    forecast = forecast_series(values, horizon, confidence=confidence)
+
+    periods = history.get("periods") or []
+    labels = _future_periods(periods[-1] if periods else None, horizon)
+
+    def section(row: int) -> Dict[str, List[float]]:
+        return {
+            "forecast": [round(float(value), 2) for value in np.clip(forecast.forecast[row], 0, None)],
+            "lower": [round(float(value), 2) for value in np.clip(np.nan_to_num(forecast.lower[row]), 0, None)],
+            "upper": [round(float(value), 2) for value in np.nan_to_num(forecast.upper[row])]
+        }
+
+    return {
+        "method": "holt_winters" if forecast.seasonal else "holt_damped",
+        "confidence": confidence,
+        "periods": labels,
+        "revenue": section(0),
+        "expenses": section(1),
+        "projected_annual_revenue": round(float(np.clip(forecast.forecast[0, :12], 0, None).sum()), 2)
+    }
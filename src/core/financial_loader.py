@@ -0,0 +1,345 @@
+"""
+Carregador de dados financeiros do FalaChefe Python.
+Lê razões (ledgers) em CSV, Excel ou Parquet de forma incremental e agrega por mês.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import unicodedata
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..utils.cache import TTLCache
+from ..utils.logger import get_component_logger
+
+
+# Versão do formato agregado salvo em disco; altere ao mudar a estrutura
+CACHE_FORMAT_VERSION = 1
+
+SUPPORTED_EXTENSIONS = {".csv", ".xlsx", ".xlsm", ".parquet", ".pq"}
+
+# Aliases aceitos para as colunas do ledger
+COLUMN_ALIASES = {
+    "date": ("date", "data", "dt", "data_transacao"),
+    "amount": ("amount", "valor", "value", "montante"),
+    "category": ("category", "categoria"),
+    "type": ("type", "tipo"),
+    "description": ("description", "descricao", "historico", "memo")
+}
+
+# Aliases compartilhados com as demonstrações financeiras: impostos sobre a
+# receita (deduções na DRE) e despesas de vendas
+TAX_ALIASES = ("impostos", "impostos sobre vendas", "simples", "simples nacional", "das", "icms", "iss", "pis", "cofins")
+SELLING_ALIASES = ("marketing", "publicidade", "anuncios", "comissoes", "vendas", "fretes")
+
+# Mapeamento de categorias para os grupos de despesa usados na análise
+EXPENSE_GROUPS = {
+    "operational": ("operational", "operacional", "operacao", "fornecedores", "estoque", "aluguel", "insumos"),
+    "marketing": SELLING_ALIASES,
+    "administrative": ("administrative", "administrativo", "administrativa", "salarios", "folha", "contabilidade"),
+    "taxes": TAX_ALIASES
+}
+
+INCOME_TYPES = {"income", "receita", "entrada", "credit", "credito", "in"}
+EXPENSE_TYPES = {"expense", "despesa", "saida", "debit", "debito", "out"}
+
+
+def _normalize(text: Any) -> str:
+    """Normaliza texto: minúsculas, sem acentos e sem espaços nas pontas."""
+    value = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii")
+    return value.strip().lower()
+
+
+_ISO_DATE_PATTERN = r"^\s*\d{4}-\d{2}-\d{2}"
+
+
+def _parse_dates(values: pd.Series) -> pd.Series:
+    """Converte datas ISO (2025-01-31) ou no padrão brasileiro (31/01/2025)."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    text = values.astype(str)
+    is_iso = text.str.match(_ISO_DATE_PATTERN)
+    parsed = pd.to_datetime(text.where(is_iso), errors="coerce", format="ISO8601")
+    if not is_iso.all():
+        parsed = parsed.fillna(pd.to_datetime(text.where(~is_iso), errors="coerce", format="%d/%m/%Y"))
+    return parsed
+
+
+def resolve_columns(frame: pd.DataFrame) -> Dict[str, str]:
+    """
+    Identifica as colunas do ledger pelos aliases aceitos (ver ``COLUMN_ALIASES``).
+
+    Args:
+        frame: DataFrame com as colunas originais do arquivo
+
+    Returns:
+        Nome padronizado (date, amount, ...) -> nome da coluna no DataFrame
+    """
+    normalized = {_normalize(column): column for column in frame.columns}
+    resolved = {}
+    for target, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in normalized:
+                resolved[target] = normalized[alias]
+                break
+    return resolved
+
+
+_CATEGORY_LOOKUP = {
+    alias: group
+    for group, aliases in EXPENSE_GROUPS.items()
+    for alias in aliases
+}
+
+
+class FinancialDataLoader:
+    """
+    Carrega ledgers financeiros com parsing em blocos e cache por (caminho, mtime, tamanho).
+
+    Cada bloco é reduzido a totais por (mês, tipo, grupo de categoria), então o
+    uso de memória depende apenas do tamanho do bloco e do número de meses,
+    não do tamanho do arquivo.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, chunk_size: int = 100000, memory_cache_size: int = 32):
+        """Inicializa o carregador."""
+        self.logger = get_component_logger("data_processor")
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.chunk_size = int(chunk_size)
+        self.memory_cache = TTLCache(max_size=memory_cache_size)
+
+        self.parse_count = 0
+
+    def load(self, path: str) -> Dict[str, Any]:
+        """
+        Carrega e agrega um ledger, reutilizando o cache quando o arquivo não mudou.
+
+        Args:
+            path: Caminho do arquivo CSV, Excel ou Parquet
+
+        Returns:
+            Dados financeiros no formato usado por ``analyze_financial_data``
+        """
+        file_path = Path(path).resolve()
+        extension = file_path.suffix.lower()
+        if extension not in SUPPORTED_EXTENSIONS:
+            raise ValueError(f"Formato de arquivo não suportado: {extension}")
+
+        cache_key = self._cache_key(file_path)
+
+        cached = self.memory_cache.get(cache_key)
+        if cached is not None:
+            self.logger.debug(f"Ledger em cache (memória): {file_path}")
+            return copy.deepcopy(cached)
+
+        cached = self._read_disk_cache(cache_key)
+        if cached is not None:
+            self.logger.debug(f"Ledger em cache (disco): {file_path}")
+            self.memory_cache.set(cache_key, cached)
+            return copy.deepcopy(cached)
+
+        totals = self._aggregate(file_path, extension)
+        financial_data = self._build_financial_data(totals)
+        financial_data["source"] = {
+            "path": str(file_path),
+            "format": extension.lstrip("."),
+            "rows": int(totals.attrs.get("rows", 0))
+        }
+
+        self.parse_count += 1
+        self.memory_cache.set(cache_key, financial_data)
+        self._write_disk_cache(cache_key, financial_data)
+        return copy.deepcopy(financial_data)
+
+    @staticmethod
+    def _cache_key(file_path: Path) -> Tuple[str, int, int]:
+        stat = file_path.stat()
+        return str(file_path), stat.st_mtime_ns, stat.st_size
+
+    def _disk_cache_path(self, cache_key: Tuple[str, int, int]) -> Optional[Path]:
+        if not self.cache_dir:
+            return None
+        digest = hashlib.sha256(f"{CACHE_FORMAT_VERSION}|{cache_key[0]}|{cache_key[1]}|{cache_key[2]}".encode()).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def _read_disk_cache(self, cache_key: Tuple[str, int, int]) -> Optional[Dict[str, Any]]:
+        cache_path = self._disk_cache_path(cache_key)
+        if not cache_path or not cache_path.exists():
+            return None
+        try:
+            with open(cache_path, "r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Cache de ledger inválido ignorado ({cache_path}): {str(e)}")
+            return None
+
+    def _write_disk_cache(self, cache_key: Tuple[str, int, int], financial_data: Dict[str, Any]) -> None:
+        cache_path = self._disk_cache_path(cache_key)
+        if not cache_path:
+            return
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = cache_path.with_suffix(".tmp")
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                json.dump(financial_data, handle)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            self.logger.warning(f"Não foi possível salvar cache do ledger: {str(e)}")
+
+    def _iter_chunks(self, file_path: Path, extension: str) -> Iterator[pd.DataFrame]:
+        """Itera o arquivo em blocos de no máximo ``chunk_size`` linhas."""
+        if extension == ".csv":
+            yield from pd.read_csv(file_path, chunksize=self.chunk_size)
+
+        elif extension in (".xlsx", ".xlsm"):
+            from openpyxl import load_workbook
+
+            workbook = load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                rows = workbook.active.iter_rows(values_only=True)
+                header = next(rows, None)
+                if header is None:
+                    return
+                batch = []
+                for row in rows:
+                    batch.append(row)
+                    if len(batch) >= self.chunk_size:
+                        yield pd.DataFrame(batch, columns=header)
+                        batch = []
+                if batch:
+                    yield pd.DataFrame(batch, columns=header)
+            finally:
+                workbook.close()
+
+        else:
+            try:
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("pyarrow é necessário para ler arquivos Parquet") from e
+
+            parquet_file = pq.ParquetFile(file_path)
+            for batch in parquet_file.iter_batches(batch_size=self.chunk_size):
+                yield batch.to_pandas()
+
+    def _aggregate(self, file_path: Path, extension: str) -> pd.Series:
+        """Reduz o arquivo a totais por (mês, tipo, grupo) processando bloco a bloco."""
+        self.logger.info(f"Processando ledger: {file_path}")
+
+        totals: Optional[pd.Series] = None
+        rows = 0
+
+        for chunk in self._iter_chunks(file_path, extension):
+            columns = resolve_columns(chunk)
+            if "date" not in columns or "amount" not in columns:
+                raise ValueError("Ledger precisa das colunas de data e valor (date/data, amount/valor)")
+
+            dates = _parse_dates(chunk[columns["date"]])
+            amounts = pd.to_numeric(chunk[columns["amount"]], errors="coerce")
+            valid = dates.notna() & amounts.notna()
+            if not valid.any():
+                continue
+
+            amounts = amounts[valid].to_numpy(dtype=np.float64)
+            months = dates[valid].dt.strftime("%Y-%m").to_numpy()
+
+            # Tipo explícito tem prioridade; sem ele, o sinal do valor define entrada/saída
+            is_income = amounts > 0
+            if "type" in columns:
+                types = chunk.loc[valid, columns["type"]].map(_normalize).to_numpy()
+                is_income = np.where(np.isin(types, list(INCOME_TYPES)), True,
+                                     np.where(np.isin(types, list(EXPENSE_TYPES)), False, is_income))
+
+            if "category" in columns:
+                categories = chunk.loc[valid, columns["category"]].map(_normalize).map(_CATEGORY_LOOKUP).fillna("other").to_numpy()
+            else:
+                categories = np.full(len(amounts), "other", dtype=object)
+
+            frame = pd.DataFrame({
+                "month": months,
+                "kind": np.where(is_income, "income", "expense"),
+                "group": np.where(is_income, "revenue", categories),
+                "amount": np.abs(amounts)
+            })
+            partial = frame.groupby(["month", "kind", "group"], sort=False)["amount"].sum()
+            totals = partial if totals is None else totals.add(partial, fill_value=0.0)
+            rows += int(valid.sum())
+
+        if totals is None:
+            totals = pd.Series(dtype=np.float64, index=pd.MultiIndex.from_arrays([[], [], []], names=["month", "kind", "group"]))
+        totals.attrs["rows"] = rows
+        return totals
+
+    @staticmethod
+    def _build_financial_data(totals: pd.Series) -> Dict[str, Any]:
+        """Monta o dicionário financeiro a partir dos totais mensais."""
+        if totals.empty:
+            monthly = pd.DataFrame(columns=["income", "expense"])
+            groups = pd.DataFrame()
+        else:
+            monthly = totals.groupby(level=["month", "kind"]).sum().unstack("kind", fill_value=0.0)
+            groups = totals.xs("expense", level="kind").unstack("group", fill_value=0.0) \
+                if "expense" in totals.index.get_level_values("kind") else pd.DataFrame()
+
+        monthly = monthly.reindex(columns=["income", "expense"], fill_value=0.0).sort_index()
+        months = list(monthly.index)
+
+        current_month = months[-1] if months else None
+        previous_month = months[-2] if len(months) > 1 else None
+
+        revenue_current = float(monthly.loc[current_month, "income"]) if current_month else 0.0
+        revenue_previous = float(monthly.loc[previous_month, "income"]) if previous_month else 0.0
+        expense_total = float(monthly.loc[current_month, "expense"]) if current_month else 0.0
+
+        def group_total(group: str) -> float:
+            if current_month is None or group not in groups.columns or current_month not in groups.index:
+                return 0.0
+            return float(groups.loc[current_month, group])
+
+        net = revenue_current - expense_total
+        operational = group_total("operational")
+
+        return {
+            "period": current_month,
+            "revenue": {
+                "current_month": revenue_current,
+                "previous_month": revenue_previous,
+                "growth_rate": (revenue_current - revenue_previous) / revenue_previous if revenue_previous > 0 else 0.0
+            },
+            "expenses": {
+                "operational": operational,
+                "marketing": group_total("marketing"),
+                "administrative": group_total("administrative"),
+                "taxes": group_total("taxes"),
+                "other": group_total("other"),
+                "total": expense_total
+            },
+            "cash_flow": {
+                "inflow": revenue_current,
+                "outflow": expense_total,
+                "net": net
+            },
+            "metrics": {
+                "gross_margin": (revenue_current - operational) / revenue_current if revenue_current > 0 else 0.0,
+                "net_margin": net / revenue_current if revenue_current > 0 else 0.0,
+                "roi": net / expense_total if expense_total > 0 else 0.0
+            },
+            "history": {
+                "periods": [str(month) for month in months],
+                "revenue": [float(value) for value in monthly["income"]],
+                "expenses": [float(value) for value in monthly["expense"]]
+            }
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas do carregador."""
+        return {
+            "parse_count": self.parse_count,
+            "chunk_size": self.chunk_size,
+            "cache_dir": str(self.cache_dir) if self.cache_dir else None,
+            "memory_cache": self.memory_cache.stats()
+        }
@@ -0,0 +1,374 @@
+"""
+Demonstrações financeiras do FalaChefe Python.
+Gera DRE e fluxo de caixa por período a partir de ledgers de transações, com agregação vetorizada e incremental.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .financial_loader import (
+    EXPENSE_TYPES,
+    INCOME_TYPES,
+    SELLING_ALIASES,
+    SUPPORTED_EXTENSIONS,
+    TAX_ALIASES,
+    FinancialDataLoader,
+    _normalize,
+    _parse_dates,
+    resolve_columns
+)
+
+
+# Linhas do ledger: (linha, atividade de caixa, aliases de entrada, aliases de saída).
+# Categorias sem alias caem em gross_revenue (entradas) ou other_expenses (saídas).
+LEDGER_LINES = (
+    ("gross_revenue", "operating",
+     ("receita", "receitas", "vendas", "venda", "servicos", "faturamento", "revenue", "sales", "income"), ()),
+    ("deductions", "operating",
+     ("devolucoes",), (*TAX_ALIASES, "devolucoes", "descontos concedidos", "deducoes")),
+    ("cost_of_goods", "operating",
+     (), ("cmv", "cpv", "custo", "custos", "estoque", "mercadorias", "insumos", "materia prima", "fornecedores",
+          "operacional", "operational", "operacao")),
+    ("selling_expenses", "operating", (), SELLING_ALIASES),
+    ("administrative_expenses", "operating",
+     (), ("administrativo", "administrativa", "administrative", "aluguel", "contabilidade", "energia", "agua",
+          "internet", "telefone", "software", "sistemas")),
+    ("personnel_expenses", "operating",
+     (), ("salarios", "folha", "pessoal", "pro labore", "prolabore", "encargos", "beneficios")),
+    ("other_expenses", "operating", (), ("outros", "other", "diversos")),
+    ("financial_income", "operating",
+     ("rendimentos", "juros recebidos", "receita financeira", "aplicacoes"), ()),
+    ("financial_expenses", "operating",
+     (), ("juros", "tarifas", "tarifas bancarias", "iof", "despesa financeira", "despesas financeiras")),
+    ("income_taxes", "operating", (), ("irpj", "csll", "imposto de renda")),
+    ("investing", "investing",
+     ("venda de ativos", "venda de equipamentos"), ("equipamentos", "imobilizado", "investimento", "investimentos",
+                                                    "veiculos", "maquinas")),
+    ("financing", "financing",
+     ("emprestimo", "emprestimos", "financiamento", "aporte", "aporte de capital", "capital"),
+     ("emprestimo", "emprestimos", "financiamento", "amortizacao", "dividendos", "distribuicao de lucros"))
+)
+
+LINES = tuple(line for line, _, _, _ in LEDGER_LINES)
+ACTIVITIES = {line: activity for line, activity, _, _ in LEDGER_LINES}
+DEFAULT_INCOME_LINE = "gross_revenue"
+DEFAULT_EXPENSE_LINE = "other_expenses"
+
+_LINE_LOOKUP = {
+    (is_income, alias): line
+    for line, _, income_aliases, expense_aliases in LEDGER_LINES
+    for is_income, aliases in ((True, income_aliases), (False, expense_aliases))
+    for alias in aliases
+}
+
+_LINE_CODES = {line: code for code, line in enumerate(LINES)}
+_OPERATING_EXPENSE_LINES = ("selling_expenses", "administrative_expenses", "personnel_expenses", "other_expenses")
+_UNIX_EPOCH_MONTH = 1970 * 12
+
+# Alias extra só usado aqui: identificação do negócio no ledger
+BUSINESS_ALIASES = ("business_id", "business", "empresa", "negocio", "tenant_id", "company_id")
+
+
+def _safe_ratio(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    """Divide retornando 0 quando o denominador não é positivo."""
+    return (numerator / denominator.where(denominator > 0)).fillna(0.0)
+
+
+class FinancialStatementEngine:
+    """
+    Motor de DRE e fluxo de caixa a partir de ledgers de transações.
+
+    Cada lote de transações é reduzido a totais por (negócio, mês, linha,
+    sentido) com operações vetorizadas; os totais são somados aos já
+    existentes, então novas transações podem ser anexadas sem reprocessar o
+    histórico. As demonstrações (mensais, trimestrais ou anuais) são montadas
+    a partir desses totais, cujo tamanho depende apenas de negócios x meses.
+
+    Lotes anexados ficam pendentes e são consolidados de uma vez na próxima
+    consulta, então o custo de ``append`` depende só do tamanho do lote.
+    """
+
+    def __init__(self, chunk_size: int = 100000):
+        """Inicializa o motor vazio."""
+        self.chunk_size = int(chunk_size)
+        self._totals: Optional[pd.Series] = None
+        self._pending: List[pd.Series] = []
+        self.rows = 0
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @staticmethod
+    def _resolve_columns(frame: pd.DataFrame) -> Dict[str, str]:
+        resolved = resolve_columns(frame)
+        normalized = {_normalize(column): column for column in frame.columns}
+        for alias in BUSINESS_ALIASES:
+            if alias in normalized:
+                resolved["business"] = normalized[alias]
+                break
+        return resolved
+
+    @staticmethod
+    def _classify(categories: pd.Series, is_income: np.ndarray) -> np.ndarray:
+        """Código da linha de cada transação, normalizando só as categorias distintas."""
+        codes, uniques = pd.factorize(categories.fillna("").astype(str))
+        normalized = [_normalize(value) for value in uniques]
+
+        result = np.empty(len(codes), dtype=np.int8)
+        for income_flag, default in ((True, DEFAULT_INCOME_LINE), (False, DEFAULT_EXPENSE_LINE)):
+            lookup = np.array(
+                [_LINE_CODES[_LINE_LOOKUP.get((income_flag, value), default)] for value in normalized] or [0],
+                dtype=np.int8
+            )
+            mask = is_income == income_flag
+            result[mask] = lookup[codes[mask]]
+        return result
+
+    def _aggregate(self, frame: pd.DataFrame) -> Optional[pd.Series]:
+        """Reduz um lote de transações a totais por (negócio, mês, linha, sentido)."""
+        columns = self._resolve_columns(frame)
+        if "date" not in columns or "amount" not in columns:
+            raise ValueError("Ledger precisa das colunas de data e valor (date/data, amount/valor)")
+
+        dates = _parse_dates(frame[columns["date"]])
+        amounts = pd.to_numeric(frame[columns["amount"]], errors="coerce")
+        valid = (dates.notna() & amounts.notna()).to_numpy()
+        if not valid.any():
+            return None
+
+        frame = frame.loc[valid]
+        dates = dates[valid]
+        amounts = amounts[valid].to_numpy(dtype=np.float64)
+
+        # Tipo explícito tem prioridade; sem ele, o sinal do valor define entrada/saída
+        is_income = amounts > 0
+        if "type" in columns:
+            types = frame[columns["type"]].astype(str)
+            type_codes, type_uniques = pd.factorize(types)
+            normalized = np.array([_normalize(value) for value in type_uniques], dtype=object)
+            explicit = np.where(np.isin(normalized, list(INCOME_TYPES)), 1, np.where(np.isin(normalized, list(EXPENSE_TYPES)), 0, -1))
+            explicit = explicit[type_codes]
+            is_income = np.where(explicit >= 0, explicit == 1, is_income)
+
+        categories = frame[columns["category"]] if "category" in columns else pd.Series("", index=frame.index)
+        lines = self._classify(categories, is_income)
+
+        businesses = frame[columns["business"]].astype(str).to_numpy() if "business" in columns \
+            else np.full(len(amounts), "default", dtype=object)
+        months = (dates.dt.year.to_numpy() * 12 + dates.dt.month.to_numpy() - 1 - _UNIX_EPOCH_MONTH).astype(np.int32)
+
+        batch = pd.DataFrame({
+            "business_id": businesses,
+            "month": months,
+            "line": lines,
+            "inflow": is_income,
+            "amount": np.abs(amounts)
+        })
+        partial = batch.groupby(["business_id", "month", "line", "inflow"], sort=False)["amount"].sum()
+        partial.attrs["rows"] = int(valid.sum())
+        return partial
+
+    def append(self, transactions: pd.DataFrame) -> int:
+        """
+        Anexa novas transações aos totais.
+
+        Colunas aceitas: data/date, valor/amount, categoria/category, tipo/type
+        e business_id (ou empresa/negocio/tenant_id). Sem tipo, valores
+        positivos são entradas e negativos, saídas.
+
+        Args:
+            transactions: Lote de transações ainda não incluídas
+
+        Returns:
+            Quantidade de transações válidas incluídas
+        """
+        partial = self._aggregate(transactions)
+        if partial is None:
+            return 0
+
+        rows = partial.attrs["rows"]
+        self._pending.append(partial)
+        self.rows += rows
+        return rows
+
+    @property
+    def totals(self) -> Optional[pd.Series]:
+        """Totais por (negócio, mês, linha, sentido), consolidando lotes pendentes."""
+        if self._pending:
+            parts = ([self._totals] if self._totals is not None else []) + self._pending
+            combined = pd.concat(parts) if len(parts) > 1 else parts[0]
+            self._totals = combined.groupby(level=["business_id", "month", "line", "inflow"], sort=False).sum()
+            self._pending = []
+        return self._totals
+
+    def append_file(self, path: Union[str, Path]) -> int:
+        """Anexa as transações de um arquivo CSV, Excel ou Parquet, lendo em blocos."""
+        file_path = Path(path)
+        extension = file_path.suffix.lower()
+        if extension not in SUPPORTED_EXTENSIONS:
+            raise ValueError(f"Formato de arquivo não suportado: {extension}")
+
+        loader = FinancialDataLoader(chunk_size=self.chunk_size)
+        return sum(self.append(chunk) for chunk in loader._iter_chunks(file_path, extension))
+
+    def businesses(self) -> List[str]:
+        """Negócios com transações registradas."""
+        if self.totals is None:
+            return []
+        return sorted(self.totals.index.get_level_values("business_id").unique())
+
+    def _wide(self, business_id: Optional[str], freq: str, consolidated: bool) -> pd.DataFrame:
+        """Totais por (negócio, período) com uma coluna por (linha, sentido)."""
+        if self.totals is None:
+            return pd.DataFrame()
+
+        totals = self.totals
+        if business_id is not None:
+            totals = totals[totals.index.get_level_values("business_id") == str(business_id)]
+            if totals.empty:
+                return pd.DataFrame()
+
+        months = totals.index.get_level_values("month").to_numpy(dtype=np.int64)
+        periods = pd.PeriodIndex.from_ordinals(months, freq="M")
+        if freq != "M":
+            periods = periods.asfreq(freq)
+
+        keys = {
+            "business_id": "consolidated" if consolidated else totals.index.get_level_values("business_id"),
+            "period": periods.astype(str),
+            "line": np.asarray(LINES, dtype=object)[totals.index.get_level_values("line").to_numpy()],
+            "inflow": totals.index.get_level_values("inflow")
+        }
+        frame = pd.DataFrame({**keys, "amount": totals.to_numpy()})
+        wide = frame.pivot_table(index=["business_id", "period"], columns=["line", "inflow"],
+                                 values="amount", aggfunc="sum", fill_value=0.0)
+        return wide.sort_index()
+
+    @staticmethod
+    def _net(wide: pd.DataFrame, line: str, sign: int = 1) -> pd.Series:
+        """Entradas menos saídas de uma linha (``sign=-1``: saídas menos entradas)."""
+        inflow = wide[(line, True)] if (line, True) in wide else 0.0
+        outflow = wide[(line, False)] if (line, False) in wide else 0.0
+        net = inflow - outflow if sign > 0 else outflow - inflow
+        return pd.Series(net, index=wide.index, dtype=np.float64)
+
+    def income_statement(self, business_id: Optional[str] = None, freq: str = "M", consolidated: bool = False) -> pd.DataFrame:
+        """
+        Monta a DRE por negócio e período.
+
+        Args:
+            business_id: Negócio (None = todos)
+            freq: "M" (mensal), "Q" (trimestral) ou "Y" (anual)
+            consolidated: Soma todos os negócios em uma única DRE
+
+        Returns:
+            DataFrame indexado por (business_id, period) com as linhas da DRE e margens
+        """
+        wide = self._wide(business_id, freq, consolidated)
+        if wide.empty:
+            return pd.DataFrame()
+
+        net = {line: self._net(wide, line) for line in LINES}
+        spent = {line: self._net(wide, line, sign=-1) for line in LINES}
+        dre = pd.DataFrame(index=wide.index)
+        dre["gross_revenue"] = net["gross_revenue"]
+        dre["deductions"] = spent["deductions"]
+        dre["net_revenue"] = dre["gross_revenue"] - dre["deductions"]
+        dre["cost_of_goods"] = spent["cost_of_goods"]
+        dre["gross_profit"] = dre["net_revenue"] - dre["cost_of_goods"]
+        for line in _OPERATING_EXPENSE_LINES:
+            dre[line] = spent[line]
+        dre["operating_expenses"] = dre[list(_OPERATING_EXPENSE_LINES)].sum(axis=1)
+        dre["operating_result"] = dre["gross_profit"] - dre["operating_expenses"]
+        dre["financial_result"] = net["financial_income"] + net["financial_expenses"]
+        dre["earnings_before_taxes"] = dre["operating_result"] + dre["financial_result"]
+        dre["income_taxes"] = spent["income_taxes"]
+        dre["net_income"] = dre["earnings_before_taxes"] - dre["income_taxes"]
+        dre["gross_margin"] = _safe_ratio(dre["gross_profit"], dre["net_revenue"])
+        dre["operating_margin"] = _safe_ratio(dre["operating_result"], dre["net_revenue"])
+        dre["net_margin"] = _safe_ratio(dre["net_income"], dre["net_revenue"])
+        return dre
+
+    def cash_flow_statement(self, business_id: Optional[str] = None, freq: str = "M",
+                            opening_balance: float = 0.0, consolidated: bool = False) -> pd.DataFrame:
+        """
+        Monta a demonstração de fluxo de caixa (método direto) por negócio e período.
+
+        Args:
+            business_id: Negócio (None = todos)
+            freq: "M" (mensal), "Q" (trimestral) ou "Y" (anual)
+            opening_balance: Saldo inicial de cada negócio
+            consolidated: Soma todos os negócios em um único fluxo
+
+        Returns:
+            DataFrame indexado por (business_id, period) com fluxos por atividade e saldo final
+        """
+        wide = self._wide(business_id, freq, consolidated)
+        if wide.empty:
+            return pd.DataFrame()
+
+        def side(activity: str, inflow: bool) -> pd.Series:
+            columns = [(line, inflow) for line in LINES if ACTIVITIES[line] == activity and (line, inflow) in wide]
+            return wide[columns].sum(axis=1) if columns else pd.Series(0.0, index=wide.index)
+
+        cash = pd.DataFrame(index=wide.index)
+        for activity in ("operating", "investing", "financing"):
+            cash[f"{activity}_inflows"] = side(activity, True)
+            cash[f"{activity}_outflows"] = side(activity, False)
+            cash[f"{activity}_net"] = cash[f"{activity}_inflows"] - cash[f"{activity}_outflows"]
+        cash["net_change"] = cash["operating_net"] + cash["investing_net"] + cash["financing_net"]
+        cash["closing_balance"] = opening_balance + cash.groupby(level="business_id")["net_change"].cumsum()
+        cash["opening_balance"] = cash["closing_balance"] - cash["net_change"]
+        return cash
+
+    def summary(self, business_id: Optional[str] = None, freq: str = "M", history: int = 6) -> Dict[str, Any]:
+        """
+        Resumo das demonstrações para relatórios: último período e histórico recente.
+
+        Args:
+            business_id: Negócio (None = consolidado de todos)
+            freq: "M" (mensal), "Q" (trimestral) ou "Y" (anual)
+            history: Quantidade de períodos no histórico
+
+        Returns:
+            DRE e fluxo de caixa do último período e evolução do resultado
+        """
+        consolidated = business_id is None
+        dre = self.income_statement(business_id, freq, consolidated)
+        if dre.empty:
+            return {}
+        cash = self.cash_flow_statement(business_id, freq, consolidated=consolidated)
+
+        periods = dre.index.get_level_values("period")
+        recent = dre.iloc[-history:]
+        return {
+            "business_id": "consolidated" if consolidated else str(business_id),
+            "period": periods[-1],
+            "income_statement": _round_row(dre.iloc[-1]),
+            "cash_flow_statement": _round_row(cash.iloc[-1]),
+            "history": {
+                "periods": list(recent.index.get_level_values("period")),
+                "net_revenue": _round_values(recent["net_revenue"]),
+                "net_income": _round_values(recent["net_income"]),
+                "closing_balance": _round_values(cash["closing_balance"].iloc[-history:])
+            }
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna informações sobre os totais acumulados."""
+        return {
+            "rows": self.rows,
+            "businesses": len(self.businesses()),
+            "aggregated_groups": 0 if self.totals is None else len(self.totals)
+        }
+
+
+def _round_row(row: pd.Series) -> Dict[str, float]:
+    return {key: round(float(value), 4 if key.endswith("margin") else 2) for key, value in row.items()}
+
+
+def _round_values(values: Iterable[float]) -> List[float]:
+    return [round(float(value), 2) for value in values]
@@ -4,11 +4,20 @@ Permite usar apenas um sistema de agentes por vez.
 """
 
 import asyncio
-from typing import Dict, Any, Optional
+import inspect
+import math
+import shlex
+import time
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 from enum import Enum
 
 from ..utils.config import Config
+from ..utils.deadline import TIMEOUT_REPLY, DeadlineExceeded, deadline_scope, remaining, stream_with_deadline, with_deadline
+from ..utils.latency import LatencyTracker
 from ..utils.logger import get_component_logger
+from .admission import HIGH_DEMAND_REPLY, AdmissionController, Overloaded, Priority
+from .shadow_traffic import ShadowTraffic
+from .streaming import DONE, chunk_event, done_event
 
 
 class AgentSystem(Enum):
@@ -18,6 +27,172 @@ class AgentSystem(Enum):
     AUTO = "auto"  # Escolhe automaticamente baseado na configuração
 
 
+class _LoadedSystem:
+    """Orquestrador carregado e as requisições em andamento nele."""
+    
+    def __init__(self, system: AgentSystem, orchestrator: Any):
+        self.system = system
+        self.orchestrator = orchestrator
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+    
+    def acquire(self) -> None:
+        self.in_flight += 1
+        self._idle.clear()
+    
+    def release(self) -> None:
+        self.in_flight -= 1
+        if self.in_flight == 0:
+            self._idle.set()
+    
+    async def drain(self, timeout: Optional[float]) -> bool:
+        """Aguarda as requisições em andamento terminarem (True se zerou no prazo)."""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    async def close(self) -> None:
+        """Libera recursos do orquestrador, se ele souber fazer isso."""
+        close = getattr(self.orchestrator, "aclose", None) or getattr(self.orchestrator, "close", None)
+        if callable(close):
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+
+
+class AutoRoutingPolicy:
+    """
+    Política de roteamento do modo AUTO entre os sistemas carregados.
+    
+    Cada sistema recebe um custo esperado (latência EWMA dividida pela taxa
+    de sucesso recente). O tráfego só muda de sistema quando o outro é
+    melhor por uma margem (histerese), e uma fração pequena das requisições
+    sonda os demais sistemas para manter suas métricas atualizadas.
+    """
+    
+    def __init__(self, margin: float = 0.2, min_samples: int = 5, probe_every: int = 20):
+        """
+        Inicializa a política.
+        
+        Args:
+            margin: Vantagem relativa mínima para trocar de sistema
+            min_samples: Chamadas mínimas antes de um sistema ser comparado
+            probe_every: A cada quantas requisições uma vai para outro sistema (0 desativa)
+        """
+        self.margin = margin
+        self.min_samples = min_samples
+        self.probe_every = probe_every
+        
+        self.requests = 0
+        self.probes = 0
+        self.flips = 0
+        self.decisions: Dict[str, int] = {}
+    
+    def score(self, tracker: LatencyTracker) -> float:
+        """Custo esperado de um sistema (infinito sem amostras suficientes)."""
+        if tracker.ewma is None or len(tracker) < self.min_samples:
+            return math.inf
+        return tracker.ewma / max(1.0 - tracker.error_rate, 0.01)
+    
+    def choose(
+        self,
+        current: AgentSystem,
+        trackers: Dict[AgentSystem, LatencyTracker]
+    ) -> Tuple[AgentSystem, AgentSystem]:
+        """
+        Escolhe o sistema de uma requisição.
+        
+        Args:
+            current: Sistema que recebe o tráfego hoje
+            trackers: Métricas de cada sistema carregado
+            
+        Returns:
+            (sistema desta requisição, sistema que passa a receber o tráfego)
+        """
+        self.requests += 1
+        candidates = list(trackers)
+        if current not in trackers:
+            current = candidates[0]
+        
+        others = [system for system in candidates if system != current]
+        if others and self.probe_every and self.requests % self.probe_every == 0:
+            self.probes += 1
+            return others[(self.requests // self.probe_every) % len(others)], current
+        
+        best = min(candidates, key=lambda system: self.score(trackers[system]))
+        if best != current and self.score(trackers[best]) < self.score(trackers[current]) * (1 - self.margin):
+            current = best
+            self.flips += 1
+        
+        self.decisions[current.value] = self.decisions.get(current.value, 0) + 1
+        return current, current
+    
+    def stats(self) -> Dict[str, Any]:
+        """Retorna as decisões tomadas até agora."""
+        return {
+            "requests": self.requests,
+            "decisions": dict(self.decisions),
+            "probes": self.probes,
+            "flips": self.flips
+        }
+
+
+class HedgingPolicy:
+    """
+    Orçamento de requisições de hedge.
+    
+    Cada requisição acumula ``budget`` fichas (até ``burst``) e cada hedge
+    gasta uma, então os hedges nunca passam de ``budget`` do tráfego além
+    de uma rajada curta.
+    """
+    
+    def __init__(self, budget: float = 0.05, burst: float = 5.0, min_samples: int = 10):
+        """
+        Inicializa o orçamento.
+        
+        Args:
+            budget: Fração máxima de requisições extras
+            burst: Hedges acumulados que podem ser gastos de uma vez
+            min_samples: Chamadas mínimas do sistema primário antes de usar seu p95
+        """
+        self.budget = budget
+        self.burst = burst
+        self.min_samples = min_samples
+        self.tokens = 0.0
+        
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.denied = 0
+    
+    def on_request(self) -> None:
+        self.requests += 1
+        self.tokens = min(self.tokens + self.budget, self.burst)
+    
+    def try_acquire(self) -> bool:
+        """Reserva um hedge se houver orçamento."""
+        if self.tokens < 1.0:
+            self.denied += 1
+            return False
+        self.tokens -= 1.0
+        self.hedged += 1
+        return True
+    
+    def stats(self) -> Dict[str, Any]:
+        """Retorna uso do orçamento e vitórias do hedge."""
+        return {
+            "budget": self.budget,
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "denied": self.denied,
+            "hedge_rate": round(self.hedged / self.requests, 4) if self.requests else 0.0
+        }
+
+
 class HybridOrchestrator:
     """
     Orquestrador híbrido que escolhe entre TypeScript e Python.
@@ -30,85 +205,208 @@ class HybridOrchestrator:
         self.logger = get_component_logger("hybrid_orchestrator")
         self.preferred_system = preferred_system
         
-        # Componentes
-        self.typescript_orchestrator = None
-        self.python_orchestrator = None
+        # Componentes: um orquestrador carregado por sistema
+        self.systems: Dict[AgentSystem, _LoadedSystem] = {}
         self.active_system = None
         
-        # Inicializa baseado na preferência
-        asyncio.create_task(self._initialize_system())
+        # Métricas por sistema (sobrevivem a trocas de instância) e roteamento do modo AUTO
+        self.latency: Dict[AgentSystem, LatencyTracker] = {
+            AgentSystem.TYPESCRIPT: LatencyTracker(),
+            AgentSystem.PYTHON: LatencyTracker()
+        }
+        self.routing = AutoRoutingPolicy()
+        self.hedging = HedgingPolicy(budget=config.hedge_budget)
+        self.admission = AdmissionController(
+            max_in_flight=config.admission_max_in_flight,
+            max_queue=config.admission_max_queue,
+            queue_timeout=config.admission_queue_timeout
+        )
+        self.shadow = ShadowTraffic(
+            sample_rate=config.shadow_sample_rate,
+            max_concurrency=config.shadow_max_concurrency,
+            max_per_minute=config.shadow_max_per_minute,
+            load_threshold=config.shadow_load_threshold
+        )
+        
+        # Trocas de sistema são serializadas; a última fica registrada
+        self._switch_lock = asyncio.Lock()
+        self.last_switch: Optional[Dict[str, Any]] = None
+        
+        # Prontidão: liberada ao fim de start(); requisições que chegam antes esperam por ela
+        self._ready = asyncio.Event()
+        self._start_task: Optional[asyncio.Task] = None
+        self.startup_seconds: Optional[float] = None
+        self.startup_errors: Dict[str, str] = {}
         
         self.logger.info(f"HybridOrchestrator inicializado com preferência: {preferred_system.value}")
     
-    async def _initialize_system(self):
-        """Inicializa o sistema baseado na preferência."""
-        try:
-            if self.preferred_system == AgentSystem.TYPESCRIPT:
-                await self._initialize_typescript()
-            elif self.preferred_system == AgentSystem.PYTHON:
-                await self._initialize_python()
-            else:  # AUTO
-                await self._auto_select_system()
-                
-        except Exception as e:
-            self.logger.error(f"Erro ao inicializar sistema: {str(e)}")
-            # Fallback para TypeScript se disponível
-            await self._initialize_typescript()
+    def _startup_order(self) -> List[AgentSystem]:
+        """Sistemas em ordem de preferência (o segundo é o fallback)."""
+        if self.preferred_system == AgentSystem.PYTHON:
+            return [AgentSystem.PYTHON, AgentSystem.TYPESCRIPT]
+        # TypeScript é o sistema existente: preferido no modo AUTO
+        return [AgentSystem.TYPESCRIPT, AgentSystem.PYTHON]
     
-    async def _initialize_typescript(self):
-        """Inicializa o sistema TypeScript."""
-        try:
-            # Importa o orquestrador TypeScript existente
-            from ..lib.orchestrator.agent_squad import getOrchestrator
-            
-            self.typescript_orchestrator = getOrchestrator()
-            self.active_system = AgentSystem.TYPESCRIPT
-            
-            self.logger.info("Sistema TypeScript ativado")
+    @property
+    def typescript_orchestrator(self):
+        """Orquestrador TypeScript carregado (ou None)."""
+        loaded = self.systems.get(AgentSystem.TYPESCRIPT)
+        return loaded.orchestrator if loaded else None
+    
+    @property
+    def python_orchestrator(self):
+        """Orquestrador Python carregado (ou None)."""
+        loaded = self.systems.get(AgentSystem.PYTHON)
+        return loaded.orchestrator if loaded else None
+    
+    @property
+    def is_ready(self) -> bool:
+        """Indica se a inicialização terminou."""
+        return self._ready.is_set()
+    
+    async def start(self, prewarm_fallback: bool = False) -> Dict[str, Any]:
+        """
+        Inicializa o sistema preferido (e opcionalmente o fallback) em paralelo.
+        
+        Chamadas repetidas ou concorrentes aguardam a mesma inicialização.
+        
+        Args:
+            prewarm_fallback: Também carrega o sistema de fallback, para trocas sem espera
+                (sempre carregado quando hedge ou tráfego sombra estão ligados)
             
-        except Exception as e:
-            self.logger.error(f"Erro ao inicializar TypeScript: {str(e)}")
-            raise
+        Returns:
+            Sistema ativo, duração da inicialização e erros por sistema
+        """
+        self._ensure_started(prewarm_fallback)
+        await asyncio.shield(self._start_task)
+        return self.startup_report()
     
-    async def _initialize_python(self):
-        """Inicializa o sistema Python."""
+    def _ensure_started(self, prewarm_fallback: Optional[bool] = None) -> None:
+        if self._start_task is None:
+            # Inicialização preguiçosa (sem ``start``) segue a configuração
+            if prewarm_fallback is None:
+                prewarm_fallback = self.config.prewarm_fallback_system
+            self._start_task = asyncio.create_task(self._start(prewarm_fallback))
+    
+    def _fallback_features(self) -> List[str]:
+        """Recursos ligados na configuração que só funcionam com os dois sistemas carregados."""
+        features = []
+        if self.config.hedging_enabled:
+            features.append("hedge")
+        if self.shadow.enabled:
+            features.append("tráfego sombra")
+        return features
+    
+    async def _start(self, prewarm_fallback: bool) -> None:
+        """Carrega os sistemas e libera a prontidão, com ou sem sucesso."""
+        started = time.perf_counter()
+        order = self._startup_order()
+        
+        # Sem o segundo sistema, hedge e tráfego sombra não fazem nada: carrega os dois
+        features = self._fallback_features()
+        if features and not prewarm_fallback:
+            self.logger.info(f"Pré-aquecendo também o sistema de fallback, necessário para: {', '.join(features)}")
+            prewarm_fallback = True
+        elif self.preferred_system == AgentSystem.AUTO and not prewarm_fallback:
+            self.logger.warning(
+                "Modo AUTO sem PREWARM_FALLBACK_SYSTEM: só um sistema é carregado e o roteamento "
+                "por latência fica desligado (o outro sistema serve apenas de fallback na inicialização)"
+            )
+        warm = order if prewarm_fallback else order[:1]
+        
         try:
-            from .agent_squad_orchestrator import FalaChefeAgentSquadOrchestrator
+            results = await asyncio.gather(*(self._load_system(system) for system in warm), return_exceptions=True)
+            for loaded in results:
+                if isinstance(loaded, _LoadedSystem):
+                    self.systems[loaded.system] = loaded
             
-            self.python_orchestrator = FalaChefeAgentSquadOrchestrator(self.config)
-            self.active_system = AgentSystem.PYTHON
+            for system in order:
+                if system not in self.systems and system not in warm:
+                    try:
+                        self.systems[system] = await self._load_system(system)
+                    except Exception:
+                        continue
+                if system in self.systems:
+                    self.active_system = system
+                    break
             
-            self.logger.info("Sistema Python ativado")
+            if self.active_system is None:
+                self.logger.error("Nenhum sistema de agentes disponível")
+                
+        finally:
+            self.startup_seconds = time.perf_counter() - started
+            self._ready.set()
+            active = self.active_system.value if self.active_system else "none"
+            self.logger.info(f"Inicialização concluída em {self.startup_seconds:.3f}s (sistema ativo: {active})")
+    
+    async def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Aguarda o fim da inicialização (iniciando-a se ninguém chamou ``start``).
+        
+        Args:
+            timeout: Tempo máximo de espera em segundos (None = sem limite)
             
-        except Exception as e:
-            self.logger.error(f"Erro ao inicializar Python: {str(e)}")
-            raise
+        Returns:
+            True se o orquestrador ficou pronto dentro do prazo
+        """
+        self._ensure_started()
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    def startup_report(self) -> Dict[str, Any]:
+        """Retorna o resultado da inicialização."""
+        return {
+            "ready": self.is_ready,
+            "active_system": self.active_system.value if self.active_system else "none",
+            "startup_seconds": round(self.startup_seconds, 4) if self.startup_seconds is not None else None,
+            "errors": dict(self.startup_errors)
+        }
     
-    async def _auto_select_system(self):
-        """Seleciona automaticamente o melhor sistema."""
+    async def _load_system(self, system: AgentSystem) -> _LoadedSystem:
+        """Carrega o orquestrador de um sistema sem bloquear o event loop, sem ativá-lo nem registrá-lo."""
         try:
-            # Tenta TypeScript primeiro (sistema existente)
-            await self._initialize_typescript()
-            self.logger.info("Sistema TypeScript selecionado automaticamente")
+            if system == AgentSystem.TYPESCRIPT:
+                orchestrator = await self._build_typescript()
+            else:
+                orchestrator = await asyncio.to_thread(self._build_python)
+            loaded = _LoadedSystem(system, orchestrator)
+            self.startup_errors.pop(system.value, None)
+            return loaded
             
         except Exception as e:
-            self.logger.warning(f"TypeScript não disponível: {str(e)}")
-            
-            try:
-                # Fallback para Python
-                await self._initialize_python()
-                self.logger.info("Sistema Python selecionado como fallback")
-                
-            except Exception as e2:
-                self.logger.error(f"Ambos os sistemas falharam: {str(e2)}")
-                raise Exception("Nenhum sistema de agentes disponível")
+            self.startup_errors[system.value] = str(e)
+            self.logger.error(f"Erro ao inicializar {system.value}: {str(e)}")
+            raise
+    
+    async def _build_typescript(self):
+        """Sobe o pool de workers Node que executa o orquestrador TypeScript."""
+        from .node_bridge import NodeWorkerPool
+        
+        pool = NodeWorkerPool(
+            command=shlex.split(self.config.node_worker_command),
+            size=self.config.node_workers,
+            startup_timeout=self.config.startup_timeout,
+            request_timeout=self.config.processing_timeout
+        )
+        await pool.start()
+        return pool
+    
+    def _build_python(self):
+        """Cria o orquestrador Python."""
+        from .agent_squad_orchestrator import FalaChefeAgentSquadOrchestrator
+        
+        return FalaChefeAgentSquadOrchestrator(self.config)
     
     async def process_message(
         self, 
         message: str, 
         user_id: str, 
         session_id: str, 
-        agent_name: Optional[str] = None
+        agent_name: Optional[str] = None,
+        priority: Any = Priority.NORMAL
     ) -> Dict[str, Any]:
         """
         Processa mensagem usando o sistema ativo.
@@ -118,17 +416,62 @@ class HybridOrchestrator:
             user_id: ID do usuário
             session_id: ID da sessão
             agent_name: Nome do agente (opcional)
+            priority: Classe de prioridade na fila de admissão ("high", "normal", "low")
             
         Returns:
-            Resposta processada
+            Resposta processada (ou resposta rápida de fallback se o prazo acabar ou o sistema estiver saturado)
         """
         try:
-            if self.active_system == AgentSystem.TYPESCRIPT:
-                return await self._process_with_typescript(message, user_id, session_id, agent_name)
-            elif self.active_system == AgentSystem.PYTHON:
-                return await self._process_with_python(message, user_id, session_id, agent_name)
-            else:
-                raise Exception("Nenhum sistema ativo")
+            # Prazo da requisição: herdado do chamador e limitado por processing_timeout
+            with deadline_scope(self.config.processing_timeout):
+                # Controle de admissão: limita a concorrência e descarta cedo sob saturação
+                async with self.admission.slot(Priority.parse(priority)):
+                    # Requisições que chegam durante a inicialização esperam, até o prazo
+                    if not self.is_ready and not await self.wait_until_ready(remaining(self.config.startup_timeout)):
+                        raise Exception("Sistema de agentes ainda em inicialização")
+                
+                    # A requisição fica presa à instância escolhida na chegada: uma troca
+                    # no meio do caminho só afeta as requisições seguintes
+                    loaded = self.systems.get(self._route())
+                    if loaded is None:
+                        raise Exception("Nenhum sistema ativo")
+                
+                    shadow = self._start_shadow(loaded, message, user_id, session_id, agent_name)
+                    started = time.perf_counter()
+                
+                    backup = self._hedge_target(loaded)
+                    if backup is not None:
+                        result = await self._hedged(loaded, backup, message, user_id, session_id, agent_name)
+                    else:
+                        result = await self._dispatch(loaded, message, user_id, session_id, agent_name)
+                
+                    if shadow is not None:
+                        shadow_task, shadow_system = shadow
+                        self.shadow.compare(shadow_task, result.get("system_used", loaded.system.value),
+                                            shadow_system.value, result, time.perf_counter() - started)
+                    return result
+        
+        except Overloaded as e:
+            self.logger.warning(f"Mensagem da sessão {session_id} descartada: {e.reason}")
+            return {
+                "message": HIGH_DEMAND_REPLY,
+                "agent_name": "system",
+                "success": False,
+                "shed": True,
+                "error": str(e),
+                "system_used": "none"
+            }
+        
+        except DeadlineExceeded as e:
+            self.logger.warning(f"Prazo esgotado ao processar mensagem da sessão {session_id}: {str(e)}")
+            return {
+                "message": TIMEOUT_REPLY,
+                "agent_name": "system",
+                "success": False,
+                "timed_out": True,
+                "error": str(e),
+                "system_used": self.active_system.value if self.active_system else "none"
+            }
                 
         except Exception as e:
             self.logger.error(f"Erro ao processar mensagem: {str(e)}")
@@ -140,31 +483,271 @@ class HybridOrchestrator:
                 "system_used": self.active_system.value if self.active_system else "none"
             }
     
+    async def stream_message(
+        self,
+        message: str,
+        user_id: str,
+        session_id: str,
+        agent_name: Optional[str] = None,
+        priority: Any = Priority.NORMAL
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Processa mensagem usando o sistema ativo, repassando os trechos da resposta à medida que chegam.
+        
+        Passa pelo mesmo prazo, controle de admissão e roteamento de
+        ``process_message``; hedge e tráfego sombra ficam de fora, porque
+        dependem da resposta inteira.
+        
+        Args:
+            message: Mensagem do usuário
+            user_id: ID do usuário
+            session_id: ID da sessão
+            agent_name: Nome do agente (opcional)
+            priority: Classe de prioridade na fila de admissão ("high", "normal", "low")
+            
+        Yields:
+            Eventos "chunk" com o texto e, por último, um evento "done" com os metadados
+        """
+        admitted = False
+        loaded = None
+        started = time.perf_counter()
+        success = False
+        finished = False
+        try:
+            # O prazo é fixado na chegada: o escopo não pode atravessar os yields
+            with deadline_scope(self.config.processing_timeout) as stop:
+                await self.admission.acquire(Priority.parse(priority))
+                admitted = True
+                
+                if not self.is_ready and not await self.wait_until_ready(remaining(self.config.startup_timeout)):
+                    raise Exception("Sistema de agentes ainda em inicialização")
+                
+                loaded = self.systems.get(self._route())
+                if loaded is None:
+                    raise Exception("Nenhum sistema ativo")
+                loaded.acquire()
+                started = time.perf_counter()
+            
+            if loaded.system == AgentSystem.TYPESCRIPT:
+                events = self._stream_typescript(loaded.orchestrator, message, user_id, session_id, agent_name)
+            else:
+                events = loaded.orchestrator.stream_message(message, user_id, session_id, agent_name)
+            
+            async for event in stream_with_deadline(events, until=stop):
+                if event["type"] == DONE:
+                    success = event.get("success", True) is not False
+                    event["system_used"] = loaded.system.value
+                yield event
+            finished = True
+        
+        except Overloaded as e:
+            self.logger.warning(f"Mensagem da sessão {session_id} descartada: {e.reason}")
+            yield done_event(
+                message=HIGH_DEMAND_REPLY,
+                agent_name="system",
+                success=False,
+                shed=True,
+                error=str(e),
+                system_used="none"
+            )
+        
+        except DeadlineExceeded as e:
+            self.logger.warning(f"Prazo esgotado ao processar mensagem da sessão {session_id}: {str(e)}")
+            finished = True
+            yield done_event(
+                message=TIMEOUT_REPLY,
+                agent_name="system",
+                success=False,
+                timed_out=True,
+                error=str(e),
+                system_used=self.active_system.value if self.active_system else "none"
+            )
+        
+        except Exception as e:
+            self.logger.error(f"Erro ao processar mensagem: {str(e)}")
+            finished = True
+            yield done_event(
+                message="Desculpe, ocorreu um erro ao processar sua mensagem.",
+                agent_name="system",
+                success=False,
+                error=str(e),
+                system_used=self.active_system.value if self.active_system else "none"
+            )
+        
+        finally:
+            if loaded is not None:
+                loaded.release()
+                # Fluxo abandonado pelo chamador não conta como erro do sistema
+                if finished:
+                    self.latency[loaded.system].record(time.perf_counter() - started, success)
+            if admitted:
+                self.admission.release()
+    
+    async def _stream_typescript(
+        self,
+        orchestrator: Any,
+        message: str,
+        user_id: str,
+        session_id: str,
+        agent_name: Optional[str]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """O worker Node responde em bloco: um único trecho seguido do evento final."""
+        result = await self._process_with_typescript(orchestrator, message, user_id, session_id, agent_name)
+        yield chunk_event(result["message"], result["agent_name"])
+        yield done_event(agent_name=result["agent_name"], success=result["success"])
+    
+    def _route(self) -> Optional[AgentSystem]:
+        """Sistema da próxima requisição: o ativo, ou o da política AUTO se houver mais de um carregado."""
+        if self.preferred_system != AgentSystem.AUTO or len(self.systems) < 2 or self.active_system is None:
+            return self.active_system
+        
+        target, current = self.routing.choose(
+            self.active_system,
+            {system: self.latency[system] for system in self.systems}
+        )
+        if current != self.active_system:
+            self.logger.info(f"Roteamento AUTO: tráfego movido de {self.active_system.value} para {current.value}")
+            self.active_system = current
+        return target
+    
+    async def _dispatch(
+        self,
+        loaded: _LoadedSystem,
+        message: str,
+        user_id: str,
+        session_id: str,
+        agent_name: Optional[str]
+    ) -> Dict[str, Any]:
+        """Processa em uma instância, contando a requisição em andamento e medindo latência e erro."""
+        loaded.acquire()
+        started = time.perf_counter()
+        success = False
+        cancelled = False
+        try:
+            # Cancela a chamada quando o prazo da requisição acaba
+            if loaded.system == AgentSystem.TYPESCRIPT:
+                result = await with_deadline(self._process_with_typescript(loaded.orchestrator, message, user_id, session_id, agent_name))
+            else:
+                result = await with_deadline(self._process_with_python(loaded.orchestrator, message, user_id, session_id, agent_name))
+            success = result.get("success", True) is not False
+            return result
+        except asyncio.CancelledError:
+            # Perdedor de um hedge: registrado por _hedged, sem contar como erro do sistema
+            cancelled = True
+            raise
+        finally:
+            loaded.release()
+            if not cancelled:
+                self.latency[loaded.system].record(time.perf_counter() - started, success)
+    
+    def _start_shadow(
+        self,
+        primary: _LoadedSystem,
+        message: str,
+        user_id: str,
+        session_id: str,
+        agent_name: Optional[str]
+    ) -> Optional[Tuple[asyncio.Task, AgentSystem]]:
+        """Espelha a requisição no outro sistema carregado, se amostrada e dentro do orçamento."""
+        target = next((loaded for system, loaded in self.systems.items() if system != primary.system), None)
+        # Carga medida na admissão: inclui a própria requisição e as que esperam na fila
+        if target is None or not self.shadow.admit(self.admission.in_flight + self.admission.queued):
+            return None
+        
+        # Sessão separada e modo sombra: o sistema sombra usa histórico descartável e não
+        # aprende nem audita com a chamada (e, sem acquire, ela não segura a drenagem de
+        # uma troca de sistema)
+        process = self._process_with_typescript if target.system == AgentSystem.TYPESCRIPT else self._process_with_python
+        call = with_deadline(process(target.orchestrator, message, user_id, f"shadow:{session_id}", agent_name, shadow=True))
+        return self.shadow.launch(call), target.system
+    
+    def _hedge_target(self, primary: _LoadedSystem) -> Optional[_LoadedSystem]:
+        """Outro sistema carregado para receber o hedge (None se o hedge estiver desligado)."""
+        if not self.config.hedging_enabled:
+            return None
+        return next((loaded for system, loaded in self.systems.items() if system != primary.system), None)
+    
+    async def _hedged(
+        self,
+        primary: _LoadedSystem,
+        backup: _LoadedSystem,
+        message: str,
+        user_id: str,
+        session_id: str,
+        agent_name: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Processa no primário e, se ele passar do seu p95, repete no outro sistema.
+        
+        A primeira resposta bem-sucedida vence e a outra chamada é cancelada
+        (e entra no p95 do seu sistema com o tempo que já tinha levado).
+        As duas correm de fato em paralelo: o sistema TypeScript responde por
+        IPC e o Python faz as chamadas síncronas ao LLM em threads do pool
+        OpenAI, então o perdedor não segura o event loop. Cancelar um perdedor
+        Python cancela só a task que o aguarda: a chamada ao LLM segue na
+        thread do pool até responder ou estourar o timeout dela.
+        """
+        self.hedging.on_request()
+        tracker = self.latency[primary.system]
+        started = time.perf_counter()
+        primary_task = asyncio.create_task(self._dispatch(primary, message, user_id, session_id, agent_name))
+        attempts = {primary_task: (primary, started)}
+        pending = {primary_task}
+        try:
+            delay = tracker.p95 if len(tracker) >= self.hedging.min_samples else None
+            if delay is None:
+                return await primary_task
+            
+            await asyncio.wait({primary_task}, timeout=delay)
+            if primary_task.done() or not self.hedging.try_acquire():
+                return await primary_task
+            
+            self.logger.info(f"Hedge: {primary.system.value} passou de {delay:.3f}s, repetindo em {backup.system.value}")
+            hedge_task = asyncio.create_task(self._dispatch(backup, message, user_id, session_id, agent_name))
+            attempts[hedge_task] = (backup, time.perf_counter())
+            pending.add(hedge_task)
+            
+            failed = []
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and task.result().get("success", True) is not False:
+                        if task is hedge_task:
+                            self.hedging.hedge_wins += 1
+                        return task.result()
+                    failed.append(task)
+            
+            # As duas falharam: propaga o resultado (ou erro) da que terminou por último
+            return failed[-1].result()
+        finally:
+            # Inclui o caso de quem aguarda ser cancelado: nenhuma task fica órfã
+            # segurando a instância. Amostra censurada do perdedor: sem ela, o
+            # p95 do sistema lento fica otimista
+            for task in pending:
+                if task.done():
+                    continue
+                task.cancel()
+                loaded, attempt_started = attempts[task]
+                self.latency[loaded.system].record_censored(time.perf_counter() - attempt_started)
+    
     async def _process_with_typescript(
         self, 
+        orchestrator: Any,
         message: str, 
         user_id: str, 
         session_id: str, 
-        agent_name: Optional[str]
+        agent_name: Optional[str],
+        shadow: bool = False
     ) -> Dict[str, Any]:
-        """Processa mensagem com sistema TypeScript."""
+        """Processa mensagem com sistema TypeScript (``shadow``: histórico descartável no worker)."""
         try:
-            if agent_name:
-                # Usa agente específico
-                from ..lib.orchestrator.agent_squad import processMessageWithSpecificAgent
-                result = await processMessageWithSpecificAgent(
-                    message, user_id, session_id, agent_name
-                )
-            else:
-                # Usa classificação automática
-                result = await self.typescript_orchestrator.routeRequest(
-                    message, user_id, session_id
-                )
-                result = {
-                    "message": result.get("message", "Resposta não disponível"),
-                    "agent_name": result.get("agent_name", "unknown"),
-                    "success": True
-                }
+            # Um salto de IPC até um worker Node já aquecido (agente específico ou classificação automática)
+            response = await orchestrator.route_request(message, user_id, session_id, agent_name, shadow)
+            result = {
+                "message": response.get("message") or "Resposta não disponível",
+                "agent_name": response.get("agent_name") or agent_name or "unknown",
+                "success": True
+            }
             
             result["system_used"] = "typescript"
             return result
@@ -175,19 +758,23 @@ class HybridOrchestrator:
     
     async def _process_with_python(
         self, 
+        orchestrator: Any,
         message: str, 
         user_id: str, 
         session_id: str, 
-        agent_name: Optional[str]
+        agent_name: Optional[str],
+        shadow: bool = False
     ) -> Dict[str, Any]:
-        """Processa mensagem com sistema Python."""
+        """Processa mensagem com sistema Python (``shadow``: sem aprendizado, auditoria nem histórico real)."""
         try:
-            if agent_name:
-                result = await self.python_orchestrator.process_message_with_specific_agent(
+            if shadow:
+                result = await orchestrator.process_message(message, user_id, session_id, agent_name, shadow=True)
+            elif agent_name:
+                result = await orchestrator.process_message_with_specific_agent(
                     message, user_id, session_id, agent_name
                 )
             else:
-                result = await self.python_orchestrator.process_message(
+                result = await orchestrator.process_message(
                     message, user_id, session_id
                 )
             
@@ -200,30 +787,107 @@ class HybridOrchestrator:
     
     async def switch_system(self, new_system: AgentSystem) -> bool:
         """
-        Troca o sistema ativo.
+        Troca o sistema ativo sem interromper requisições.
+        
+        O novo sistema é carregado à parte (ou reaproveitado, se já estiver
+        pré-aquecido e inativo) e só então passa a receber as novas
+        requisições. As que já estavam em andamento terminam na instância
+        antiga, que é descartada depois de drenada. O sistema ativo anterior
+        continua carregado quando hedge, tráfego sombra ou o modo AUTO
+        precisam dos dois. O resultado fica em ``last_switch``.
         
         Args:
-            new_system: Novo sistema para ativar
+            new_system: Novo sistema para ativar (AUTO segue a ordem de preferência)
             
         Returns:
             True se a troca foi bem-sucedida
         """
-        try:
-            self.logger.info(f"Trocando sistema de {self.active_system} para {new_system}")
+        await self.wait_until_ready(self.config.startup_timeout)
+        
+        async with self._switch_lock:
+            started = time.perf_counter()
+            previous_system = self.active_system
+            self.logger.info(f"Trocando sistema de {previous_system} para {new_system}")
             
-            if new_system == AgentSystem.TYPESCRIPT:
-                await self._initialize_typescript()
-            elif new_system == AgentSystem.PYTHON:
-                await self._initialize_python()
-            else:
-                await self._auto_select_system()
+            candidates = self._startup_order() if new_system == AgentSystem.AUTO else [new_system]
+            loaded = None
+            for system in candidates:
+                warm = self.systems.get(system)
+                if warm is not None and system != previous_system:
+                    loaded = warm
+                    break
+                try:
+                    loaded = await self._load_system(system)
+                    break
+                except Exception:
+                    continue
+            
+            if loaded is None:
+                self.logger.error(f"Erro ao trocar sistema: nenhum candidato disponível para {new_system.value}")
+                self.last_switch = {
+                    "from": previous_system.value if previous_system else "none",
+                    "to": new_system.value,
+                    "success": False,
+                    "errors": dict(self.startup_errors),
+                    "timestamp": time.time()
+                }
+                return False
             
-            self.logger.info(f"Sistema alterado para: {self.active_system}")
+            time_to_ready = time.perf_counter() - started
+            
+            # Troca atômica: novas requisições já usam a nova instância. Sai
+            # só a instância substituída sob a mesma chave e, se ninguém
+            # precisa dos dois sistemas, o sistema ativo anterior
+            retiring = [self.systems.get(loaded.system)]
+            keep_both = bool(self._fallback_features()) or self.preferred_system == AgentSystem.AUTO
+            if previous_system != loaded.system and not keep_both:
+                retiring.append(self.systems.get(previous_system))
+            retiring = [old for old in retiring if old is not None and old is not loaded]
+            
+            self.systems[loaded.system] = loaded
+            self.active_system = loaded.system
+            if retiring:
+                # Chamadas sombra usam a instância sem contá-la como em andamento: cancela antes de descartar
+                self.shadow.cancel_all()
+            
+            drained, dropped = await self._retire(retiring)
+            
+            self.last_switch = {
+                "from": previous_system.value if previous_system else "none",
+                "to": loaded.system.value,
+                "success": True,
+                "time_to_ready_seconds": round(time_to_ready, 4),
+                "switch_seconds": round(time.perf_counter() - started, 4),
+                "drained_requests": drained,
+                "dropped_requests": dropped,
+                "timestamp": time.time()
+            }
+            self.logger.info(f"Sistema alterado para: {self.active_system} ({self.last_switch})")
             return True
+    
+    async def _retire(self, retiring: List[_LoadedSystem]) -> Tuple[int, int]:
+        """
+        Drena e descarta instâncias que deixaram de ser usadas.
+        
+        Returns:
+            (requisições que terminaram na instância antiga, requisições ainda pendentes no prazo)
+        """
+        drained = dropped = 0
+        for old in retiring:
+            pending = old.in_flight
+            if not await old.drain(self.config.processing_timeout):
+                self.logger.warning(f"{old.in_flight} requisições ainda pendentes no sistema {old.system.value} antigo")
+                dropped += old.in_flight
+            drained += pending - old.in_flight
             
-        except Exception as e:
-            self.logger.error(f"Erro ao trocar sistema: {str(e)}")
-            return False
+            if self.systems.get(old.system) is old:
+                del self.systems[old.system]
+            try:
+                await old.close()
+            except Exception as e:
+                self.logger.warning(f"Erro ao encerrar sistema {old.system.value}: {str(e)}")
+        
+        return drained, dropped
     
     async def get_system_status(self) -> Dict[str, Any]:
         """
@@ -238,14 +902,26 @@ class HybridOrchestrator:
                 "preferred_system": self.preferred_system.value,
                 "typescript_available": self.typescript_orchestrator is not None,
                 "python_available": self.python_orchestrator is not None,
+                "startup": self.startup_report(),
+                "in_flight": {system.value: loaded.in_flight for system, loaded in self.systems.items()},
+                "last_switch": self.last_switch,
+                "routing": {
+                    "mode": "auto" if self.preferred_system == AgentSystem.AUTO and len(self.systems) > 1 else "pinned",
+                    **self.routing.stats()
+                },
+                "latency": {system.value: tracker.stats() for system, tracker in self.latency.items()},
+                "hedging": {"enabled": bool(self.config.hedging_enabled), **self.hedging.stats()},
+                "shadow": self.shadow.report(),
+                "admission": self.admission.stats(),
                 "timestamp": asyncio.get_event_loop().time()
             }
             
             # Testa saúde do sistema ativo
             if self.active_system == AgentSystem.TYPESCRIPT and self.typescript_orchestrator:
                 try:
-                    # Teste básico do TypeScript
-                    status["typescript_health"] = "healthy"
+                    health = await self.typescript_orchestrator.health_check()
+                    status["typescript_health"] = health.get("status", "unknown")
+                    status["node_workers"] = health.get("workers", [])
                 except:
                     status["typescript_health"] = "unhealthy"
             
@@ -275,7 +951,13 @@ class HybridOrchestrator:
         try:
             status = await self.get_system_status()
             
-            if self.active_system:
+            if not self.is_ready:
+                return {
+                    "component": "hybrid_orchestrator",
+                    "status": "starting",
+                    "details": status
+                }
+            elif self.active_system:
                 return {
                     "component": "hybrid_orchestrator",
                     "status": "healthy",
@@ -0,0 +1,262 @@
+"""
+Pré-classificador local de intenção do FalaChefe Python.
+Palavras-chave + TF-IDF/regressão logística escolhem Leo, Max ou Lia sem chamar o classificador LLM.
+"""
+
+import random
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from ..analytics.topic_sketch import normalize_text
+
+
+# Termos que indicam o domínio de cada agente (sem acentos, como saem de ``normalize_text``)
+AGENT_KEYWORDS = {
+    "leo": (
+        "financeiro", "financeira", "financas", "fluxo de caixa", "caixa", "lucro", "prejuizo", "margem",
+        "custo", "custos", "despesa", "despesas", "receita", "faturamento", "fatura", "boleto", "imposto",
+        "impostos", "tributo", "simples nacional", "guia do das", "das do mei", "nota fiscal", "emprestimo", "financiamento",
+        "juros", "divida", "dividas", "investimento", "capital de giro", "orcamento", "precificacao",
+        "pro-labore", "pro labore", "conta bancaria", "contador", "contabilidade", "inadimplencia"
+    ),
+    "max": (
+        "marketing", "vendas", "vender", "venda", "campanha", "campanhas", "anuncio", "anuncios",
+        "instagram", "facebook", "tiktok", "whatsapp business", "redes sociais", "rede social", "post",
+        "posts", "seguidores", "engajamento", "divulgacao", "divulgar", "promocao", "promocoes", "lead",
+        "leads", "funil", "marca", "branding", "publico-alvo", "publico alvo", "trafego pago", "google ads",
+        "conteudo", "influenciador", "clientes novos", "atrair clientes", "fidelizar"
+    ),
+    "lia": (
+        "funcionario", "funcionarios", "colaborador", "colaboradores", "equipe", "time", "contratar",
+        "contratacao", "contratacoes", "recrutamento", "selecao", "entrevista", "curriculo", "demissao",
+        "demitir", "rescisao", "ferias", "salario", "salarios", "folha de pagamento", "clt", "carteira assinada",
+        "beneficios", "vale transporte", "vale refeicao", "treinamento", "lideranca", "clima organizacional",
+        "recursos humanos", "rh", "estagiario", "jornada de trabalho", "horas extras", "avaliacao de desempenho"
+    )
+}
+
+# Frases de partida do modelo; o modelo é reajustado com as escolhas do classificador LLM
+SEED_EXAMPLES = {
+    "leo": (
+        "Como melhorar o fluxo de caixa da minha empresa?",
+        "Meu lucro caiu esse mês, o que pode ser?",
+        "Quanto devo pagar de imposto no Simples Nacional?",
+        "Vale a pena pegar um empréstimo para capital de giro?",
+        "Como calcular o preço de venda dos meus produtos com a margem certa?",
+        "Minhas despesas estão maiores que a receita",
+        "Preciso organizar as contas a pagar e receber",
+        "Quanto posso tirar de pró-labore?",
+        "Como montar um orçamento para o próximo ano?",
+        "Tenho muitos clientes inadimplentes, como cobrar?",
+    ),
+    "max": (
+        "Como atrair mais clientes para minha loja?",
+        "Quero criar uma campanha no Instagram",
+        "Que tipo de post devo fazer nas redes sociais?",
+        "Como aumentar minhas vendas no fim de ano?",
+        "Vale a pena investir em anúncios no Google?",
+        "Preciso de ideias de promoção para o dia das mães",
+        "Como ganhar seguidores e engajamento?",
+        "Quero divulgar meu novo produto",
+        "Como melhorar o atendimento para fidelizar clientes?",
+        "Qual o melhor público-alvo para meu negócio?",
+    ),
+    "lia": (
+        "Como contratar um bom funcionário?",
+        "Preciso demitir um colaborador, como fazer a rescisão?",
+        "Quanto custa um funcionário com carteira assinada?",
+        "Como calcular as férias do meu funcionário?",
+        "Minha equipe está desmotivada, o que fazer?",
+        "Quais benefícios devo oferecer aos colaboradores?",
+        "Como fazer uma entrevista de emprego?",
+        "Como organizar a folha de pagamento?",
+        "Preciso treinar meu time de atendimento",
+        "Como lidar com conflitos entre funcionários?",
+    )
+}
+
+
+@dataclass(frozen=True)
+class IntentPrediction:
+    """Agente previsto localmente e a confiança da previsão."""
+
+    agent: Optional[str]
+    confidence: float
+    confident: bool
+
+
+class LocalIntentClassifier:
+    """
+    Pré-classificador local de intenção.
+
+    Combina contagem de palavras-chave por agente com a probabilidade de uma
+    regressão logística sobre TF-IDF de n-gramas de caracteres (tolerante a
+    erros de digitação). Quando a confiança passa de ``threshold``, a
+    mensagem vai direto ao agente; as demais seguem para o classificador LLM,
+    cuja escolha é usada para medir a concordância e reajustar o modelo.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.75,
+        audit_rate: float = 0.0,
+        max_examples: int = 5000,
+        refit_every: int = 200,
+        seed: Optional[int] = None
+    ):
+        """
+        Inicializa o classificador.
+
+        Args:
+            threshold: Confiança mínima para dispensar o classificador LLM
+            audit_rate: Fração das mensagens desviadas conferidas pelo LLM em background
+            max_examples: Exemplos rotulados pelo LLM mantidos para reajuste
+            refit_every: Novos exemplos rotulados entre reajustes
+            seed: Semente da amostragem de auditoria
+        """
+        self.threshold = threshold
+        self.audit_rate = audit_rate
+        self.refit_every = refit_every
+        self.agents = tuple(AGENT_KEYWORDS)
+
+        self._keywords = {
+            agent: re.compile(r"\b(?:" + "|".join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)) + r")\b")
+            for agent, keywords in AGENT_KEYWORDS.items()
+        }
+        self._learned: Deque[Tuple[str, str]] = deque(maxlen=max_examples)
+        self._pending = 0
+        self._refit_lock = threading.Lock()
+        self._random = random.Random(seed)
+
+        self.predictions = 0
+        self.bypassed = 0
+        self.fallbacks = 0
+        self.refits = 0
+        # Concordância com o LLM: "fallback" (mensagens que foram ao LLM) e "audit" (desviadas e conferidas)
+        self.agreement = {"fallback": [0, 0], "audit": [0, 0]}
+
+        self._model = self._fit(self._training_set())
+
+    def _training_set(self) -> List[Tuple[str, str]]:
+        seeds = [(normalize_text(text), agent) for agent, texts in SEED_EXAMPLES.items() for text in texts]
+        return seeds + list(self._learned)
+
+    @staticmethod
+    def _fit(examples: Iterable[Tuple[str, str]]) -> Pipeline:
+        texts, labels = zip(*examples)
+        model = Pipeline([
+            ("tfidf", TfidfVectorizer(analyzer="char_wb", ngram_range=(3, 5), sublinear_tf=True)),
+            ("clf", LogisticRegression(C=10.0, max_iter=1000))
+        ])
+        model.fit(texts, labels)
+        return model
+
+    def keyword_scores(self, text: str) -> Dict[str, int]:
+        """Quantidade de palavras-chave de cada agente no texto (já normalizado)."""
+        return {agent: len(regex.findall(text)) for agent, regex in self._keywords.items()}
+
+    def predict(self, text: str) -> IntentPrediction:
+        """
+        Prevê o agente de uma mensagem.
+
+        Sem palavras-chave, a confiança é a probabilidade do modelo; com elas,
+        é a média entre a probabilidade e a fração de palavras-chave do agente.
+
+        Args:
+            text: Mensagem do usuário
+
+        Returns:
+            Agente previsto, confiança e se ela basta para dispensar o LLM
+        """
+        self.predictions += 1
+        normalized = normalize_text(text)
+        if not normalized.strip():
+            return IntentPrediction(None, 0.0, False)
+
+        model = self._model
+        probabilities = dict(zip(model.classes_, model.predict_proba([normalized])[0]))
+
+        hits = self.keyword_scores(normalized)
+        total_hits = sum(hits.values())
+        if total_hits:
+            scores = {agent: (probabilities.get(agent, 0.0) + hits[agent] / total_hits) / 2 for agent in self.agents}
+        else:
+            scores = {agent: probabilities.get(agent, 0.0) for agent in self.agents}
+
+        agent = max(scores, key=scores.get)
+        confidence = float(scores[agent])
+        return IntentPrediction(agent, confidence, confidence >= self.threshold)
+
+    def should_audit(self) -> bool:
+        """Sorteia se a mensagem desviada será conferida pelo LLM."""
+        return self.audit_rate > 0 and self._random.random() < self.audit_rate
+
+    def record_bypass(self) -> None:
+        self.bypassed += 1
+
+    def record_llm_choice(self, text: str, prediction: IntentPrediction, llm_agent: Optional[str], audit: bool = False) -> bool:
+        """
+        Registra a escolha do classificador LLM para uma mensagem.
+
+        Args:
+            text: Mensagem do usuário
+            prediction: Previsão local da mesma mensagem
+            llm_agent: Agente escolhido pelo LLM
+            audit: Se é a conferência de uma mensagem desviada (senão, uma que foi ao LLM)
+
+        Returns:
+            True quando há exemplos novos suficientes para reajustar o modelo
+        """
+        if not audit:
+            self.fallbacks += 1
+
+        llm_agent = str(llm_agent or "").lower()
+        if llm_agent not in self.agents:
+            return False
+
+        bucket = self.agreement["audit" if audit else "fallback"]
+        bucket[1] += 1
+        if prediction.agent == llm_agent:
+            bucket[0] += 1
+
+        self._learned.append((normalize_text(text), llm_agent))
+        self._pending += 1
+        return self._pending >= self.refit_every
+
+    def refit(self) -> bool:
+        """Reajusta o modelo com as sementes e os exemplos rotulados pelo LLM (seguro para rodar em thread)."""
+        if not self._refit_lock.acquire(blocking=False):
+            return False
+        try:
+            self._pending = 0
+            model = self._fit(self._training_set())
+            self._model = model
+            self.refits += 1
+            return True
+        finally:
+            self._refit_lock.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Taxa de desvio do LLM e concordância com ele."""
+        def rate(bucket: List[int]) -> Optional[float]:
+            return round(bucket[0] / bucket[1], 4) if bucket[1] else None
+
+        return {
+            "threshold": self.threshold,
+            "predictions": self.predictions,
+            "bypassed": self.bypassed,
+            "llm_fallbacks": self.fallbacks,
+            "bypass_rate": round(self.bypassed / self.predictions, 4) if self.predictions else 0.0,
+            "fallback_agreement": rate(self.agreement["fallback"]),
+            "bypass_accuracy": rate(self.agreement["audit"]),
+            "audited": self.agreement["audit"][1],
+            "learned_examples": len(self._learned),
+            "refits": self.refits
+        }
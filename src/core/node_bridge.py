@@ -0,0 +1,372 @@
+"""
+Bridge Node do FalaChefe Python.
+Pool de workers Node persistentes que executam o orquestrador TypeScript (src/lib/orchestrator).
+
+Protocolo: frames JSON prefixados pelo tamanho (uint32 big-endian) em stdin/stdout.
+Requisição: {"id", "method", "params"}; resposta: {"id", "result"} ou {"id", "error"};
+o worker anuncia {"event": "ready"} (ou {"event": "error"}) ao terminar de carregar.
+"""
+
+import asyncio
+import itertools
+import json
+import struct
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..utils.deadline import DeadlineExceeded, expired, remaining
+from ..utils.logger import get_component_logger
+
+
+_HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_WORKER_COMMAND = ("npx", "tsx", "scripts/agent-squad-worker.ts")
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    """Serializa uma mensagem como frame (tamanho + JSON)."""
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    return _HEADER.pack(len(body)) + body
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+    """Lê um frame do stream (None quando o stream termina)."""
+    try:
+        header = await reader.readexactly(_HEADER.size)
+        (size,) = _HEADER.unpack(header)
+        if size > MAX_FRAME_SIZE:
+            raise ValueError(f"Frame grande demais: {size} bytes")
+        return json.loads(await reader.readexactly(size))
+    except asyncio.IncompleteReadError:
+        return None
+
+
+class NodeWorkerError(Exception):
+    """Falha de um worker Node (erro remoto, processo encerrado ou timeout)."""
+
+
+class _NodeWorker:
+    """Um processo Node com várias requisições multiplexadas por id."""
+
+    def __init__(self, index: int, command: Sequence[str], cwd: Path, on_exit=None):
+        self.index = index
+        self.command = list(command)
+        self.cwd = cwd
+        self.on_exit = on_exit
+        self.logger = get_component_logger("node_bridge")
+
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.requests = 0
+        self.started_at: Optional[float] = None
+
+        self._ids = itertools.count(1)
+        self._ready: Optional[asyncio.Future] = None
+        self._tasks: List[asyncio.Task] = []
+        self._closing = False
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None and not self._closing
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.pending)
+
+    async def start(self, timeout: float) -> None:
+        """Inicia o processo e aguarda o anúncio de prontidão."""
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            cwd=str(self.cwd),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        self._ready = asyncio.get_running_loop().create_future()
+        self._tasks = [
+            asyncio.create_task(self._read_frames()),
+            asyncio.create_task(self._read_stderr())
+        ]
+
+        try:
+            await asyncio.wait_for(self._ready, timeout)
+        except Exception:
+            await self.close()
+            raise
+        self.started_at = time.time()
+
+    async def call(self, method: str, params: Dict[str, Any], timeout: Optional[float]) -> Any:
+        """Envia uma requisição e aguarda a resposta com o mesmo id."""
+        if not self.alive:
+            raise NodeWorkerError(f"Worker {self.index} indisponível")
+
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        self.requests += 1
+        try:
+            self.process.stdin.write(encode_frame({"id": request_id, "method": method, "params": params}))
+            await self.process.stdin.drain()
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            if expired():
+                raise DeadlineExceeded(f"Prazo esgotado aguardando {method} do worker {self.index}")
+            raise NodeWorkerError(f"Worker {self.index} não respondeu {method} em {timeout}s")
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise NodeWorkerError(f"Worker {self.index} encerrado: {str(e)}")
+        finally:
+            self.pending.pop(request_id, None)
+
+    async def _read_frames(self) -> None:
+        try:
+            while True:
+                message = await read_frame(self.process.stdout)
+                if message is None:
+                    break
+
+                event = message.get("event")
+                if event == "ready":
+                    if not self._ready.done():
+                        self._ready.set_result(True)
+                elif event == "error":
+                    if not self._ready.done():
+                        self._ready.set_exception(NodeWorkerError(message.get("error", "falha ao iniciar worker")))
+                else:
+                    future = self.pending.get(message.get("id"))
+                    if future is None or future.done():
+                        continue
+                    if "error" in message:
+                        future.set_exception(NodeWorkerError(str(message["error"])))
+                    else:
+                        future.set_result(message.get("result"))
+
+        except Exception as e:
+            self.logger.error(f"Erro ao ler frames do worker {self.index}: {str(e)}")
+
+        finally:
+            self._fail_pending(NodeWorkerError(f"Worker {self.index} encerrado"))
+            if self.on_exit is not None and not self._closing:
+                self.on_exit(self)
+
+    async def _read_stderr(self) -> None:
+        # Logs do worker (o stdout é reservado aos frames)
+        while True:
+            line = await self.process.stderr.readline()
+            if not line:
+                break
+            self.logger.info(f"[node:{self.index}] {line.decode('utf-8', 'replace').rstrip()}")
+
+    def _fail_pending(self, error: Exception) -> None:
+        if self._ready is not None and not self._ready.done():
+            self._ready.set_exception(error)
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Encerra o processo (fecha o stdin e, se preciso, mata)."""
+        self._closing = True
+        if self.process is not None and self.process.returncode is None:
+            try:
+                self.process.stdin.close()
+                await asyncio.wait_for(self.process.wait(), timeout)
+            except (asyncio.TimeoutError, ProcessLookupError, BrokenPipeError, ConnectionResetError):
+                try:
+                    self.process.kill()
+                    await self.process.wait()
+                except ProcessLookupError:
+                    pass
+
+        for task in self._tasks:
+            task.cancel()
+        self._fail_pending(NodeWorkerError(f"Worker {self.index} encerrado"))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "pid": self.process.pid if self.process else None,
+            "alive": self.alive,
+            "in_flight": self.in_flight,
+            "requests": self.requests
+        }
+
+
+class NodeWorkerPool:
+    """
+    Pool de workers Node para o orquestrador TypeScript.
+
+    Cada worker carrega o orquestrador uma vez e atende várias requisições
+    em paralelo (multiplexadas por id), então uma chamada ao squad TypeScript
+    custa um salto de IPC, não um processo novo. Requisições vão para o
+    worker com menos chamadas em andamento; workers que morrem ou deixam de
+    responder ao ping são reiniciados.
+    """
+
+    def __init__(
+        self,
+        command: Optional[Sequence[str]] = None,
+        size: int = 2,
+        cwd: Optional[Path] = None,
+        startup_timeout: float = 60.0,
+        request_timeout: Optional[float] = 300.0,
+        ping_interval: float = 15.0,
+        ping_timeout: float = 5.0
+    ):
+        """
+        Inicializa o pool (os processos só sobem em ``start``).
+
+        Args:
+            command: Comando do worker (padrão: ``npx tsx scripts/agent-squad-worker.ts``)
+            size: Quantidade de workers
+            cwd: Diretório de trabalho dos workers (raiz do projeto)
+            startup_timeout: Tempo máximo para um worker anunciar prontidão
+            request_timeout: Tempo máximo de uma requisição
+            ping_interval: Intervalo entre pings de saúde (0 desativa)
+            ping_timeout: Tempo máximo de resposta ao ping
+        """
+        if size <= 0:
+            raise ValueError("size deve ser positivo")
+
+        self.command = list(command or DEFAULT_WORKER_COMMAND)
+        self.size = size
+        self.cwd = Path(cwd) if cwd else PROJECT_ROOT
+        self.startup_timeout = startup_timeout
+        self.request_timeout = request_timeout
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.logger = get_component_logger("node_bridge")
+
+        self.workers: List[Optional[_NodeWorker]] = [None] * size
+        self.restarts = 0
+        self._restarting: Dict[int, asyncio.Task] = {}
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def start(self) -> None:
+        """Sobe todos os workers em paralelo (falha se nenhum ficar pronto)."""
+        results = await asyncio.gather(*(self._spawn(index) for index in range(self.size)), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if len(errors) == self.size:
+            raise NodeWorkerError(f"Nenhum worker Node iniciou: {errors[0]}")
+
+        if self.ping_interval:
+            self._monitor_task = asyncio.create_task(self._monitor())
+        self.logger.info(f"Pool Node iniciado com {self.size - len(errors)}/{self.size} workers")
+
+    async def _spawn(self, index: int) -> None:
+        worker = _NodeWorker(index, self.command, self.cwd, on_exit=self._on_worker_exit)
+        await worker.start(self.startup_timeout)
+        self.workers[index] = worker
+
+    def _on_worker_exit(self, worker: _NodeWorker) -> None:
+        if not self._closed and self.workers[worker.index] is worker:
+            self.logger.warning(f"Worker Node {worker.index} encerrou; reiniciando")
+            self._schedule_restart(worker.index)
+
+    def _schedule_restart(self, index: int) -> None:
+        if index not in self._restarting:
+            self._restarting[index] = asyncio.create_task(self._restart(index))
+
+    async def _restart(self, index: int) -> None:
+        try:
+            old = self.workers[index]
+            self.workers[index] = None
+            if old is not None:
+                await old.close()
+            await self._spawn(index)
+            self.restarts += 1
+        except Exception as e:
+            # O monitor tenta de novo no próximo ciclo
+            self.logger.error(f"Erro ao reiniciar worker Node {index}: {str(e)}")
+        finally:
+            self._restarting.pop(index, None)
+
+    async def _monitor(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(self.ping_interval)
+            for index, worker in enumerate(self.workers):
+                if index in self._restarting:
+                    continue
+                if worker is None or not worker.alive:
+                    self._schedule_restart(index)
+                    continue
+                try:
+                    await worker.call("ping", {}, self.ping_timeout)
+                except Exception as e:
+                    self.logger.warning(f"Worker Node {index} não respondeu ao ping: {str(e)}")
+                    self._schedule_restart(index)
+
+    async def call(self, method: str, params: Dict[str, Any], timeout: Optional[float] = None) -> Any:
+        """Envia uma requisição ao worker vivo com menos chamadas em andamento (respeitando o prazo atual)."""
+        alive = [worker for worker in self.workers if worker is not None and worker.alive]
+        if not alive:
+            raise NodeWorkerError("Nenhum worker Node disponível")
+
+        worker = min(alive, key=lambda candidate: candidate.in_flight)
+        return await worker.call(method, params, remaining(timeout if timeout is not None else self.request_timeout))
+
+    async def route_request(
+        self,
+        message: str,
+        user_id: str,
+        session_id: str,
+        agent_name: Optional[str] = None,
+        shadow: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Processa uma mensagem no orquestrador TypeScript.
+
+        Args:
+            shadow: Chamada de tráfego sombra: o worker usa um histórico
+                descartável em vez do banco
+
+        Returns:
+            Dicionário com message e agent_name
+        """
+        params = {"message": message, "userId": user_id, "sessionId": session_id}
+        if agent_name:
+            params["agentName"] = agent_name
+        if shadow:
+            params["shadow"] = "true"
+        return await self.call("route", params)
+
+    async def ping(self) -> List[bool]:
+        """Pinga todos os workers (True para os que responderam)."""
+        async def one(worker: Optional[_NodeWorker]) -> bool:
+            if worker is None or not worker.alive:
+                return False
+            try:
+                await worker.call("ping", {}, self.ping_timeout)
+                return True
+            except Exception:
+                return False
+
+        return list(await asyncio.gather(*(one(worker) for worker in self.workers)))
+
+    async def aclose(self) -> None:
+        """Encerra o monitor e todos os workers."""
+        self._closed = True
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+        for task in list(self._restarting.values()):
+            task.cancel()
+        await asyncio.gather(*(worker.close() for worker in self.workers if worker is not None))
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna estado dos workers e reinícios."""
+        return {
+            "size": self.size,
+            "alive": sum(1 for worker in self.workers if worker is not None and worker.alive),
+            "restarts": self.restarts,
+            "workers": [worker.stats() for worker in self.workers if worker is not None]
+        }
+
+    async def health_check(self) -> Dict[str, Any]:
+        """Verifica a saúde do pool com um ping em cada worker."""
+        responses = await self.ping()
+        return {
+            "status": "healthy" if all(responses) else ("degraded" if any(responses) else "unhealthy"),
+            **self.stats()
+        }
@@ -0,0 +1,163 @@
+"""
+Cliente OpenAI compartilhado do FalaChefe Python.
+Um único pool de conexões HTTP, ajustado e aquecido, para Leo, Max, Lia e o classificador.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Coroutine, Dict, TypeVar
+
+import httpx
+from openai import DefaultHttpxClient, OpenAI
+
+
+T = TypeVar("T")
+
+
+class SharedOpenAIClient:
+    """
+    Cliente OpenAI único com pool de conexões configurável.
+
+    O Agent Squad chama o cliente de forma síncrona, então o compartilhado é
+    o ``OpenAI`` síncrono sobre um ``httpx.Client`` com limites de conexão e
+    keepalive próprios. Todos os agentes reaproveitam as mesmas conexões
+    aquecidas em vez de abrir um pool por agente.
+
+    Como essas chamadas bloqueiam, ``run``, ``call`` e ``stream`` as executam em
+    threads próprias (uma por conexão), fora do event loop: prazos, hedge e
+    as demais requisições seguem andando enquanto o LLM responde.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 60.0,
+        timeout: float = 60.0,
+        max_retries: int = 2
+    ):
+        """
+        Inicializa o cliente.
+
+        Args:
+            api_key: Chave da API OpenAI
+            max_connections: Conexões simultâneas com a API
+            max_keepalive_connections: Conexões ociosas mantidas abertas
+            keepalive_expiry: Segundos que uma conexão ociosa fica no pool
+            timeout: Timeout de cada chamada, em segundos
+            max_retries: Novas tentativas do SDK em falhas transitórias
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.requests = 0
+        self.responses = 0
+        self.status_errors = 0
+
+        self.http_client = DefaultHttpxClient(
+            limits=self.limits,
+            timeout=httpx.Timeout(timeout, connect=min(10.0, timeout)),
+            event_hooks={"request": [self._on_request], "response": [self._on_response]}
+        )
+        self.client = OpenAI(api_key=api_key, http_client=self.http_client, max_retries=max_retries)
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="openai")
+
+    async def run(self, call: Coroutine[Any, Any, T]) -> T:
+        """
+        Executa numa thread do pool uma corrotina que chama o SDK síncrono.
+
+        A corrotina roda num event loop próprio da thread, com uma cópia do
+        contexto atual (o prazo da requisição vai junto). Se quem aguarda
+        desistir, a chamada termina sozinha na thread, limitada pelo timeout.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, contextvars.copy_context().run, asyncio.run, call)
+
+    async def call(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Executa numa thread do pool uma chamada síncrona ao SDK (ex.: ``client.chat.completions.create``)."""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(function, *args, **kwargs)
+        return await loop.run_in_executor(self.executor, contextvars.copy_context().run, call)
+
+    async def stream(self, items: AsyncIterable[T]) -> AsyncIterator[T]:
+        """
+        Consome numa thread do pool um fluxo que bloqueia entre os itens (o streaming do SDK síncrono).
+
+        Cada item chega ao event loop assim que é lido; se o consumidor
+        desistir, a thread para no item seguinte.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        abandoned = threading.Event()
+
+        def put(kind: str, value: Any) -> None:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (kind, value))
+            except RuntimeError:
+                # Event loop já encerrado
+                abandoned.set()
+
+        async def drain() -> None:
+            async for item in items:
+                if abandoned.is_set():
+                    return
+                put("item", item)
+
+        def consume() -> None:
+            try:
+                asyncio.run(drain())
+                put("end", None)
+            except BaseException as e:
+                put("error", e)
+
+        loop.run_in_executor(self.executor, contextvars.copy_context().run, consume)
+        try:
+            while True:
+                kind, value = await queue.get()
+                if kind == "error":
+                    raise value
+                if kind == "end":
+                    return
+                yield value
+        finally:
+            abandoned.set()
+
+    def _on_request(self, request: Any) -> None:
+        self.requests += 1
+
+    def _on_response(self, response: Any) -> None:
+        self.responses += 1
+        if response.status_code >= 400:
+            self.status_errors += 1
+
+    def _connections(self) -> list:
+        pool = getattr(getattr(self.http_client, "_transport", None), "_pool", None)
+        return list(getattr(pool, "connections", []))
+
+    def close(self) -> None:
+        """Fecha as conexões e as threads do pool."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Ocupação do pool e contagem de chamadas."""
+        connections = self._connections()
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle,
+            "requests": self.requests,
+            "responses": self.responses,
+            "status_errors": self.status_errors
+        }
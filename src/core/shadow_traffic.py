@@ -0,0 +1,194 @@
+"""
+Tráfego sombra do FalaChefe Python.
+Espelha uma amostra das requisições no sistema de agentes inativo e compara latência e escolha de agente.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Dict, Optional, Set
+
+from ..utils.latency import LatencyTracker
+from ..utils.logger import get_component_logger
+
+
+class _Comparison:
+    """Comparação acumulada entre um sistema primário e seu sombra."""
+
+    def __init__(self):
+        self.primary = LatencyTracker()
+        self.shadow = LatencyTracker()
+        self.requests = 0
+        self.agreements = 0
+        self.agent_choices: Dict[str, int] = {}
+
+    def record(self, primary: Dict[str, Any], primary_seconds: float, shadow: Optional[Dict[str, Any]], shadow_seconds: float) -> None:
+        self.requests += 1
+        self.primary.record(primary_seconds, primary.get("success", True) is not False)
+        shadow_ok = shadow is not None and shadow.get("success", True) is not False
+        self.shadow.record(shadow_seconds, shadow_ok)
+        if not shadow_ok:
+            return
+
+        choice = f"{primary.get('agent_name', 'unknown')}/{shadow.get('agent_name', 'unknown')}"
+        self.agent_choices[choice] = self.agent_choices.get(choice, 0) + 1
+        if str(primary.get("agent_name", "")).lower() == str(shadow.get("agent_name", "")).lower():
+            self.agreements += 1
+
+    def report(self) -> Dict[str, Any]:
+        answered = sum(self.agent_choices.values())
+        return {
+            "requests": self.requests,
+            "primary_latency": self.primary.stats(),
+            "shadow_latency": self.shadow.stats(),
+            "agent_agreement": round(self.agreements / answered, 4) if answered else None,
+            "agent_choices": dict(self.agent_choices)
+        }
+
+
+class ShadowTraffic:
+    """
+    Espelhamento de requisições para o sistema inativo.
+
+    As chamadas sombra rodam em background e nunca atrasam nem derrubam a
+    resposta principal. Têm orçamento próprio: no máximo ``max_concurrency``
+    simultâneas e ``max_per_minute`` por minuto. Quando a carga principal
+    chega a ``load_threshold`` requisições (em andamento ou na fila), novas
+    chamadas sombra são recusadas e as que estão rodando são canceladas.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.0,
+        max_concurrency: int = 4,
+        max_per_minute: float = 60,
+        load_threshold: int = 16,
+        seed: Optional[int] = None
+    ):
+        """
+        Inicializa o espelhamento.
+
+        Args:
+            sample_rate: Fração das requisições espelhadas (0 desativa)
+            max_concurrency: Chamadas sombra simultâneas
+            max_per_minute: Chamadas sombra por minuto (limita o custo extra de LLM)
+            load_threshold: Requisições principais (em andamento ou na fila) a partir das quais o espelhamento pausa
+            seed: Semente da amostragem
+        """
+        self.sample_rate = sample_rate
+        self.max_concurrency = max_concurrency
+        self.max_per_minute = max_per_minute
+        self.load_threshold = load_threshold
+        self.logger = get_component_logger("shadow_traffic")
+
+        self._random = random.Random(seed)
+        self._tokens = float(max_per_minute)
+        self._refilled_at = time.monotonic()
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.mirrored = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.skipped = {"budget": 0, "concurrency": 0, "load": 0}
+        self.comparisons: Dict[str, _Comparison] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._refilled_at) * self.max_per_minute / 60, self.max_per_minute)
+        self._refilled_at = now
+
+    def admit(self, load: int) -> bool:
+        """
+        Decide se a requisição atual será espelhada.
+
+        Args:
+            load: Requisições principais em andamento ou na fila (incluindo a atual)
+        """
+        if not self.enabled or self._random.random() >= self.sample_rate:
+            return False
+
+        if load >= self.load_threshold:
+            self.skipped["load"] += 1
+            self.cancel_all()
+            return False
+        if len(self._tasks) >= self.max_concurrency:
+            self.skipped["concurrency"] += 1
+            return False
+
+        self._refill()
+        if self._tokens < 1:
+            self.skipped["budget"] += 1
+            return False
+
+        self._tokens -= 1
+        return True
+
+    def launch(self, call: Awaitable[Dict[str, Any]]) -> asyncio.Task:
+        """Inicia a chamada sombra em background e retorna a task (resultado, segundos)."""
+        self.mirrored += 1
+        task = asyncio.create_task(self._run(call))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, call: Awaitable[Dict[str, Any]]):
+        started = time.perf_counter()
+        try:
+            result = await call
+            return result, time.perf_counter() - started
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        except Exception as e:
+            self.logger.info(f"Chamada sombra falhou: {str(e)}")
+            return None, time.perf_counter() - started
+
+    def compare(
+        self,
+        task: asyncio.Task,
+        primary_system: str,
+        shadow_system: str,
+        primary_result: Dict[str, Any],
+        primary_seconds: float
+    ) -> None:
+        """Registra a comparação quando a chamada sombra terminar (sem esperar por ela)."""
+        def record(done: asyncio.Task) -> None:
+            if done.cancelled():
+                return
+            shadow_result, shadow_seconds = done.result()
+            if shadow_result is None or shadow_result.get("success", True) is False:
+                self.failed += 1
+            else:
+                self.completed += 1
+            key = f"{primary_system}->{shadow_system}"
+            self.comparisons.setdefault(key, _Comparison()).record(
+                primary_result, primary_seconds, shadow_result, shadow_seconds
+            )
+
+        task.add_done_callback(record)
+
+    def cancel_all(self) -> int:
+        """Cancela todas as chamadas sombra em andamento."""
+        running = [task for task in self._tasks if not task.done()]
+        for task in running:
+            task.cancel()
+        return len(running)
+
+    def report(self) -> Dict[str, Any]:
+        """Relatório lado a lado de latência e escolha de agente por par de sistemas."""
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "running": len(self._tasks),
+            "mirrored": self.mirrored,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "skipped": dict(self.skipped),
+            "comparisons": {key: comparison.report() for key, comparison in self.comparisons.items()}
+        }
@@ -0,0 +1,62 @@
+"""
+Respostas streaming do FalaChefe Python.
+Eventos repassados pelos orquestradores à medida que o agente responde, e o coletor da versão em bloco.
+"""
+
+from typing import Any, AsyncIterable, Dict, List
+
+
+# Tipos de evento: trechos da resposta e o evento final com os metadados
+CHUNK = "chunk"
+DONE = "done"
+
+
+def chunk_event(text: str, agent_name: str) -> Dict[str, Any]:
+    """Trecho da resposta do agente."""
+    return {"type": CHUNK, "text": text, "agent_name": agent_name}
+
+
+def done_event(**fields: Any) -> Dict[str, Any]:
+    """
+    Evento final do fluxo (sempre o último).
+
+    Carrega os mesmos campos do resultado em bloco, sem ``message``, exceto
+    em falhas, quando ``message`` traz a resposta de fallback que substitui
+    os trechos já enviados.
+    """
+    return {"type": DONE, **fields}
+
+
+class StreamCollector:
+    """Acumula os eventos de um fluxo e monta o resultado em bloco, juntando os trechos uma única vez."""
+
+    def __init__(self):
+        self.chunks: List[str] = []
+        self.done: Dict[str, Any] = {}
+
+    def add(self, event: Dict[str, Any]) -> None:
+        if event.get("type") == CHUNK:
+            self.chunks.append(event["text"])
+        else:
+            self.done = event
+
+    def result(self) -> Dict[str, Any]:
+        result = {"message": "".join(self.chunks)}
+        result.update((key, value) for key, value in self.done.items() if key != "type")
+        return result
+
+
+async def collect_stream(events: AsyncIterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Consome um fluxo de eventos e retorna o resultado em bloco.
+
+    Args:
+        events: Eventos de ``stream_message``
+
+    Returns:
+        Resultado no formato de ``process_message``
+    """
+    collector = StreamCollector()
+    async for event in events:
+        collector.add(event)
+    return collector.result()
@@ -0,0 +1,225 @@
+"""
+Categorização de transações do FalaChefe Python.
+Regras de palavras-chave e regex compiladas em um único matcher, aplicadas a lotes de descrições.
+"""
+
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .financial_loader import EXPENSE_TYPES, INCOME_TYPES, _normalize
+from ..utils.cache import TTLCache
+
+
+INCOME = "receita"
+EXPENSE = "despesa"
+FALLBACK_CATEGORIES = {INCOME: "Outras Receitas", EXPENSE: "Outras Despesas"}
+
+
+@dataclass(frozen=True)
+class CategoryRule:
+    """Regra de categorização: palavras-chave e/ou regex (já sem acentos, minúsculas)."""
+
+    category: str
+    type: str
+    keywords: Tuple[str, ...] = ()
+    patterns: Tuple[str, ...] = ()
+
+
+# Categorias padrão do app (mesmas de categorization-service.ts), com padrões comuns de extratos PIX e cartão
+DEFAULT_RULES = (
+    CategoryRule("Vendas", INCOME, ("venda", "vendas", "cliente", "produto", "mercadoria"),
+                 (r"pix recebido", r"ted recebida", r"credito (de )?vendas?", r"antecipacao", r"stone|cielo|getnet|pagseguro|mercado pago|sumup")),
+    CategoryRule("Serviços", INCOME, ("servico", "servicos", "consultoria", "atendimento", "suporte"), ()),
+    CategoryRule("Outras Receitas", INCOME, ("rendimento", "estorno", "reembolso", "cashback"), ()),
+    CategoryRule("Fornecedores", EXPENSE, ("fornecedor", "fornecedores", "compra", "materia-prima", "materia prima", "insumo", "insumos"),
+                 (r"atacad\w*", r"distribuidora")),
+    CategoryRule("Marketing", EXPENSE, ("marketing", "publicidade", "propaganda", "anuncio", "campanha"),
+                 (r"meta ads|facebk|facebook|google ads|instagram|tiktok ads",)),
+    CategoryRule("Operacionais", EXPENSE, ("operacional", "operacao", "manutencao", "reparo", "equipamento"), ()),
+    CategoryRule("Combustível", EXPENSE, ("combustivel", "gasolina", "diesel", "posto", "abastecimento", "etanol"),
+                 (r"shell|ipiranga|petrobras|br mania",)),
+    CategoryRule("Alimentação", EXPENSE, ("alimentacao", "comida", "restaurante", "lanche", "refeicao", "padaria"),
+                 (r"ifood|rappi|ze delivery",)),
+    CategoryRule("Transporte", EXPENSE, ("transporte", "uber", "taxi", "onibus", "passagem", "estacionamento", "pedagio"),
+                 (r"99 ?(app|pop|taxi)", r"sem parar|conectcar")),
+    CategoryRule("Telefone", EXPENSE, ("telefone", "celular", "internet", "dados", "plano"),
+                 (r"\b(claro|vivo|tim|oi)\b",)),
+    CategoryRule("Energia", EXPENSE, ("energia", "luz", "eletricidade", "conta de luz"),
+                 (r"cemig|enel|light|copel|celesc|cpfl|coelba|celpe|equatorial",)),
+    CategoryRule("Água", EXPENSE, ("agua", "saneamento", "conta de agua"),
+                 (r"sabesp|cedae|copasa|sanepar|embasa|compesa|caesb",)),
+    CategoryRule("Aluguel", EXPENSE, ("aluguel", "locacao", "imovel", "escritorio", "condominio"), ())
+)
+
+# Sequências de dígitos (ids, datas, valores) não influenciam a categoria: viram "#" na chave de cache
+_DIGITS = re.compile(r"\d+")
+
+
+def normalize_description(description: Any) -> str:
+    """Normaliza uma descrição para casamento e cache (sem acentos, minúsculas, dígitos mascarados)."""
+    return _DIGITS.sub("#", " ".join(_normalize(description).split()))
+
+
+class _CompiledMatcher:
+    """Todas as regras de um tipo em uma única regex com um grupo nomeado por regra."""
+
+    def __init__(self, rules: Sequence[CategoryRule]):
+        self.rules = list(rules)
+        alternatives = []
+        for index, rule in enumerate(self.rules):
+            terms = [re.escape(keyword) for keyword in rule.keywords] + list(rule.patterns)
+            if terms:
+                alternatives.append(f"(?P<r{index}>\\b(?:{'|'.join(terms)}))")
+        self.regex = re.compile("|".join(alternatives)) if alternatives else None
+
+    def match(self, text: str) -> Tuple[Optional[int], int, Optional[str]]:
+        """
+        Varre o texto uma vez e escolhe a regra com mais ocorrências.
+
+        Returns:
+            (índice da regra, ocorrências, primeiro termo casado); empate fica com a regra declarada antes
+        """
+        if self.regex is None:
+            return None, 0, None
+
+        scores: Dict[int, int] = {}
+        terms: Dict[int, str] = {}
+        for found in self.regex.finditer(text):
+            index = int(found.lastgroup[1:])
+            scores[index] = scores.get(index, 0) + 1
+            terms.setdefault(index, found.group())
+        if not scores:
+            return None, 0, None
+
+        best = min(scores, key=lambda index: (-scores[index], index))
+        return best, scores[best], terms[best]
+
+
+class TransactionCategorizer:
+    """
+    Categorizador de transações em lote.
+
+    As regras de cada tipo (receita/despesa) são compiladas em uma única regex
+    com alternativas nomeadas, então cada descrição é varrida uma vez só. Em
+    um lote, apenas as descrições distintas (após normalização) são avaliadas,
+    e os resultados ficam em um cache LRU compartilhado entre lotes.
+    """
+
+    def __init__(self, rules: Optional[Iterable[CategoryRule]] = None, cache_size: int = 100000):
+        """Compila as regras e inicializa o cache."""
+        self.rules = tuple(rules if rules is not None else DEFAULT_RULES)
+        self.matchers = {
+            kind: _CompiledMatcher([rule for rule in self.rules if rule.type == kind])
+            for kind in (INCOME, EXPENSE)
+        }
+        self.cache = TTLCache(max_size=cache_size)
+
+        self.descriptions_processed = 0
+        self.descriptions_evaluated = 0
+        self.elapsed_seconds = 0.0
+
+    def _evaluate(self, kind: str, text: str) -> Tuple[str, float, Optional[str]]:
+        """Categoria, confiança e termo que decidiu a regra de uma descrição normalizada."""
+        cached = self.cache.get((kind, text))
+        if cached is not None:
+            return cached
+
+        matcher = self.matchers[kind]
+        index, score, term = matcher.match(text)
+        if index is None:
+            result = (FALLBACK_CATEGORIES[kind], 0.0, None)
+        else:
+            # Mesma normalização de confiança do serviço TypeScript
+            result = (matcher.rules[index].category, round(min(score / 3, 1.0), 4), term)
+
+        self.cache.set((kind, text), result)
+        self.descriptions_evaluated += 1
+        return result
+
+    @staticmethod
+    def _resolve_types(count: int, types: Optional[Sequence[Any]], amounts: Optional[Sequence[float]]) -> np.ndarray:
+        """Tipo de cada transação: coluna de tipo, senão sinal do valor (padrão: despesa)."""
+        kinds = np.full(count, EXPENSE, dtype=object)
+        if amounts is not None:
+            kinds[np.asarray(pd.to_numeric(pd.Series(amounts), errors="coerce").fillna(-1.0)) > 0] = INCOME
+        if types is not None:
+            codes, uniques = pd.factorize(pd.Series(types).astype(str))
+            normalized = np.array([_normalize(value) for value in uniques] or [""], dtype=object)
+            mapped = np.where(np.isin(normalized, list(INCOME_TYPES)), INCOME,
+                              np.where(np.isin(normalized, list(EXPENSE_TYPES)), EXPENSE, ""))[codes]
+            kinds = np.where(mapped != "", mapped, kinds)
+        return kinds
+
+    def categorize(
+        self,
+        descriptions: Sequence[Any],
+        types: Optional[Sequence[Any]] = None,
+        amounts: Optional[Sequence[float]] = None
+    ) -> pd.DataFrame:
+        """
+        Categoriza um lote de descrições.
+
+        Args:
+            descriptions: Descrições das transações
+            types: Tipo de cada transação (receita/despesa, entrada/saída...)
+            amounts: Valores; usados para inferir o tipo quando ``types`` não é informado
+
+        Returns:
+            DataFrame com category, type, confidence e matched_term (None quando nenhuma regra casou)
+        """
+        start = time.perf_counter()
+        descriptions = pd.Series(descriptions).fillna("").astype(str)
+        kinds = self._resolve_types(len(descriptions), types, amounts)
+
+        # Mascara dígitos no lote inteiro (ids e valores distintos colapsam na mesma
+        # descrição), normaliza só as distintas e avalia só pares (tipo, descrição) distintos
+        masked_codes, masked_uniques = pd.factorize(descriptions.str.replace(_DIGITS.pattern, "#", regex=True))
+        normalized_codes, normalized_uniques = pd.factorize(
+            pd.Series([normalize_description(value) for value in masked_uniques], dtype=object)
+        )
+        text_codes = normalized_codes[masked_codes].astype(np.int64)
+        key_codes, unique_keys = pd.factorize(text_codes * 2 + (kinds == INCOME))
+
+        evaluated = [
+            self._evaluate(INCOME if key % 2 else EXPENSE, normalized_uniques[key // 2])
+            for key in unique_keys
+        ] or [(FALLBACK_CATEGORIES[EXPENSE], 0.0, None)]
+
+        result = pd.DataFrame({
+            "category": np.array([item[0] for item in evaluated], dtype=object)[key_codes],
+            "type": kinds,
+            "confidence": np.array([item[1] for item in evaluated], dtype=np.float64)[key_codes],
+            "matched_term": np.array([item[2] for item in evaluated], dtype=object)[key_codes]
+        }, index=descriptions.index)
+
+        self.descriptions_processed += len(descriptions)
+        self.elapsed_seconds += time.perf_counter() - start
+        return result
+
+    def categorize_one(self, description: str, type: Optional[str] = None, amount: Optional[float] = None) -> Dict[str, Any]:
+        """Categoriza uma única transação (atalho para ``categorize``)."""
+        row = self.categorize(
+            [description],
+            types=None if type is None else [type],
+            amounts=None if amount is None else [amount]
+        ).iloc[0]
+        return row.to_dict()
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna volume processado, throughput e uso do cache."""
+        elapsed = self.elapsed_seconds
+        return {
+            "rules": len(self.rules),
+            "descriptions_processed": self.descriptions_processed,
+            "descriptions_evaluated": self.descriptions_evaluated,
+            "elapsed_seconds": round(elapsed, 4),
+            "descriptions_per_second": round(self.descriptions_processed / elapsed, 1) if elapsed else 0.0,
+            # Cada descrição equivale a testar todas as regras (via regex combinada ou cache)
+            "rule_evaluations_per_second": round(self.descriptions_processed * len(self.rules) / elapsed, 1) if elapsed else 0.0,
+            "cache": self.cache.stats()
+        }
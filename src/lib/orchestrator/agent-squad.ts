@@ -1,4 +1,6 @@
 import { AgentSquad, OpenAIClassifier } from "agent-squad";
+import { ChatStorage } from "agent-squad/dist/storage/chatStorage";
+import { ConversationMessage } from "agent-squad/dist/types";
 
 import { DrizzleChatStorage } from "./drizzle-storage";
 import { extractAgentMessage } from "./response";
@@ -7,12 +9,27 @@ import { createMaxOpenAIAgent } from "@/agents/squad/max-openai-agent";
 import { createLiaOpenAIAgent } from "@/agents/squad/lia-openai-agent";
 
 let orchestratorSingleton: AgentSquad | null = null;
+let shadowOrchestratorSingleton: AgentSquad | null = null;
 
-export function getOrchestrator(): AgentSquad {
-  if (orchestratorSingleton) return orchestratorSingleton;
+/**
+ * Histórico descartável do tráfego sombra: nada é gravado, então as
+ * chamadas sombra não tocam o banco nem acumulam memória no worker
+ */
+class ShadowChatStorage extends ChatStorage {
+  async saveChatMessage(): Promise<ConversationMessage[]> {
+    return [];
+  }
 
-  const storage = new DrizzleChatStorage();
+  async fetchChat(): Promise<ConversationMessage[]> {
+    return [];
+  }
 
+  async fetchAllChats(): Promise<ConversationMessage[]> {
+    return [];
+  }
+}
+
+function createOrchestrator(storage: ChatStorage): AgentSquad {
   const classifier = new OpenAIClassifier({
     apiKey: process.env.OPENAI_API_KEY || "",
   });
@@ -37,10 +54,27 @@ export function getOrchestrator(): AgentSquad {
   orchestrator.addAgent(lia);
   orchestrator.setDefaultAgent(max);
 
-  orchestratorSingleton = orchestrator;
+  return orchestrator;
+}
+
+export function getOrchestrator(): AgentSquad {
+  if (!orchestratorSingleton) {
+    orchestratorSingleton = createOrchestrator(new DrizzleChatStorage());
+  }
   return orchestratorSingleton;
 }
 
+/**
+ * Orquestrador do tráfego sombra (comparação com o sistema Python): mesmos
+ * agentes, sem histórico persistido
+ */
+export function getShadowOrchestrator(): AgentSquad {
+  if (!shadowOrchestratorSingleton) {
+    shadowOrchestratorSingleton = createOrchestrator(new ShadowChatStorage());
+  }
+  return shadowOrchestratorSingleton;
+}
+
 /**
  * Processa uma mensagem com um agente específico
  */
@@ -48,9 +82,9 @@ export async function processMessageWithSpecificAgent(
   message: string,
   userId: string,
   sessionId: string,
-  agentName: "leo" | "max" | "lia"
+  agentName: "leo" | "max" | "lia",
+  orchestrator: AgentSquad = getOrchestrator()
 ) {
-  const orchestrator = getOrchestrator();
 
   // Usar o orquestrador para processar a mensagem
   const response = await orchestrator.routeRequest(message, userId, sessionId);
@@ -0,0 +1,136 @@
+"""
+Caches em memória do FalaChefe Python.
+Fornece um cache LRU limitado com expiração opcional por TTL e hashes estáveis de conteúdo.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+
+class TTLCache:
+    """
+    Cache LRU com tamanho máximo e TTL opcional.
+
+    Seguro para uso entre threads (ex.: parsing em ``asyncio.to_thread``).
+    """
+
+    _MISSING = object()
+
+    def __init__(self, max_size: int = 128, ttl_seconds: Optional[float] = None):
+        """Inicializa o cache."""
+        if max_size <= 0:
+            raise ValueError("max_size deve ser positivo")
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retorna o valor em cache ou ``default`` se ausente/expirado."""
+        with self._lock:
+            entry = self._entries.get(key, self._MISSING)
+            if entry is self._MISSING:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Armazena um valor, removendo o item menos usado se necessário."""
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove e retorna um valor do cache."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        """Remove todos os itens do cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, self._MISSING) is not self._MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas de uso do cache."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+
+def _without_keys(value: Any, excluded: frozenset) -> Any:
+    """Remove recursivamente as chaves ``excluded`` de dicionários aninhados."""
+    if isinstance(value, dict):
+        return {str(key): _without_keys(item, excluded) for key, item in value.items() if key not in excluded}
+    if isinstance(value, (list, tuple)):
+        return [_without_keys(item, excluded) for item in value]
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    # Escalares NumPy/pandas viram tipos nativos; o resto vira texto
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def content_hash(value: Any, exclude_keys: Iterable[str] = ("timestamp",)) -> str:
+    """
+    Hash SHA-256 estável de uma estrutura JSON-like.
+
+    A ordem das chaves não importa e campos voláteis (como ``timestamp``) são
+    ignorados, então o mesmo conteúdo sempre gera o mesmo hash.
+
+    Args:
+        value: Dicionários, listas e escalares
+        exclude_keys: Chaves ignoradas em qualquer nível
+
+    Returns:
+        Hash hexadecimal
+    """
+    canonical = json.dumps(
+        _without_keys(value, frozenset(exclude_keys)),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_json_default
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
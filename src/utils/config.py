@@ -16,6 +16,10 @@ class Config(BaseSettings):
     # OpenAI Configuration
     openai_api_key: str = Field(..., env="OPENAI_API_KEY")
     openai_model: str = Field("gpt-4-turbo-preview", env="OPENAI_MODEL")
+    openai_max_connections: int = Field(20, env="OPENAI_MAX_CONNECTIONS")  # pool único de todos os agentes
+    openai_max_keepalive_connections: int = Field(10, env="OPENAI_MAX_KEEPALIVE_CONNECTIONS")  # conexões mantidas aquecidas
+    openai_keepalive_expiry: float = Field(60.0, env="OPENAI_KEEPALIVE_EXPIRY")  # segundos de uma conexão ociosa no pool
+    openai_request_timeout: float = Field(60.0, env="OPENAI_REQUEST_TIMEOUT")
     
     # Supabase Configuration
     supabase_url: str = Field(..., env="SUPABASE_URL")
@@ -36,6 +40,18 @@ class Config(BaseSettings):
     agent_leo_financial_enabled: bool = Field(True, env="AGENT_LEO_FINANCIAL_ENABLED")
     agent_max_marketing_enabled: bool = Field(True, env="AGENT_MAX_MARKETING_ENABLED")
     agent_lia_hr_enabled: bool = Field(True, env="AGENT_LIA_HR_ENABLED")
+    agent_model: str = Field("gpt-3.5-turbo", env="AGENT_MODEL")  # modelo de Leo, Max e Lia
+    agent_max_tokens: int = Field(800, env="AGENT_MAX_TOKENS")
+    local_classifier_enabled: bool = Field(True, env="LOCAL_CLASSIFIER_ENABLED")  # pré-classificação sem LLM
+    local_classifier_threshold: float = Field(0.75, env="LOCAL_CLASSIFIER_THRESHOLD")  # confiança mínima para dispensar o LLM
+    local_classifier_audit_rate: float = Field(0.02, env="LOCAL_CLASSIFIER_AUDIT_RATE")  # fração desviada conferida pelo LLM
+    chat_history_backend: str = Field("memory", env="CHAT_HISTORY_BACKEND")  # memory ou sqlite
+    chat_history_path: str = Field("data/chat_history.db", env="CHAT_HISTORY_PATH")
+    chat_history_max_turns: int = Field(6, env="CHAT_HISTORY_MAX_TURNS")  # trocas mantidas literalmente; o resto vira resumo
+    chat_history_token_budget: int = Field(2000, env="CHAT_HISTORY_TOKEN_BUDGET")  # tokens de histórico por sessão/agente
+    chat_history_max_sessions: int = Field(10000, env="CHAT_HISTORY_MAX_SESSIONS")
+    chat_history_idle_ttl: int = Field(3600, env="CHAT_HISTORY_IDLE_TTL")  # segundos sem acesso até descartar a sessão
+    chat_history_summary_model: str = Field("gpt-3.5-turbo", env="CHAT_HISTORY_SUMMARY_MODEL")
     
     # Financial APIs
     alpha_vantage_api_key: Optional[str] = Field(None, env="ALPHA_VANTAGE_API_KEY")
@@ -51,6 +67,29 @@ class Config(BaseSettings):
     max_concurrent_jobs: int = Field(5, env="MAX_CONCURRENT_JOBS")
     batch_size: int = Field(100, env="BATCH_SIZE")
     processing_timeout: int = Field(300, env="PROCESSING_TIMEOUT")  # 5 minutes
+    conversation_cache_size: int = Field(10000, env="CONVERSATION_CACHE_SIZE")  # conversas em memória
+    conversation_store_size: int = Field(100000, env="CONVERSATION_STORE_SIZE")  # conversas no store colunar (reconhece regravações nas janelas e tópicos)
+    
+    # Agent Systems (TypeScript / Python)
+    startup_timeout: int = Field(30, env="STARTUP_TIMEOUT")  # espera máxima de uma requisição pela inicialização
+    prewarm_fallback_system: bool = Field(False, env="PREWARM_FALLBACK_SYSTEM")  # no modo AUTO, habilita o roteamento entre os dois (hedge e sombra já carregam os dois)
+    hedging_enabled: bool = Field(False, env="HEDGING_ENABLED")  # repete no outro sistema quando o primário passa do p95
+    hedge_budget: float = Field(0.05, env="HEDGE_BUDGET")  # fração máxima de requisições extras
+    node_worker_command: str = Field("npx tsx scripts/agent-squad-worker.ts", env="NODE_WORKER_COMMAND")
+    node_workers: int = Field(2, env="NODE_WORKERS")  # processos Node do orquestrador TypeScript
+    shadow_sample_rate: float = Field(0.0, env="SHADOW_SAMPLE_RATE")  # fração espelhada no sistema inativo
+    shadow_max_concurrency: int = Field(4, env="SHADOW_MAX_CONCURRENCY")
+    shadow_max_per_minute: int = Field(60, env="SHADOW_MAX_PER_MINUTE")  # limita o custo extra de LLM
+    shadow_load_threshold: int = Field(16, env="SHADOW_LOAD_THRESHOLD")  # requisições em andamento/na fila que pausam o espelhamento
+    admission_max_in_flight: int = Field(32, env="ADMISSION_MAX_IN_FLIGHT")  # mensagens processadas ao mesmo tempo
+    admission_max_queue: int = Field(64, env="ADMISSION_MAX_QUEUE")  # acima disso, resposta de alta demanda
+    admission_queue_timeout: float = Field(5.0, env="ADMISSION_QUEUE_TIMEOUT")  # espera máxima na fila (segundos)
+    
+    # Financial Data Loading
+    financial_cache_dir: str = Field(".cache/financial", env="FINANCIAL_CACHE_DIR")
+    financial_chunk_size: int = Field(100000, env="FINANCIAL_CHUNK_SIZE")  # linhas por bloco
+    report_cache_size: int = Field(256, env="REPORT_CACHE_SIZE")  # relatórios em memória
+    report_cache_ttl_seconds: int = Field(300, env="REPORT_CACHE_TTL_SECONDS")
     
     # Security
     jwt_secret: Optional[str] = Field(None, env="JWT_SECRET")
@@ -82,30 +121,44 @@ class Config(BaseSettings):
         log_dir = Path(self.log_file).parent
         log_dir.mkdir(parents=True, exist_ok=True)
     
-    def get_agent_config(self, agent_name: str) -> Dict[str, Any]:
-        """Retorna configuração específica de um agente."""
-        agent_configs = {
+    def get_agent_configs(self) -> Dict[str, Dict[str, Any]]:
+        """Retorna a definição de todos os agentes (incluindo os desativados)."""
+        return {
             "leo": {
                 "enabled": self.agent_leo_financial_enabled,
                 "specialization": "financial",
+                "description": "Mentor financeiro experiente e confiável. Ajuda a entender números, evitar erros financeiros e planejar o caixa.",
+                "model": self.agent_model,
+                "temperature": 0.4,  # Respostas precisas
+                "max_tokens": self.agent_max_tokens,
                 "max_processing_time": 300,
                 "memory_retention_days": 30
             },
             "max": {
                 "enabled": self.agent_max_marketing_enabled,
                 "specialization": "marketing",
+                "description": "Especialista em marketing e vendas. Ajuda a criar campanhas, gerar leads e aumentar vendas.",
+                "model": self.agent_model,
+                "temperature": 0.6,  # Criatividade moderada
+                "max_tokens": self.agent_max_tokens,
                 "max_processing_time": 180,
                 "memory_retention_days": 14
             },
             "lia": {
                 "enabled": self.agent_lia_hr_enabled,
                 "specialization": "hr",
+                "description": "Especialista em recursos humanos. Ajuda com gestão de pessoas, processos de RH e desenvolvimento de equipe.",
+                "model": self.agent_model,
+                "temperature": 0.5,  # Equilíbrio entre precisão e empatia
+                "max_tokens": self.agent_max_tokens,
                 "max_processing_time": 240,
                 "memory_retention_days": 90
             }
         }
-        
-        return agent_configs.get(agent_name, {})
+    
+    def get_agent_config(self, agent_name: str) -> Dict[str, Any]:
+        """Retorna configuração específica de um agente."""
+        return self.get_agent_configs().get(agent_name, {})
     
     def get_database_config(self) -> Dict[str, Any]:
         """Retorna configuração do banco de dados."""
@@ -0,0 +1,154 @@
+"""
+Prazos de requisição do FalaChefe Python.
+Um deadline por requisição, propagado por contextvars entre as camadas (e para tasks filhas).
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterable, AsyncIterator, Awaitable, Iterator, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+# Resposta rápida quando o prazo acaba antes do agente responder
+TIMEOUT_REPLY = "Desculpe, estou demorando mais que o normal para responder. Pode tentar novamente em instantes?"
+
+# Instante-limite (time.monotonic) da requisição atual; None = sem prazo
+_deadline: ContextVar[Optional[float]] = ContextVar("falachefe_deadline", default=None)
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """O prazo da requisição acabou antes de a operação terminar."""
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """
+    Define o prazo da requisição atual.
+
+    Escopos aninhados só podem encurtar o prazo: o limite efetivo é o menor
+    entre o prazo herdado e ``seconds`` a partir de agora.
+
+    Args:
+        seconds: Orçamento em segundos (None mantém o prazo herdado)
+
+    Yields:
+        Instante-limite efetivo (time.monotonic) ou None
+    """
+    current = _deadline.get()
+    if seconds is not None:
+        candidate = time.monotonic() + seconds
+        current = candidate if current is None else min(current, candidate)
+
+    token = _deadline.set(current)
+    try:
+        yield current
+    finally:
+        _deadline.reset(token)
+
+
+def remaining(cap: Optional[float] = None) -> Optional[float]:
+    """
+    Segundos que ainda restam no prazo atual.
+
+    Args:
+        cap: Limite próprio da etapa (ex.: ``max_processing_time`` do agente)
+
+    Returns:
+        O menor entre o tempo restante e ``cap`` (None quando não há nenhum dos dois)
+    """
+    deadline = _deadline.get()
+    left = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+    if cap is None:
+        return left
+    return cap if left is None else min(left, cap)
+
+
+def expired() -> bool:
+    """Indica se o prazo atual já acabou."""
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def call_timeout(cap: float) -> float:
+    """
+    Timeout de uma chamada externa: o que resta do prazo, limitado a ``cap``.
+
+    Clientes HTTP tratam 0 como "sem timeout", então um prazo já esgotado
+    levanta ``DeadlineExceeded`` em vez de virar um timeout zero.
+
+    Args:
+        cap: Timeout próprio da chamada, em segundos
+    """
+    if expired():
+        raise DeadlineExceeded("Prazo da requisição esgotado")
+    return remaining(cap)
+
+
+async def with_deadline(awaitable: Awaitable[T], cap: Optional[float] = None) -> T:
+    """
+    Aguarda ``awaitable`` usando o tempo restante como timeout.
+
+    Se o prazo acabar, a operação é cancelada e ``DeadlineExceeded`` é levantada.
+
+    Args:
+        awaitable: Operação a aguardar
+        cap: Limite próprio da etapa, aplicado junto com o prazo da requisição
+    """
+    timeout = remaining(cap)
+    if timeout is not None and timeout <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded("Prazo da requisição esgotado")
+
+    started = time.monotonic()
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError as e:
+        # Timeouts próprios da operação (antes do prazo) seguem como estão
+        if isinstance(e, DeadlineExceeded) or timeout is None or time.monotonic() - started < timeout:
+            raise
+        raise DeadlineExceeded(f"Prazo da requisição esgotado após {timeout:.2f}s") from e
+
+
+async def stream_with_deadline(
+    iterable: AsyncIterable[T],
+    cap: Optional[float] = None,
+    until: Optional[float] = None
+) -> AsyncIterator[T]:
+    """
+    Itera ``iterable`` repassando cada item assim que chega, dentro do prazo.
+
+    Cada passo roda sob o prazo restante (o do contexto de quem consome, o
+    limite ``until`` e ``cap`` contado a partir do início), então as chamadas
+    feitas pelo produtor também enxergam o prazo. Se ele acabar, o produtor é
+    cancelado e ``DeadlineExceeded`` é levantada.
+
+    Args:
+        iterable: Fluxo a repassar
+        cap: Limite próprio da iteração inteira, em segundos
+        until: Instante-limite (time.monotonic) fixado antes, ex.: por ``deadline_scope``
+    """
+    stop = None if cap is None else time.monotonic() + cap
+    if until is not None:
+        stop = until if stop is None else min(stop, until)
+
+    iterator = iterable.__aiter__()
+    try:
+        while True:
+            left = remaining(None if stop is None else max(stop - time.monotonic(), 0.0))
+            if left is not None and left <= 0:
+                raise DeadlineExceeded("Prazo da requisição esgotado")
+            try:
+                # O escopo cobre só o passo: um contextvar não pode atravessar o yield
+                with deadline_scope(left):
+                    item = await with_deadline(iterator.__anext__())
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,95 @@
+"""
+Métricas de latência do FalaChefe Python.
+Média móvel exponencial, percentis e taxa de erro sobre as chamadas mais recentes.
+"""
+
+import math
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class LatencyTracker:
+    """
+    Latência e taxa de erro de um backend.
+
+    A média exponencial (EWMA) reage rápido a mudanças; o p95 e a taxa de
+    erro são calculados sobre as ``window`` chamadas mais recentes, então
+    falhas antigas deixam de pesar sozinhas. Chamadas abandonadas (censuradas)
+    só entram no p95: não contam como sucesso nem como erro.
+    """
+
+    def __init__(self, window: int = 256, alpha: float = 0.2):
+        """Inicializa o rastreador vazio."""
+        if window <= 0:
+            raise ValueError("window deve ser positivo")
+
+        self.window = window
+        self.alpha = alpha
+
+        # (latência em segundos, sucesso) das chamadas mais recentes; sucesso
+        # None marca uma chamada censurada
+        self._samples: "deque[tuple]" = deque(maxlen=window)
+        self.ewma: Optional[float] = None
+        self.count = 0
+        self.errors = 0
+        self.censored = 0
+
+    def record(self, seconds: float, success: bool = True) -> None:
+        """Registra uma chamada (a latência de falhas não entra na média)."""
+        self.count += 1
+        self._samples.append((seconds, success))
+
+        if not success:
+            self.errors += 1
+            return
+
+        self.ewma = seconds if self.ewma is None else self.alpha * seconds + (1 - self.alpha) * self.ewma
+
+    def record_censored(self, seconds: float) -> None:
+        """
+        Registra uma chamada abandonada após ``seconds`` (ex.: o perdedor de um hedge).
+
+        A latência real é de pelo menos ``seconds``; entra no p95 com esse
+        valor, para ele não ficar otimista só porque as chamadas lentas foram
+        canceladas. Fica fora da EWMA, de ``count`` e da taxa de erro, que o
+        roteamento AUTO lê como resultado de chamadas concluídas.
+        """
+        self.censored += 1
+        self._samples.append((seconds, None))
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Percentil ``q`` (0-100) da latência das chamadas recentes com sucesso (ou censuradas)."""
+        latencies = sorted(seconds for seconds, success in self._samples if success is not False)
+        if not latencies:
+            return None
+
+        # Nearest-rank: sempre um valor observado
+        rank = max(math.ceil(q / 100 * len(latencies)), 1)
+        return latencies[rank - 1]
+
+    @property
+    def p95(self) -> Optional[float]:
+        return self.percentile(95)
+
+    @property
+    def error_rate(self) -> float:
+        """Fração de falhas nas chamadas recentes concluídas."""
+        outcomes = [success for _, success in self._samples if success is not None]
+        if not outcomes:
+            return 0.0
+        return outcomes.count(False) / len(outcomes)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna as métricas atuais (latências em segundos)."""
+        p95 = self.p95
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "censored": self.censored,
+            "ewma_seconds": round(self.ewma, 4) if self.ewma is not None else None,
+            "p95_seconds": round(p95, 4) if p95 is not None else None,
+            "error_rate": round(self.error_rate, 4)
+        }
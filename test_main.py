@@ -7,11 +7,12 @@ Suite de testes para validar funcionalidades do Agent Squad Framework Python.
 import pytest
 import asyncio
 import json
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from datetime import datetime
 
 # Importa o módulo principal
 from main import FalaChefePython
+from src.utils.config import Config
 
 
 class TestFalaChefePython:
@@ -34,13 +35,27 @@ class TestFalaChefePython:
     @pytest.fixture
     def falachefe(self, mock_config):
         """Instância do FalaChefePython para testes."""
-        with patch('main.FalaChefeAgentSquadOrchestrator'), \
-             patch('main.DataProcessor'), \
-             patch('main.FalaChefeAPIClient'), \
-             patch('main.ConversationAnalyzer'), \
-             patch('main.BusinessAutomation'):
+        mock_config.processing_timeout = 30
+        mock_config.prewarm_fallback_system = False
+        with patch('main.Config', return_value=mock_config), \
+             patch('main.setup_logger'), \
+             patch('main.HybridOrchestrator', autospec=True), \
+             patch('main.DataProcessor', autospec=True), \
+             patch('main.FalaChefeAPIClient', autospec=True), \
+             patch('main.ConversationAnalyzer', autospec=True), \
+             patch('main.BusinessAutomation', autospec=True):
             return FalaChefePython()
     
+    @pytest.mark.asyncio
+    async def test_start_prewarms_orchestrator(self, falachefe):
+        """Testa que start() inicializa o orquestrador híbrido."""
+        falachefe.orchestrator.start.return_value = {"active_system": "python", "startup_seconds": 0.1}
+        
+        report = await falachefe.start()
+        
+        assert report["active_system"] == "python"
+        falachefe.orchestrator.start.assert_awaited_once_with(prewarm_fallback=False)
+    
     @pytest.mark.asyncio
     async def test_process_conversation_success(self, falachefe):
         """Testa processamento de conversa com sucesso."""
@@ -56,7 +71,8 @@ class TestFalaChefePython:
         mock_response = {
             "message": "Olá! Sou o Leo, seu agente financeiro. Como posso ajudar?",
             "agent_name": "leo",
-            "success": True
+            "success": True,
+            "system_used": "python"
         }
         
         # Mock do analisador
@@ -67,7 +83,7 @@ class TestFalaChefePython:
         }
         
         # Configura mocks
-        falachefe.agent_squad_orchestrator.process_message.return_value = mock_response
+        falachefe.orchestrator.process_message.return_value = mock_response
         falachefe.conversation_analyzer.analyze_conversation.return_value = mock_analysis
         falachefe.data_processor.update_conversation_data.return_value = None
         
@@ -75,11 +91,14 @@ class TestFalaChefePython:
         result = await falachefe.process_conversation(conversation_data)
         
         # Verifica resultado
-        assert result["processed_by"] == "agent_squad_python"
+        assert result["processed_by"] == "python"
         assert "response" in result
         assert "analysis" in result
         assert result["response"] == mock_response
         assert result["analysis"] == mock_analysis
+        falachefe.orchestrator.process_message.assert_awaited_once_with(
+            "Preciso de ajuda com finanças", "user_123", "session_456", None, "normal"
+        )
     
     @pytest.mark.asyncio
     async def test_process_conversation_with_specific_agent(self, falachefe):
@@ -95,7 +114,8 @@ class TestFalaChefePython:
         mock_response = {
             "message": "Olá! Sou o Max, seu agente de marketing. Vamos criar uma campanha incrível!",
             "agent_name": "max",
-            "success": True
+            "success": True,
+            "system_used": "typescript"
         }
         
         mock_analysis = {
@@ -104,14 +124,15 @@ class TestFalaChefePython:
             "insights": ["Solicitação de marketing detectada"]
         }
         
-        falachefe.agent_squad_orchestrator.process_message_with_specific_agent.return_value = mock_response
+        falachefe.orchestrator.process_message.return_value = mock_response
         falachefe.conversation_analyzer.analyze_conversation.return_value = mock_analysis
         falachefe.data_processor.update_conversation_data.return_value = None
         
         result = await falachefe.process_conversation(conversation_data)
         
-        assert result["processed_by"] == "agent_squad_python"
+        assert result["processed_by"] == "typescript"
         assert result["response"]["agent_name"] == "max"
+        assert falachefe.orchestrator.process_message.await_args.args[3] == "max"
     
     @pytest.mark.asyncio
     async def test_process_conversation_error(self, falachefe):
@@ -124,11 +145,11 @@ class TestFalaChefePython:
         }
         
         # Simula erro no orquestrador
-        falachefe.agent_squad_orchestrator.process_message.side_effect = Exception("Erro de teste")
+        falachefe.orchestrator.process_message.side_effect = Exception("Erro de teste")
         
         result = await falachefe.process_conversation(conversation_data)
         
-        assert result["processed_by"] == "python_fallback"
+        assert result["processed_by"] == "error_fallback"
         assert "error" in result
     
     @pytest.mark.asyncio
@@ -147,9 +168,11 @@ class TestFalaChefePython:
             "recommendations": ["Manter estratégia atual"]
         }
         
-        mock_leo_insights = {
-            "insights": ["Dados financeiros saudáveis"],
-            "recommendations": ["Continuar monitoramento"]
+        mock_leo_response = {
+            "message": "Dados financeiros saudáveis",
+            "agent_name": "leo",
+            "success": True,
+            "system_used": "python"
         }
         
         mock_report = {
@@ -160,7 +183,7 @@ class TestFalaChefePython:
         
         falachefe.data_processor.load_financial_data.return_value = mock_financial_data
         falachefe.data_processor.analyze_financial_data.return_value = mock_analysis
-        falachefe.agent_squad_orchestrator.get_leo_insights.return_value = mock_leo_insights
+        falachefe.orchestrator.process_message.return_value = mock_leo_response
         falachefe.data_processor.generate_financial_report.return_value = mock_report
         
         result = await falachefe.analyze_financial_data(data_source)
@@ -168,17 +191,21 @@ class TestFalaChefePython:
         assert "report_id" in result
         assert "executive_summary" in result
         assert "recommendations" in result
+        assert falachefe.orchestrator.process_message.await_args.args[3] == "leo"
+        falachefe.data_processor.generate_financial_report.assert_awaited_once_with(
+            mock_analysis, {"summary": "Dados financeiros saudáveis", "system_used": "python"}
+        )
     
     @pytest.mark.asyncio
     async def test_health_check(self, falachefe):
         """Testa health check do sistema."""
         mock_health_status = {
-            "orchestrator": "healthy",
+            "status": "healthy",
             "agents": {"leo": "healthy", "max": "healthy", "lia": "healthy"},
             "timestamp": datetime.now().isoformat()
         }
         
-        falachefe.agent_squad_orchestrator.health_check.return_value = mock_health_status
+        falachefe.orchestrator.health_check.return_value = mock_health_status
         falachefe.data_processor.health_check.return_value = {"status": "healthy"}
         falachefe.api_client.health_check.return_value = {"status": "healthy"}
         falachefe.conversation_analyzer.health_check.return_value = {"status": "healthy"}
@@ -187,8 +214,8 @@ class TestFalaChefePython:
         result = await falachefe.health_check()
         
         assert "timestamp" in result
-        assert "status" in result
-        assert "components" in result
+        assert result["status"] == "healthy"
+        assert result["components"]["orchestrator"] == mock_health_status
 
 
 class TestAgentSquadOrchestrator:
@@ -201,25 +228,44 @@ class TestAgentSquadOrchestrator:
         config.openai_api_key = "test_key"
         config.openai_model = "gpt-4"
         config.debug = False
+        config.processing_timeout = 30
+        config.openai_max_connections = 20
+        config.openai_max_keepalive_connections = 10
+        config.openai_keepalive_expiry = 60.0
+        config.openai_request_timeout = 60.0
+        config.local_classifier_enabled = False
+        config.local_classifier_threshold = 0.75
+        config.local_classifier_audit_rate = 0.0
+        config.chat_history_backend = "memory"
+        config.chat_history_max_turns = 6
+        config.chat_history_token_budget = 2000
+        config.chat_history_max_sessions = 1000
+        config.chat_history_idle_ttl = 3600
+        config.agent_leo_financial_enabled = True
+        config.agent_max_marketing_enabled = True
+        config.agent_lia_hr_enabled = True
+        config.agent_model = "gpt-3.5-turbo"
+        config.agent_max_tokens = 800
+        config.get_agent_configs.side_effect = lambda: Config.get_agent_configs(config)
+        config.get_agent_config.return_value = {"max_processing_time": 30}
         return config
     
     @pytest.mark.asyncio
     async def test_process_message_success(self, mock_config):
         """Testa processamento de mensagem com sucesso."""
-        with patch('src.core.agent_squad_orchestrator.AgentSquad'), \
-             patch('src.core.agent_squad_orchestrator.OpenAIClassifier'), \
-             patch('src.core.agent_squad_orchestrator.MemoryStorage'):
+        with patch('src.core.agent_squad_orchestrator.AgentSquad') as agent_squad:
             
-            from src.core.agent_squad_orchestrator import FalaChefeAgentSquadOrchestrator
+            from src.core.agent_squad_orchestrator import FalaChefeAgentSquadOrchestrator, _PooledOpenAIClassifier
+            from src.core.chat_history import WindowedChatStorage
             
             orchestrator = FalaChefeAgentSquadOrchestrator(mock_config)
             
-            # Mock da resposta do Agent Squad
-            mock_response = Mock()
-            mock_response.agent_name = "leo"
-            mock_response.content = "Resposta do Leo"
+            # Classificador pelo pool OpenAI e histórico com janela
+            assert isinstance(agent_squad.call_args.kwargs["classifier"], _PooledOpenAIClassifier)
+            assert isinstance(agent_squad.call_args.kwargs["storage"], WindowedChatStorage)
             
-            orchestrator.agent_squad.route_request.return_value = mock_response
+            # Resposta streaming do Agent Squad atribuída ao Leo
+            orchestrator.agent_squad.route_request = AsyncMock(return_value=self.streamed_response("leo"))
             
             result = await orchestrator.process_message(
                 "Preciso de ajuda financeira",
@@ -229,21 +275,20 @@ class TestAgentSquadOrchestrator:
             
             assert result["success"] is True
             assert result["agent_name"] == "leo"
-            assert "message" in result
+            assert result["message"] == "Resposta do leo"
+            orchestrator.close()
     
     @pytest.mark.asyncio
     async def test_process_message_error(self, mock_config):
         """Testa tratamento de erro no processamento de mensagem."""
-        with patch('src.core.agent_squad_orchestrator.AgentSquad'), \
-             patch('src.core.agent_squad_orchestrator.OpenAIClassifier'), \
-             patch('src.core.agent_squad_orchestrator.MemoryStorage'):
+        with patch('src.core.agent_squad_orchestrator.AgentSquad'):
             
             from src.core.agent_squad_orchestrator import FalaChefeAgentSquadOrchestrator
             
             orchestrator = FalaChefeAgentSquadOrchestrator(mock_config)
             
             # Simula erro
-            orchestrator.agent_squad.route_request.side_effect = Exception("Erro de teste")
+            orchestrator.agent_squad.route_request = AsyncMock(side_effect=Exception("Erro de teste"))
             
             result = await orchestrator.process_message(
                 "Mensagem de teste",
@@ -253,6 +298,804 @@ class TestAgentSquadOrchestrator:
             
             assert result["success"] is False
             assert "error" in result
+            orchestrator.close()
+    
+    @staticmethod
+    def streamed_response(agent_name: str):
+        """Resposta streaming do Agent Squad atribuída a ``agent_name``."""
+        async def output():
+            yield Mock(text="Resposta do ")
+            yield Mock(text=agent_name)
+        
+        response = Mock()
+        response.metadata.agent_name = agent_name
+        response.output = output()
+        return response
+    
+    @pytest.mark.asyncio
+    async def test_local_pre_classifier_bypasses_llm_routing(self, mock_config):
+        """Testa que mensagens óbvias vão direto ao agente e as demais ao classificador LLM."""
+        mock_config.local_classifier_enabled = True
+        with patch('src.core.agent_squad_orchestrator.AgentSquad'):
+            from src.core.agent_squad_orchestrator import FalaChefeAgentSquadOrchestrator
+            
+            orchestrator = FalaChefeAgentSquadOrchestrator(mock_config)
+            squad = orchestrator.agent_squad
+            squad.agent_process_request = AsyncMock(return_value=self.streamed_response("leo"))
+            squad.route_request = AsyncMock(return_value=self.streamed_response("max"))
+            
+            result = await orchestrator.process_message("Como melhorar o fluxo de caixa da empresa?", "user_123", "session_456")
+            
+            assert result["success"] is True
+            assert result["agent_name"] == "leo"
+            assert result["message"] == "Resposta do leo"
+            classifier_result = squad.agent_process_request.call_args.args[3]
+            assert classifier_result.selected_agent is orchestrator.agents["leo"]
+            assert classifier_result.confidence >= 0.75
+            squad.route_request.assert_not_called()
+            
+            # Sem confiança suficiente, o classificador LLM decide
+            result = await orchestrator.process_message("oi, tudo bem?", "user_123", "session_456")
+            
+            assert result["agent_name"] == "max"
+            squad.route_request.assert_awaited_once()
+            
+            stats = (await orchestrator.health_check())["pre_classifier"]
+            assert stats["bypassed"] == 1
+            assert stats["llm_fallbacks"] == 1
+            assert stats["bypass_rate"] == 0.5
+            assert stats["fallback_agreement"] is not None
+    
+    @pytest.mark.asyncio
+    async def test_shadow_calls_skip_learning_and_real_history(self, mock_config):
+        """Testa que chamadas sombra usam histórico descartável e não alimentam pré-classificador, auditoria nem métricas."""
+        mock_config.local_classifier_enabled = True
+        mock_config.local_classifier_audit_rate = 1.0
+        with patch('src.core.agent_squad_orchestrator.AgentSquad', side_effect=lambda **options: Mock(**options)):
+            from src.core.agent_squad_orchestrator import FalaChefeAgentSquadOrchestrator
+            
+            orchestrator = FalaChefeAgentSquadOrchestrator(mock_config)
+            squad = orchestrator.agent_squad
+            squad.agent_process_request = AsyncMock()
+            squad.route_request = AsyncMock()
+            
+            shadow_squad = orchestrator._shadow_squad()
+            assert shadow_squad is not squad
+            assert shadow_squad.storage is not orchestrator.chat_history
+            assert shadow_squad.storage.summarizer is None
+            shadow_squad.agent_process_request = AsyncMock(return_value=self.streamed_response("leo"))
+            shadow_squad.route_request = AsyncMock(return_value=self.streamed_response("max"))
+            
+            for message in ("Como melhorar o fluxo de caixa da empresa?", "oi, tudo bem?"):
+                result = await orchestrator.process_message(message, "user_123", "shadow:session_456", shadow=True)
+                assert result["success"] is True
+            
+            shadow_squad.agent_process_request.assert_awaited_once()
+            shadow_squad.route_request.assert_awaited_once()
+            squad.agent_process_request.assert_not_called()
+            squad.route_request.assert_not_called()
+            assert not orchestrator._background
+            
+            health = await orchestrator.health_check()
+            assert health["pre_classifier"]["bypassed"] == 0
+            assert health["pre_classifier"]["llm_fallbacks"] == 0
+            assert all(stats["count"] == 0 for stats in health["dispatch_latency"].values())
+    
+    @pytest.mark.asyncio
+    async def test_specific_agent_skips_classification(self, mock_config):
+        """Testa que um agente pedido pelo nome é chamado direto, sem classificação."""
+        with patch('src.core.agent_squad_orchestrator.AgentSquad'):
+            from src.core.agent_squad_orchestrator import FalaChefeAgentSquadOrchestrator
+            
+            orchestrator = FalaChefeAgentSquadOrchestrator(mock_config)
+            squad = orchestrator.agent_squad
+            squad.agent_process_request = AsyncMock(return_value=self.streamed_response("lia"))
+            squad.route_request = AsyncMock()
+            squad.classify_request = AsyncMock()
+            
+            result = await orchestrator.process_message_with_specific_agent("Como calcular férias?", "user_123", "session_456", "Lia")
+            
+            assert result["success"] is True
+            assert result["message"] == "Resposta do lia"
+            classifier_result = squad.agent_process_request.call_args.args[3]
+            assert classifier_result.selected_agent is orchestrator.agents["lia"]
+            assert classifier_result.confidence == 1.0
+            squad.route_request.assert_not_called()
+            squad.classify_request.assert_not_called()
+            
+            result = await orchestrator.process_message_with_specific_agent("Oi", "user_123", "session_456", "zeca")
+            assert result["success"] is False
+            
+            latency = (await orchestrator.health_check())["dispatch_latency"]
+            assert latency["direct"]["count"] == 1
+            assert latency["llm_classifier"]["count"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_agents_share_one_openai_client(self, mock_config):
+        """Testa que agentes e classificador usam o mesmo cliente OpenAI (um único pool de conexões)."""
+        with patch('src.core.agent_squad_orchestrator.AgentSquad') as agent_squad:
+            from src.core.agent_squad_orchestrator import FalaChefeAgentSquadOrchestrator
+            
+            orchestrator = FalaChefeAgentSquadOrchestrator(mock_config)
+            shared = orchestrator.openai.client
+            
+            assert all(agent.agent.client is shared for agent in orchestrator.agents.values())
+            assert agent_squad.call_args.kwargs["classifier"].client is shared
+            
+            pool = (await orchestrator.health_check())["openai_pool"]
+            assert pool["max_connections"] == 20
+            assert pool["max_keepalive_connections"] == 10
+            assert pool["connections"] == 0
+            
+            orchestrator.close()
+    
+    @pytest.mark.asyncio
+    async def test_blocking_llm_call_runs_off_the_event_loop(self, mock_config):
+        """Testa que a chamada síncrona do SDK não trava o event loop e que o prazo a interrompe."""
+        import time
+        from src.core.agent_squad_orchestrator import FalaChefeAgentSquadOrchestrator
+        from src.utils.deadline import TIMEOUT_REPLY
+        
+        mock_config.processing_timeout = 0.3
+        orchestrator = FalaChefeAgentSquadOrchestrator(mock_config)
+        timeouts = []
+        ticks = 0
+        
+        def blocking_create(**request):
+            # O SDK síncrono bloqueia a thread que faz a chamada
+            timeouts.append(request.get("timeout"))
+            time.sleep(1)
+            raise RuntimeError("Resposta tarde demais")
+        
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.05)
+                ticks += 1
+        
+        with patch.object(orchestrator.openai.client.chat.completions, "create", side_effect=blocking_create):
+            beat = asyncio.create_task(heartbeat())
+            started = time.perf_counter()
+            result = await orchestrator.process_message_with_specific_agent("Meu fluxo de caixa", "user_123", "session_456", "leo")
+            elapsed = time.perf_counter() - started
+            beat.cancel()
+        
+        assert result["timed_out"] is True
+        assert result["message"] == TIMEOUT_REPLY
+        assert elapsed < 0.8
+        # O event loop seguiu livre enquanto o LLM não respondia
+        assert ticks >= 3
+        # A chamada leva o que resta do prazo como timeout
+        assert 0 < timeouts[0] <= 0.3
+        
+        orchestrator.close()
+    
+    @pytest.mark.asyncio
+    async def test_summary_and_classifier_use_openai_pool(self, mock_config):
+        """Testa que o resumo do histórico e o classificador LLM rodam nas threads do pool, com timeout."""
+        import threading
+        from openai.resources.chat.completions import Completions
+        from agent_squad.types import ConversationMessage
+        from src.core.agent_squad_orchestrator import FalaChefeAgentSquadOrchestrator
+        from src.utils.deadline import deadline_scope
+        
+        orchestrator = FalaChefeAgentSquadOrchestrator(mock_config)
+        calls = []
+        
+        def create(self, **request):
+            # Timeout da chamada ou, sem ele, o do cliente usado
+            calls.append((threading.current_thread().name, request.get("timeout", self._client.timeout)))
+            if "tools" in request:
+                raise RuntimeError("classificador indisponível")
+            response = Mock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = " Resumo da conversa "
+            return response
+        
+        with patch.object(Completions, "create", autospec=True, side_effect=create):
+            summary = await orchestrator._summarize_history(
+                "", [ConversationMessage(role="user", content=[{"text": "Meu fluxo de caixa"}])]
+            )
+            with deadline_scope(0.5), pytest.raises(Exception):
+                await orchestrator.agent_squad.classifier.process_request("Meu fluxo de caixa", [])
+        
+        assert summary == "Resumo da conversa"
+        assert all(thread.startswith("openai") for thread, _ in calls)
+        # Resumo em background: timeout do pool; classificador: o que resta do prazo
+        assert calls[0][1] == orchestrator.openai.timeout
+        assert calls[1][1] is not None and 0 < calls[1][1] <= 0.5
+        
+        orchestrator.close()
+    
+    @pytest.mark.asyncio
+    async def test_agents_created_lazily_and_disabled_skipped(self, mock_config):
+        """Testa que agentes desativados ficam de fora e os ativos só são criados no primeiro uso."""
+        mock_config.agent_max_marketing_enabled = False
+        with patch('src.core.agent_squad_orchestrator.AgentSquad'):
+            from src.core.agent_squad_orchestrator import FalaChefeAgentSquadOrchestrator
+            
+            orchestrator = FalaChefeAgentSquadOrchestrator(mock_config)
+            
+            assert set(orchestrator.agents) == {"leo", "lia"}
+            assert orchestrator.agent_squad.add_agent.call_count == 2
+            assert not any(agent.loaded for agent in orchestrator.agents.values())
+            
+            agents = (await orchestrator.health_check())["agents"]
+            assert agents["leo"]["status"] == "lazy"
+            assert agents["max"]["status"] == "disabled"
+            
+            result = await orchestrator.process_message_with_specific_agent("Nova campanha", "user_123", "session_456", "max")
+            assert result["success"] is False
+            
+            leo = orchestrator.agents["leo"].agent
+            assert leo.inference_config["temperature"] == 0.4
+            assert leo.inference_config["maxTokens"] == 800
+            assert orchestrator.agents["leo"].loaded is True
+            assert orchestrator.agents["lia"].loaded is False
+
+
+class TestHybridOrchestrator:
+    """Testes para o orquestrador híbrido."""
+    
+    @pytest.fixture
+    def mock_config(self):
+        """Mock da configuração."""
+        config = Mock()
+        config.debug = False
+        config.startup_timeout = 5
+        config.processing_timeout = 30
+        config.hedging_enabled = False
+        config.hedge_budget = 0.05
+        config.shadow_sample_rate = 0.0
+        config.shadow_max_concurrency = 4
+        config.shadow_max_per_minute = 60
+        config.shadow_load_threshold = 16
+        config.prewarm_fallback_system = False
+        config.admission_max_in_flight = 32
+        config.admission_max_queue = 64
+        config.admission_queue_timeout = 5.0
+        return config
+    
+    @staticmethod
+    def python_orchestrator(delay: float = 0.0):
+        """Orquestrador Python falso que demora ``delay`` segundos para ser criado."""
+        def build():
+            import time
+            time.sleep(delay)
+            orchestrator = Mock()
+            orchestrator.process_message = AsyncMock(
+                return_value={"message": "Resposta do Leo", "agent_name": "leo", "success": True}
+            )
+            return orchestrator
+        return build
+    
+    @pytest.mark.asyncio
+    async def test_requests_wait_for_startup(self, mock_config):
+        """Testa que mensagens recebidas durante a inicialização aguardam o sistema ficar pronto."""
+        from src.core.hybrid_orchestrator import HybridOrchestrator, AgentSystem
+        
+        # Construção fora de um event loop não dispara inicialização
+        orchestrator = HybridOrchestrator(mock_config, AgentSystem.AUTO)
+        assert orchestrator.is_ready is False
+        
+        with patch.object(orchestrator, "_build_typescript", side_effect=ImportError("sem bridge")), \
+             patch.object(orchestrator, "_build_python", side_effect=self.python_orchestrator(0.2)):
+            start = asyncio.create_task(orchestrator.start())
+            result = await orchestrator.process_message("Meu fluxo de caixa", "user_123", "session_456")
+            report = await start
+        
+        assert result["success"] is True
+        assert result["system_used"] == "python"
+        assert report["ready"] is True
+        assert report["active_system"] == "python"
+        assert report["startup_seconds"] >= 0.2
+        assert "typescript" in report["errors"]
+        
+        health = await orchestrator.health_check()
+        assert health["status"] == "healthy"
+        assert health["details"]["startup"]["startup_seconds"] == report["startup_seconds"]
+    
+    @pytest.mark.asyncio
+    async def test_lazy_startup_follows_prewarm_config(self, mock_config):
+        """Testa que a inicialização disparada por uma mensagem respeita o pré-aquecimento configurado."""
+        from src.core.hybrid_orchestrator import HybridOrchestrator, AgentSystem
+        
+        mock_config.prewarm_fallback_system = True
+        orchestrator = HybridOrchestrator(mock_config, AgentSystem.PYTHON)
+        typescript = Mock()
+        typescript.route_request = AsyncMock(return_value={"message": "Resposta TS", "agent_name": "leo"})
+        
+        with patch.object(orchestrator, "_build_typescript", return_value=typescript), \
+             patch.object(orchestrator, "_build_python", side_effect=self.python_orchestrator()):
+            result = await orchestrator.process_message("Meu fluxo de caixa", "user_123", "session_456")
+        
+        assert result["system_used"] == "python"
+        assert set(orchestrator.systems) == {AgentSystem.PYTHON, AgentSystem.TYPESCRIPT}
+    
+    @pytest.mark.asyncio
+    async def test_switch_system_drains_in_flight_requests(self, mock_config):
+        """Testa troca a quente: requisições em andamento terminam na instância antiga."""
+        from src.core.hybrid_orchestrator import HybridOrchestrator, AgentSystem
+        
+        orchestrator = HybridOrchestrator(mock_config, AgentSystem.PYTHON)
+        
+        old = self.python_orchestrator()()
+        release = asyncio.Event()
+        
+        async def slow_reply(*args):
+            await release.wait()
+            return {"message": "Resposta antiga", "agent_name": "leo", "success": True}
+        
+        old.process_message = AsyncMock(side_effect=slow_reply)
+        new = self.python_orchestrator()()
+        
+        with patch.object(orchestrator, "_build_python", side_effect=[old, new]):
+            await orchestrator.start()
+            in_flight = asyncio.create_task(orchestrator.process_message("Oi", "user_1", "session_1"))
+            await asyncio.sleep(0)
+            
+            switch = asyncio.create_task(orchestrator.switch_system(AgentSystem.PYTHON))
+            while orchestrator.python_orchestrator is not new:
+                await asyncio.sleep(0.01)
+            
+            # Novas requisições já vão para a nova instância enquanto a antiga drena
+            fresh = await orchestrator.process_message("Meu fluxo de caixa", "user_2", "session_2")
+            assert fresh["message"] == "Resposta do Leo"
+            assert not switch.done()
+            
+            release.set()
+            assert await switch is True
+            assert (await in_flight)["message"] == "Resposta antiga"
+        
+        status = await orchestrator.get_system_status()
+        assert status["last_switch"]["drained_requests"] == 1
+        assert status["last_switch"]["dropped_requests"] == 0
+        assert status["in_flight"] == {"python": 0}
+    
+    @pytest.mark.asyncio
+    async def test_switch_between_warm_systems_keeps_peer(self, mock_config):
+        """Testa que trocar entre dois sistemas pré-aquecidos mantém o outro para hedge e sombra."""
+        from src.core.hybrid_orchestrator import HybridOrchestrator, AgentSystem
+        
+        mock_config.hedging_enabled = True
+        mock_config.shadow_sample_rate = 1.0
+        orchestrator = HybridOrchestrator(mock_config, AgentSystem.PYTHON)
+        typescript = Mock()
+        typescript.route_request = AsyncMock(return_value={"message": "Resposta TS", "agent_name": "leo"})
+        python = self.python_orchestrator()()
+        
+        with patch.object(orchestrator, "_build_typescript", return_value=typescript), \
+             patch.object(orchestrator, "_build_python", return_value=python):
+            await orchestrator.start()
+            
+            for target, peer in ((AgentSystem.TYPESCRIPT, AgentSystem.PYTHON), (AgentSystem.PYTHON, AgentSystem.TYPESCRIPT)):
+                assert await orchestrator.switch_system(target) is True
+                assert orchestrator.active_system == target
+                assert set(orchestrator.systems) == {AgentSystem.PYTHON, AgentSystem.TYPESCRIPT}
+                
+                primary = orchestrator.systems[target]
+                assert orchestrator._hedge_target(primary).system == peer
+                task, shadow_system = orchestrator._start_shadow(primary, "Oi", "user_1", "session_1", None)
+                assert shadow_system == peer
+                await task
+        
+        # Instâncias reaproveitadas: nada foi recarregado nem descartado
+        assert orchestrator.python_orchestrator is python
+        assert orchestrator.last_switch["drained_requests"] == 0
+        
+        # Sem hedge, sombra ou AUTO, o sistema anterior sai depois da troca
+        mock_config.hedging_enabled = False
+        orchestrator.shadow.sample_rate = 0.0
+        assert await orchestrator.switch_system(AgentSystem.TYPESCRIPT) is True
+        assert set(orchestrator.systems) == {AgentSystem.TYPESCRIPT}
+    
+    @pytest.mark.asyncio
+    async def test_auto_routing_prefers_faster_system(self, mock_config):
+        """Testa que o modo AUTO move o tráfego para o sistema mais rápido, com sondagem do outro."""
+        from src.core.hybrid_orchestrator import HybridOrchestrator, AgentSystem
+        
+        orchestrator = HybridOrchestrator(mock_config, AgentSystem.AUTO)
+        orchestrator.routing.probe_every = 4
+        
+        async def slow_route(*args):
+            await asyncio.sleep(0.03)
+            return {"message": "Resposta TS", "agent_name": "leo"}
+        
+        typescript = Mock()
+        typescript.route_request = AsyncMock(side_effect=slow_route)
+        
+        with patch.object(orchestrator, "_build_typescript", return_value=typescript), \
+             patch.object(orchestrator, "_build_python", side_effect=self.python_orchestrator()):
+            report = await orchestrator.start(prewarm_fallback=True)
+        assert report["active_system"] == "typescript"
+        
+        for i in range(40):
+            await orchestrator.process_message("Meu fluxo de caixa", "user_123", f"session_{i}")
+        
+        status = await orchestrator.get_system_status()
+        assert status["active_system"] == "python"
+        assert status["routing"]["mode"] == "auto"
+        assert status["routing"]["flips"] == 1
+        assert status["routing"]["probes"] == 10
+        assert status["latency"]["typescript"]["ewma_seconds"] > status["latency"]["python"]["ewma_seconds"]
+        assert status["latency"]["python"]["error_rate"] == 0.0
+    
+    @pytest.mark.asyncio
+    async def test_hedged_request_returns_fastest_system(self, mock_config):
+        """Testa hedge: se o primário passa do p95, o outro sistema responde e o primário é cancelado."""
+        from src.core.hybrid_orchestrator import HybridOrchestrator, AgentSystem
+        
+        mock_config.hedging_enabled = True
+        orchestrator = HybridOrchestrator(mock_config, AgentSystem.PYTHON)
+        orchestrator.hedging.budget = 0.5
+        
+        stall = asyncio.Event()
+        
+        async def python_reply(*args):
+            if stall.is_set():
+                await asyncio.sleep(5)
+            await asyncio.sleep(0.01)
+            return {"message": "Resposta Python", "agent_name": "leo", "success": True}
+        
+        python = Mock()
+        python.process_message = AsyncMock(side_effect=python_reply)
+        typescript = Mock()
+        typescript.route_request = AsyncMock(return_value={"message": "Resposta TS", "agent_name": "leo"})
+        
+        with patch.object(orchestrator, "_build_typescript", return_value=typescript), \
+             patch.object(orchestrator, "_build_python", return_value=python):
+            await orchestrator.start()
+        
+        # Com hedge ligado, o sistema de fallback é carregado mesmo sem pré-aquecimento pedido
+        assert set(orchestrator.systems) == {AgentSystem.PYTHON, AgentSystem.TYPESCRIPT}
+        
+        for i in range(10):
+            result = await orchestrator.process_message("Oi", "user_123", f"session_{i}")
+            assert result["system_used"] == "python"
+        
+        ewma = orchestrator.latency[AgentSystem.PYTHON].ewma
+        stall.set()
+        started = asyncio.get_running_loop().time()
+        result = await orchestrator.process_message("Meu fluxo de caixa", "user_123", "session_x")
+        
+        assert result["system_used"] == "typescript"
+        assert asyncio.get_running_loop().time() - started < 1
+        
+        status = await orchestrator.get_system_status()
+        assert status["hedging"]["hedged"] == 1
+        assert status["hedging"]["hedge_wins"] == 1
+        # O primário cancelado entra só no p95, com o tempo já decorrido: nem
+        # sucesso (EWMA do roteamento) nem erro
+        assert status["latency"]["python"]["count"] == 10
+        assert status["latency"]["python"]["censored"] == 1
+        assert status["latency"]["python"]["errors"] == 0
+        assert status["latency"]["python"]["error_rate"] == 0.0
+        assert orchestrator.latency[AgentSystem.PYTHON].ewma == ewma
+        assert len(orchestrator.latency[AgentSystem.PYTHON]) == 11
+        assert orchestrator.latency[AgentSystem.PYTHON].percentile(100) >= 0.01
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_hedged_request_leaves_no_orphan(self, mock_config):
+        """Testa que cancelar quem aguarda um hedge cancela também a chamada ao primário."""
+        from src.core.hybrid_orchestrator import HybridOrchestrator, AgentSystem
+        
+        mock_config.hedging_enabled = True
+        orchestrator = HybridOrchestrator(mock_config, AgentSystem.PYTHON)
+        entered = asyncio.Event()
+        
+        async def stalled_reply(*args):
+            entered.set()
+            await asyncio.sleep(5)
+        
+        python = self.python_orchestrator()()
+        typescript = Mock()
+        typescript.route_request = AsyncMock(return_value={"message": "Resposta TS", "agent_name": "leo"})
+        with patch.object(orchestrator, "_build_typescript", return_value=typescript), \
+             patch.object(orchestrator, "_build_python", return_value=python):
+            await orchestrator.start()
+        
+        # p95 alto: a requisição fica esperando o primário antes de decidir o hedge
+        for _ in range(orchestrator.hedging.min_samples):
+            orchestrator.latency[AgentSystem.PYTHON].record(1.0)
+        python.process_message = AsyncMock(side_effect=stalled_reply)
+        
+        request = asyncio.create_task(orchestrator.process_message("Oi", "user_123", "session_456"))
+        await entered.wait()
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+        await asyncio.sleep(0.05)
+        
+        status = await orchestrator.get_system_status()
+        assert status["in_flight"]["python"] == 0
+        assert status["latency"]["python"]["censored"] == 1
+        assert status["hedging"]["hedged"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_deadline_cancels_slow_agent_call(self, mock_config):
+        """Testa que o prazo da requisição cancela a chamada lenta e devolve a resposta de fallback."""
+        from src.core.hybrid_orchestrator import HybridOrchestrator, AgentSystem
+        from src.utils.deadline import TIMEOUT_REPLY, deadline_scope, remaining
+        
+        orchestrator = HybridOrchestrator(mock_config, AgentSystem.PYTHON)
+        cancelled = asyncio.Event()
+        budgets = []
+        
+        async def stalled_reply(*args):
+            budgets.append(remaining())
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        
+        python = Mock()
+        python.process_message = AsyncMock(side_effect=stalled_reply)
+        with patch.object(orchestrator, "_build_python", return_value=python):
+            await orchestrator.start()
+        
+        started = asyncio.get_running_loop().time()
+        with deadline_scope(0.2):
+            result = await orchestrator.process_message("Meu fluxo de caixa", "user_123", "session_456")
+        
+        assert asyncio.get_running_loop().time() - started < 1
+        assert result["timed_out"] is True
+        assert result["message"] == TIMEOUT_REPLY
+        assert cancelled.is_set()
+        # O prazo do chamador (0.2s) vale mais que o processing_timeout do orquestrador (30s)
+        assert budgets[0] <= 0.2
+        assert remaining() is None
+        
+        # Prazo esgotado não vira timeout zero (que os clientes HTTP tratam como "sem timeout")
+        from src.utils.deadline import DeadlineExceeded, call_timeout
+        with deadline_scope(0):
+            with pytest.raises(DeadlineExceeded):
+                call_timeout(30)
+    
+    @pytest.mark.asyncio
+    async def test_shadow_traffic_compares_without_blocking(self, mock_config):
+        """Testa tráfego sombra: o sistema inativo é comparado em background, sem atrasar a resposta."""
+        from src.core.hybrid_orchestrator import HybridOrchestrator, AgentSystem
+        
+        mock_config.shadow_sample_rate = 1.0
+        orchestrator = HybridOrchestrator(mock_config, AgentSystem.PYTHON)
+        
+        shadow_sessions = []
+        
+        async def slow_shadow(message, user_id, session_id, agent_name, shadow):
+            assert shadow is True
+            shadow_sessions.append(session_id)
+            await asyncio.sleep(0.2)
+            return {"message": "Resposta TS", "agent_name": "max" if "campanha" in message else "leo"}
+        
+        typescript = Mock()
+        typescript.route_request = AsyncMock(side_effect=slow_shadow)
+        with patch.object(orchestrator, "_build_typescript", return_value=typescript), \
+             patch.object(orchestrator, "_build_python", side_effect=self.python_orchestrator()):
+            await orchestrator.start(prewarm_fallback=True)
+        
+        started = asyncio.get_running_loop().time()
+        for message in ("Meu fluxo de caixa", "Quero uma campanha"):
+            result = await orchestrator.process_message(message, "user_123", "session_456")
+            assert result["system_used"] == "python"
+        assert asyncio.get_running_loop().time() - started < 0.2
+        
+        while orchestrator.shadow.completed < 2:
+            await asyncio.sleep(0.02)
+        
+        report = (await orchestrator.get_system_status())["shadow"]
+        comparison = report["comparisons"]["python->typescript"]
+        assert comparison["requests"] == 2
+        assert comparison["agent_agreement"] == 0.5
+        assert comparison["agent_choices"] == {"leo/leo": 1, "leo/max": 1}
+        assert comparison["shadow_latency"]["ewma_seconds"] > comparison["primary_latency"]["ewma_seconds"]
+        assert shadow_sessions == ["shadow:session_456", "shadow:session_456"]
+        
+        # Sob carga, novas chamadas sombra são recusadas e as em andamento canceladas
+        # (a própria requisição já conta: um limite de 1 pausa o espelhamento)
+        assert orchestrator.shadow.load_threshold == 16
+        orchestrator.shadow.load_threshold = 1
+        await orchestrator.process_message("Meu fluxo de caixa", "user_123", "session_456")
+        assert orchestrator.shadow.report()["skipped"]["load"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_admission_control_sheds_by_priority(self, mock_config):
+        """Testa admissão: fila limitada por prioridade e resposta imediata de alta demanda."""
+        from src.core.hybrid_orchestrator import HybridOrchestrator, AgentSystem
+        from src.core.admission import HIGH_DEMAND_REPLY
+        
+        mock_config.admission_max_in_flight = 1
+        mock_config.admission_max_queue = 1
+        mock_config.admission_queue_timeout = 1.0
+        orchestrator = HybridOrchestrator(mock_config, AgentSystem.PYTHON)
+        
+        async def slow_reply(message, user_id, session_id):
+            await asyncio.sleep(0.3)
+            return {"message": f"Resposta {message}", "agent_name": "leo", "success": True}
+        
+        python = Mock()
+        python.process_message = AsyncMock(side_effect=slow_reply)
+        with patch.object(orchestrator, "_build_python", return_value=python):
+            await orchestrator.start()
+        
+        async def send(message, priority):
+            return await orchestrator.process_message(message, "user_123", "session_456", priority=priority)
+        
+        first = asyncio.create_task(send("A", "normal"))
+        await asyncio.sleep(0.01)
+        low = asyncio.create_task(send("B", "low"))
+        await asyncio.sleep(0.01)
+        # Fila cheia: a mensagem prioritária toma o lugar da de baixa prioridade
+        high = asyncio.create_task(send("C", "high"))
+        await asyncio.sleep(0.01)
+        # Fila cheia de prioridade maior: descarte imediato
+        started = asyncio.get_running_loop().time()
+        rejected = await send("D", "normal")
+        assert asyncio.get_running_loop().time() - started < 0.05
+        
+        results = await asyncio.gather(first, low, high)
+        assert [result["success"] for result in results] == [True, False, True]
+        assert results[1]["message"] == HIGH_DEMAND_REPLY
+        assert rejected["shed"] is True
+        
+        stats = orchestrator.admission.stats()
+        assert stats["shed"] == {"queue_full": 1, "queue_timeout": 0, "evicted": 1}
+        assert stats["shed_by_priority"] == {"high": 0, "normal": 1, "low": 1}
+        assert stats["queue_wait"]["high"]["ewma_seconds"] >= 0.2
+        assert stats["in_flight"] == 0 and stats["queued"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_stream_message_yields_chunks_as_they_arrive(self, mock_config):
+        """Testa que os trechos chegam ao chamador antes de o agente terminar a resposta."""
+        from src.core.hybrid_orchestrator import HybridOrchestrator, AgentSystem
+        from src.core.streaming import chunk_event, done_event
+        
+        gate = asyncio.Event()
+        
+        async def stream_message(message, user_id, session_id, agent_name=None):
+            yield chunk_event("Seu caixa ", "leo")
+            await gate.wait()
+            yield chunk_event("está saudável.", "leo")
+            yield done_event(agent_name="leo", success=True)
+        
+        python_orchestrator = Mock()
+        python_orchestrator.stream_message = stream_message
+        
+        orchestrator = HybridOrchestrator(mock_config, AgentSystem.PYTHON)
+        with patch.object(orchestrator, "_build_python", return_value=python_orchestrator):
+            await orchestrator.start()
+        
+        events = orchestrator.stream_message("Meu fluxo de caixa", "user_123", "session_456")
+        first = await asyncio.wait_for(events.__anext__(), 1)
+        assert first == {"type": "chunk", "text": "Seu caixa ", "agent_name": "leo"}
+        assert orchestrator.admission.in_flight == 1
+        
+        gate.set()
+        rest = [event async for event in events]
+        assert [event["type"] for event in rest] == ["chunk", "done"]
+        assert rest[-1]["system_used"] == "python"
+        assert rest[-1]["success"] is True
+        assert orchestrator.admission.in_flight == 0
+        assert orchestrator.systems[AgentSystem.PYTHON].in_flight == 0
+    
+    @pytest.mark.asyncio
+    async def test_node_worker_pool_multiplexes_and_restarts(self, tmp_path):
+        """Testa o pool de workers: requisições multiplexadas por frames e reinício de worker morto."""
+        import sys
+        from src.core.node_bridge import NodeWorkerPool
+        
+        # Worker substituto com o mesmo protocolo do scripts/agent-squad-worker.ts
+        worker = tmp_path / "worker.py"
+        worker.write_text(
+            "import json, os, struct, sys, threading, time\n"
+            "out = sys.stdout.buffer\n"
+            "lock = threading.Lock()\n"
+            "def send(message):\n"
+            "    body = json.dumps(message).encode()\n"
+            "    with lock:\n"
+            "        out.write(struct.pack('>I', len(body)) + body); out.flush()\n"
+            "def handle(request):\n"
+            "    params = request['params']\n"
+            "    if request['method'] == 'route':\n"
+            "        time.sleep(0.05)\n"
+            "        send({'id': request['id'], 'result': {'message': params['message'].upper(), 'agent_name': 'leo', 'pid': os.getpid()}})\n"
+            "    else:\n"
+            "        send({'id': request['id'], 'result': {'pong': True}})\n"
+            "send({'event': 'ready'})\n"
+            "while True:\n"
+            "    header = sys.stdin.buffer.read(4)\n"
+            "    if len(header) < 4:\n"
+            "        break\n"
+            "    request = json.loads(sys.stdin.buffer.read(struct.unpack('>I', header)[0]))\n"
+            "    threading.Thread(target=handle, args=(request,)).start()\n"
+        )
+        
+        pool = NodeWorkerPool(command=[sys.executable, str(worker)], size=2, ping_interval=0)
+        await pool.start()
+        try:
+            started = asyncio.get_running_loop().time()
+            results = await asyncio.gather(*(
+                pool.route_request(f"mensagem {i}", "user_123", "session_456") for i in range(20)
+            ))
+            # 20 chamadas de 50ms em 2 processos: multiplexadas, não sequenciais
+            assert asyncio.get_running_loop().time() - started < 0.5
+            assert [result["message"] for result in results] == [f"MENSAGEM {i}" for i in range(20)]
+            assert len({result["pid"] for result in results}) == 2
+            
+            pool.workers[0].process.kill()
+            while pool.restarts == 0:
+                await asyncio.sleep(0.05)
+            
+            assert await pool.ping() == [True, True]
+            assert (await pool.route_request("oi", "user_123", "session_456"))["message"] == "OI"
+            assert pool.stats()["alive"] == 2
+        finally:
+            await pool.aclose()
+
+
+class TestChatHistory:
+    """Testes para o histórico de conversa limitado."""
+    
+    @pytest.fixture(params=["memory", "sqlite"])
+    def storage_factory(self, request, tmp_path):
+        """Cria o histórico em memória ou em SQLite."""
+        from src.core.chat_history import InMemoryChatHistory, SQLiteChatHistory
+        
+        def build(**kwargs):
+            if request.param == "sqlite":
+                return SQLiteChatHistory(str(tmp_path / "chat_history.db"), **kwargs)
+            return InMemoryChatHistory(**kwargs)
+        return build
+    
+    @pytest.mark.asyncio
+    async def test_window_summary_budget_and_idle_eviction(self, storage_factory):
+        """Testa janela das últimas trocas, resumo em background, orçamento de tokens e descarte de ociosas."""
+        from agent_squad.types import ConversationMessage
+        from src.core.chat_history import SUMMARY_PREFIX, message_text
+        
+        gate = asyncio.Event()
+        
+        async def summarizer(summary, messages):
+            await gate.wait()
+            return f"{len(messages)} mensagens resumidas"
+        
+        def turn(question, answer):
+            return [ConversationMessage(role="user", content=[{"text": question}]),
+                    ConversationMessage(role="assistant", content=[{"text": answer}])]
+        
+        storage = storage_factory(max_turns=2, token_budget=40, idle_ttl=3600, summarizer=summarizer)
+        for i in range(3):
+            await storage.save_chat_messages("user_123", "session_456", "leo", turn(f"pergunta {i}", f"resposta {i}"))
+        
+        # O resumo pendente não atrasa a leitura: só as duas últimas trocas
+        history = await asyncio.wait_for(storage.fetch_chat("user_123", "session_456", "leo"), 1)
+        assert [message_text(message) for message in history] == ["pergunta 1", "resposta 1", "pergunta 2", "resposta 2"]
+        
+        gate.set()
+        await storage.wait_for_summaries()
+        history = await storage.fetch_chat("user_123", "session_456", "leo")
+        assert message_text(history[0]) == f"{SUMMARY_PREFIX}: 2 mensagens resumidas"
+        
+        # Uma troca longa estoura o orçamento: as trocas mais antigas da janela saem
+        await storage.save_chat_messages("user_123", "session_456", "leo", turn("x" * 100, "ok"))
+        await storage.wait_for_summaries()
+        texts = [message_text(message) for message in await storage.fetch_chat("user_123", "session_456", "leo")]
+        assert texts[0].startswith(SUMMARY_PREFIX)
+        assert texts[-2:] == ["x" * 100, "ok"]
+        assert "pergunta 2" not in texts
+        
+        all_chats = await storage.fetch_all_chats("user_123", "session_456")
+        assert message_text(all_chats[-1]) == "[leo] ok"
+        
+        stats = await storage.stats()
+        assert stats["sessions"] == 1
+        assert stats["summaries"] == 2
+        assert stats["trimmed_for_budget"] > 0
+        
+        storage.idle_ttl = 0
+        assert await storage.evict_idle() == 1
+        assert await storage.fetch_chat("user_123", "session_456", "leo") == []
+        storage.close()
 
 
 class TestDataProcessor:
@@ -263,6 +1106,10 @@ class TestDataProcessor:
         """Mock da configuração."""
         config = Mock()
         config.debug = False
+        config.conversation_cache_size = 1000
+        config.conversation_store_size = 5000
+        config.report_cache_size = 16
+        config.report_cache_ttl_seconds = 300
         return config
     
     @pytest.mark.asyncio
@@ -300,6 +1147,372 @@ class TestDataProcessor:
         assert "cash_flow_analysis" in result
         assert "recommendations" in result
 
+    @pytest.mark.asyncio
+    async def test_load_financial_data_from_ledger_file(self, mock_config, tmp_path):
+        """Testa carregamento de ledger CSV/Excel em blocos com cache por mtime."""
+        import pandas as pd
+        from src.core.data_processor import DataProcessor
+
+        mock_config.financial_cache_dir = str(tmp_path / "cache")
+        mock_config.financial_chunk_size = 2
+        processor = DataProcessor(mock_config)
+
+        ledger = pd.DataFrame({
+            "data": ["2025-01-10", "2025-01-20", "2025-02-05", "2025-02-10", "2025-02-15"],
+            "valor": [10000.0, -4000.0, 12000.0, -5000.0, -1000.0],
+            "categoria": ["vendas", "aluguel", "vendas", "Salários", "publicidade"]
+        })
+        csv_path = tmp_path / "ledger.csv"
+        ledger.to_csv(csv_path, index=False)
+
+        result = await processor.load_financial_data(str(csv_path))
+        assert result["revenue"]["current_month"] == 12000.0
+        assert result["revenue"]["growth_rate"] == pytest.approx(0.2)
+        assert result["expenses"]["administrative"] == 5000.0
+        assert result["expenses"]["marketing"] == 1000.0
+        assert result["cash_flow"]["net"] == 6000.0
+        assert result["source"]["rows"] == 5
+
+        # Segunda leitura (inclusive por outro processador) reutiliza o cache,
+        # sem expor o dicionário em cache a alterações do chamador
+        result["cash_flow"]["net"] = 0.0
+        result = await processor.load_financial_data(str(csv_path))
+        assert result["cash_flow"]["net"] == 6000.0
+        assert processor.financial_loader.parse_count == 1
+        other = DataProcessor(mock_config)
+        assert (await other.load_financial_data(str(csv_path)))["cash_flow"]["net"] == 6000.0
+        assert other.financial_loader.parse_count == 0
+
+        excel_path = tmp_path / "ledger.xlsx"
+        ledger.to_excel(excel_path, index=False)
+        result = await processor.load_financial_data(str(excel_path))
+        assert result["expenses"]["total"] == 6000.0
+        
+        # Impostos ficam num grupo próprio, como as deduções da DRE
+        taxes_path = tmp_path / "impostos.csv"
+        pd.DataFrame({
+            "data": ["2025-03-05", "2025-03-20", "2025-03-25"],
+            "valor": [-600.0, -400.0, -300.0],
+            "categoria": ["DAS", "Impostos", "Contabilidade"]
+        }).to_csv(taxes_path, index=False)
+        result = await processor.load_financial_data(str(taxes_path))
+        assert result["expenses"]["taxes"] == 1000.0
+        assert result["expenses"]["administrative"] == 300.0
+
+    @pytest.mark.asyncio
+    async def test_analyze_financial_batch(self, mock_config):
+        """Testa análise financeira vetorizada para vários negócios e meses."""
+        import pandas as pd
+        from src.core.data_processor import DataProcessor
+
+        processor = DataProcessor(mock_config)
+
+        frame = pd.DataFrame({
+            "business_id": ["a", "a", "b", "b"],
+            "period": ["2025-02", "2025-01", "2025-01", "2025-02"],
+            "revenue": [12000.0, 10000.0, 8000.0, 7600.0],
+            "expense_operational": [5000.0, 5000.0, 6000.0, 6000.0],
+            "expense_marketing": [1000.0, 1000.0, 1000.0, 1000.0],
+            "cash_inflow": [12000.0, 10000.0, 8000.0, 7600.0],
+            "cash_outflow": [6000.0, 6000.0, 9000.0, 9000.0]
+        })
+
+        result = await processor.analyze_financial_batch(frame)
+        latest = result[result["period"] == "2025-02"].set_index("business_id")
+
+        assert latest.loc["a", "growth_rate"] == pytest.approx(0.2)
+        assert latest.loc["a", "cash_flow_health"] == "healthy"
+        assert latest.loc["b", "growth_rate"] == pytest.approx(-0.05)
+        assert latest.loc["b", "expense_efficiency"] == "needs_optimization"
+        assert len(latest.loc["b", "recommendations"]) == 3
+
+        single = await processor.analyze_financial_data({"revenue": {"current_month": 50000, "growth_rate": 0.1}})
+        assert single["revenue_analysis"]["projected_annual"] == 600000
+        assert single["expense_analysis"] == {}
+        assert single["recommendations"] == []
+
+    @pytest.mark.asyncio
+    async def test_forecast_financial_batch(self, mock_config):
+        """Testa previsão vetorizada com intervalos para vários negócios."""
+        import numpy as np
+        import pandas as pd
+        from src.core.data_processor import DataProcessor
+
+        processor = DataProcessor(mock_config)
+
+        months = pd.period_range("2023-01", periods=36, freq="M").astype(str)
+        step = np.arange(36)
+        seasonal = 1000 + 20 * step + 100 * np.sin(2 * np.pi * step / 12)
+        frame = pd.DataFrame({
+            "business_id": ["sazonal"] * 36 + ["estavel"] * 36,
+            "period": list(months) * 2,
+            "revenue": np.concatenate([seasonal, np.full(36, 5000.0)]),
+            "expense_total": np.concatenate([seasonal * 0.5, np.full(36, 4000.0)])
+        })
+
+        result = await processor.forecast_financial_batch(frame, horizon=6)
+        assert len(result) == 12
+        assert list(result[result["business_id"] == "sazonal"]["period"])[:2] == ["2026-01", "2026-02"]
+
+        first = result[(result["business_id"] == "sazonal") & (result["step"] == 1)].iloc[0]
+        expected = 1000 + 20 * 36 + 100 * np.sin(2 * np.pi * 36 / 12)
+        assert first["revenue_forecast"] == pytest.approx(expected, rel=0.02)
+        assert first["revenue_lower"] <= first["revenue_forecast"] <= first["revenue_upper"]
+
+        stable = result[result["business_id"] == "estavel"]
+        assert stable["revenue_forecast"].to_numpy() == pytest.approx(5000.0)
+        assert stable["net_forecast"].to_numpy() == pytest.approx(1000.0)
+
+        history = {"periods": ["2025-01", "2025-02", "2025-03"], "revenue": [100.0, 120.0, 140.0], "expenses": [80.0, 85.0, 90.0]}
+        single = await processor.analyze_financial_data({"revenue": {"current_month": 140.0}, "history": history})
+        assert single["forecast"]["periods"][0] == "2025-04"
+        assert single["revenue_analysis"]["projected_annual"] == single["forecast"]["projected_annual_revenue"]
+        assert single["revenue_analysis"]["projected_annual"] > 140.0 * 12
+
+    @pytest.mark.asyncio
+    async def test_simulate_cash_runway(self, mock_config):
+        """Testa simulação de runway com trajetórias Monte Carlo."""
+        from src.core.data_processor import DataProcessor
+
+        processor = DataProcessor(mock_config)
+
+        burning = {
+            "history": {
+                "periods": ["2025-01", "2025-02", "2025-03", "2025-04"],
+                "revenue": [50000.0, 51000.0, 49500.0, 50500.0],
+                "expenses": [60000.0, 60500.0, 59800.0, 60200.0]
+            }
+        }
+        result = await processor.simulate_cash_runway(burning, opening_balance=30000.0, months=12, paths=5000, seed=7)
+        probabilities = result["probability_negative_by_month"]
+
+        assert len(probabilities) == 12
+        assert probabilities[0] < 0.5 < probabilities[-1]
+        assert all(later >= earlier - 0.05 for earlier, later in zip(probabilities, probabilities[1:]))
+        assert 2 <= result["runway_months"]["p50"] <= 5
+        assert result["balance_percentiles"]["p10"][5] <= result["balance_percentiles"]["p90"][5]
+
+        healthy = {"revenue": {"current_month": 50000.0}, "expenses": {"total": 30000.0}, "cash_flow": {"balance": 10000.0}}
+        result = await processor.simulate_cash_runway(healthy, paths=2000, seed=7)
+        assert result["runway_months"] == {"p10": None, "p50": None, "p90": None}
+        assert result["probability_negative_within_horizon"] < 0.05
+
+    @pytest.mark.asyncio
+    async def test_financial_statements_from_ledger(self, mock_config):
+        """Testa DRE e fluxo de caixa a partir do ledger, com atualização incremental."""
+        import pandas as pd
+        from src.core.data_processor import DataProcessor
+
+        mock_config.financial_chunk_size = 1000
+        processor = DataProcessor(mock_config)
+
+        ledger = pd.DataFrame({
+            "empresa": ["padaria"] * 6 + ["oficina"],
+            "data": ["05/01/2025", "10/01/2025", "15/01/2025", "20/01/2025", "25/01/2025", "03/02/2025", "05/01/2025"],
+            "valor": [10000.0, -600.0, -3000.0, -2000.0, 5000.0, -4000.0, 7000.0],
+            "categoria": ["Vendas", "Simples Nacional", "Fornecedores", "Salários", "Empréstimo", "Equipamentos", "Serviços"]
+        })
+        result = await processor.append_ledger(ledger)
+        assert result["appended"] == 7
+        assert result["businesses"] == 2
+
+        statements = await processor.build_financial_statements("padaria", opening_balance=1000.0)
+        january = statements["income_statement"].loc[("padaria", "2025-01")]
+        assert january["net_revenue"] == pytest.approx(9400.0)
+        assert january["gross_profit"] == pytest.approx(6400.0)
+        assert january["net_income"] == pytest.approx(4400.0)
+
+        cash = statements["cash_flow_statement"]
+        assert cash.loc[("padaria", "2025-01"), "financing_net"] == pytest.approx(5000.0)
+        assert cash.loc[("padaria", "2025-02"), "investing_net"] == pytest.approx(-4000.0)
+        assert cash.loc[("padaria", "2025-02"), "closing_balance"] == pytest.approx(6400.0)
+
+        # Novas transações somam aos totais existentes
+        await processor.append_ledger(pd.DataFrame({
+            "empresa": ["padaria"], "data": ["2025-02-10"], "valor": [8000.0], "categoria": ["Vendas"]
+        }))
+        statements = await processor.build_financial_statements("padaria", freq="Q")
+        assert statements["income_statement"].loc[("padaria", "2025Q1"), "gross_revenue"] == pytest.approx(18000.0)
+
+        report = await processor.generate_financial_report({"recommendations": []}, business_id="padaria")
+        assert report["financial_statements"]["period"] == "2025-02"
+        assert report["financial_statements"]["income_statement"]["gross_revenue"] == pytest.approx(8000.0)
+        assert report["financial_statements"]["history"]["net_income"] == [4400.0, 8000.0]
+
+    @pytest.mark.asyncio
+    async def test_categorize_transactions(self, mock_config):
+        """Testa categorização em lote com regras compiladas e cache de descrições."""
+        import pandas as pd
+        from src.core.data_processor import DataProcessor
+
+        processor = DataProcessor(mock_config)
+
+        transactions = pd.DataFrame({
+            "descricao": [
+                "PIX RECEBIDO MARIA 12345",
+                "PIX RECEBIDO MARIA 67890",
+                "Posto Shell 0042 gasolina",
+                "IFOOD *Restaurante",
+                "Conta de luz CEMIG",
+                "Transferência qualquer"
+            ],
+            "valor": [150.0, 80.0, -200.0, -45.0, -320.0, -10.0]
+        })
+        result = await processor.categorize_transactions(transactions)
+
+        assert list(result["category"]) == ["Vendas", "Vendas", "Combustível", "Alimentação", "Energia", "Outras Despesas"]
+        assert list(result["category_type"][:3]) == ["receita", "receita", "despesa"]
+        assert result["category_confidence"].iloc[2] == 1.0
+        assert result["category_confidence"].iloc[3] == pytest.approx(2 / 3, abs=1e-3)
+        assert result["category_confidence"].iloc[-1] == 0.0
+
+        # Dígitos são mascarados: as duas descrições PIX são avaliadas uma vez só
+        stats = processor.categorizer.stats()
+        assert stats["descriptions_processed"] == 6
+        assert stats["descriptions_evaluated"] == 5
+
+        await processor.categorize_transactions(transactions)
+        assert processor.categorizer.stats()["descriptions_evaluated"] == 5
+        assert processor.categorizer.stats()["cache"]["hits"] == 5
+
+        result = await processor.categorize_transactions(pd.DataFrame({"valor": [10.0]}))
+        assert "error" in result
+
+    @pytest.mark.asyncio
+    async def test_financial_report_memoized_by_content(self, mock_config):
+        """Testa cache de relatórios e report_id determinístico pelo conteúdo."""
+        from src.core.data_processor import DataProcessor
+
+        processor = DataProcessor(mock_config)
+
+        financial_data = {
+            "revenue": {"current_month": 50000, "growth_rate": 0.02},
+            "cash_flow": {"inflow": 50000, "outflow": 52000, "net": -2000}
+        }
+        first_analysis = await processor.analyze_financial_data(financial_data)
+        second_analysis = await processor.analyze_financial_data(financial_data)
+        second_analysis["timestamp"] = "2000-01-01T00:00:00"
+
+        first = await processor.generate_financial_report(first_analysis, {"summary": "ok", "score": 7})
+        second = await processor.generate_financial_report(second_analysis, {"score": 7, "summary": "ok"})
+
+        assert first["report_id"].startswith("fin_")
+        assert first["report_id"] == second["report_id"]
+        assert processor.report_cache.stats()["hits"] == 1
+
+        # Cópias independentes: alterar um relatório não afeta o cache
+        second["recommendations"].append("alterado")
+        third = await processor.generate_financial_report(first_analysis, {"summary": "ok", "score": 7})
+        assert "alterado" not in third["recommendations"]
+
+        other = await processor.generate_financial_report(first_analysis, {"summary": "outro"})
+        assert other["report_id"] != first["report_id"]
+        assert processor.report_cache.stats()["size"] == 2
+
+    @pytest.mark.asyncio
+    async def test_conversation_analytics_honors_time_period(self, mock_config):
+        """Testa analytics vetorizados do store colunar respeitando o período."""
+        from src.core.data_processor import DataProcessor
+
+        processor = DataProcessor(mock_config)
+        now = datetime.now().timestamp()
+
+        for index, (agent, days_ago) in enumerate([("leo", 1), ("max", 2), ("leo", 20), ("lia", 60)]):
+            await processor.update_conversation_data(
+                {"id": f"conv_{index}", "user_id": f"user_{index}", "timestamp": now - days_ago * 86400},
+                {"agent_name": agent, "success": True, "processing_time": 1.0 + index},
+                {"message_analysis": {"sentiment": {"label": "positive"}, "intent": {"label": "question"}}}
+            )
+
+        result = await processor.get_conversation_analytics("7d")
+        assert result["total_conversations"] == 2
+        assert result["agent_distribution"] == {"leo": 1, "max": 1, "lia": 0, "unknown": 0}
+        assert result["intent_distribution"] == {"question": 2}
+
+        result = await processor.get_conversation_analytics("90d")
+        assert result["total_conversations"] == 4
+        assert result["agent_distribution"]["leo"] == 2
+
+        # Regravar uma conversa substitui a linha no store em vez de duplicá-la
+        await processor.update_conversation_data(
+            {"id": "conv_0", "user_id": "user_0", "timestamp": now - 86400},
+            {"agent_name": "leo", "success": True, "processing_time": 9.0},
+            {"message_analysis": {}}
+        )
+        assert len(processor.conversation_store) == 4
+        result = await processor.get_conversation_analytics("7d", detailed=True)
+        assert result["conversation_metrics"]["unique_users"] == 2
+
+        # Uma conversa que saiu do cache, mas não do store, não entra duas vezes nas janelas
+        processor.conversation_cache_size = 1
+        for index in range(2):
+            await processor.update_conversation_data(
+                {"id": f"conv_{index}", "user_id": f"user_{index}", "timestamp": now - 86400},
+                {"agent_name": "lia", "success": True},
+                {"message_analysis": {}}
+            )
+        assert "conv_0" not in processor.conversation_cache and "conv_0" in processor.conversation_store
+        result = await processor.get_conversation_analytics("90d")
+        assert result["total_conversations"] == 4
+        assert result["agent_distribution"]["lia"] == 3
+
+        # O store tem tamanho fixo e descarta usuários que saíram dele
+        from src.analytics.conversation_store import ConversationStore
+
+        store = ConversationStore(max_rows=2)
+        for index in range(10):
+            store.upsert(f"conv_{index}", timestamp=now, user=f"user_{index}", agent="leo")
+        assert len(store) == 2
+        users = store.value_counts("user")
+        assert {user: count for user, count in users.items() if count} == {"user_8": 1, "user_9": 1}
+        assert len(users) <= 2 * store.max_rows
+
+    @pytest.mark.asyncio
+    async def test_top_topics_from_messages(self, mock_config):
+        """Testa extração de tópicos por janela, agente e tenant."""
+        from src.core.data_processor import DataProcessor
+        from src.analytics.topic_sketch import SpaceSaving
+
+        processor = DataProcessor(mock_config)
+        now = datetime.now().timestamp()
+        messages = [
+            ("leo", "acme", 1, "Como melhorar meu fluxo de caixa?"),
+            ("leo", "acme", 1, "O fluxo de caixa está negativo este mês"),
+            ("max", "beta", 2, "Quero uma campanha de marketing no Instagram"),
+            ("leo", "beta", 40, "Preciso renegociar o empréstimo do banco")
+        ]
+        for index, (agent, tenant, days_ago, message) in enumerate(messages):
+            await processor.update_conversation_data(
+                {"id": f"conv_{index}", "tenant_id": tenant, "message": message, "timestamp": now - days_ago * 86400},
+                {"agent_name": agent, "success": True},
+                {}
+            )
+
+        result = await processor.get_conversation_analytics("7d")
+        assert result["topics"][0] == "fluxo caixa"
+        assert not any("emprestimo" in topic for topic in result["topics"])
+
+        result = await processor.get_top_topics("90d", agent="leo", limit=20)
+        assert result["topics"][0] == {"topic": "fluxo caixa", "count": 2}
+        assert any("emprestimo" in item["topic"] for item in result["topics"])
+        assert not any("marketing" in item["topic"] for item in result["topics"])
+
+        result = await processor.get_top_topics(tenant="beta")
+        assert "fluxo caixa" not in [item["topic"] for item in result["topics"]]
+        
+        # O período também vale para tenants
+        result = await processor.get_top_topics("7d", tenant="beta")
+        assert any("marketing" in item["topic"] for item in result["topics"])
+        assert not any("emprestimo" in item["topic"] for item in result["topics"])
+        result = await processor.get_top_topics("90d", tenant="beta", limit=20)
+        assert any("emprestimo" in item["topic"] for item in result["topics"])
+
+        # Memória fixa: o sketch nunca passa da capacidade
+        sketch = SpaceSaving(capacity=10)
+        sketch.add(["frequente"] * 200 + [f"raro_{n}" for n in range(500)])
+        assert len(sketch) == 10
+        assert sketch.top_k(1)[0][0] == "frequente"
+
 
 class TestConversationAnalyzer:
     """Testes para o analisador de conversas."""
@@ -308,6 +1521,7 @@ class TestConversationAnalyzer:
     def mock_config(self):
         """Mock da configuração."""
         config = Mock()
+        config.conversation_cache_size = 1000
         return config
     
     @pytest.mark.asyncio
@@ -339,6 +1553,65 @@ class TestConversationAnalyzer:
         assert "insights" in result
         assert "recommendations" in result
     
+    @pytest.mark.asyncio
+    async def test_running_aggregates_follow_cache_eviction(self, mock_config):
+        """Testa agregados incrementais ajustados quando o cache remove análises antigas."""
+        from src.analytics.conversation_analyzer import ConversationAnalyzer
+
+        mock_config.conversation_cache_size = 2
+        analyzer = ConversationAnalyzer(mock_config)
+
+        for index, agent in enumerate(["leo", "max", "lia"]):
+            await analyzer.analyze_conversation(
+                {"id": f"conv_{index}", "message": "Obrigado, excelente!"},
+                {"message": "De nada! Aqui está uma dica.", "agent_name": agent, "success": True}
+            )
+
+        assert len(analyzer.analysis_cache) == 2
+        assert analyzer._get_agent_distribution() == {"leo": 0, "max": 1, "lia": 1, "unknown": 0}
+        assert analyzer._get_sentiment_distribution()["positive"] == 2
+        assert analyzer._get_average_metrics()["avg_success_rate"] == 1.0
+        assert "Agente leo foi selecionado para esta conversa" not in analyzer._get_top_insights()
+
+        # As janelas de tempo não dependem do cache: as 3 conversas estão no período
+        result = await analyzer.get_conversation_analytics("1h")
+        assert result["total_conversations"] == 3
+        assert result["agent_distribution"] == {"leo": 1, "max": 1, "lia": 1, "unknown": 0}
+        
+        # Reanalisar uma conversa em cache substitui a versão anterior nas janelas
+        await analyzer.analyze_conversation(
+            {"id": "conv_2", "message": "Obrigado, excelente!"},
+            {"message": "De nada!", "agent_name": "max", "success": True}
+        )
+        result = await analyzer.get_conversation_analytics("1h")
+        assert result["total_conversations"] == 3
+        assert result["agent_distribution"] == {"leo": 1, "max": 2, "lia": 0, "unknown": 0}
+        assert analyzer._get_agent_distribution() == {"leo": 0, "max": 2, "lia": 0, "unknown": 0}
+
+    def test_rolling_windows_merge_and_expire_buckets(self, mock_config):
+        """Testa janelas por minuto/hora/dia com expiração automática de buckets."""
+        from src.analytics.rolling_windows import RollingWindowAggregates
+        from src.analytics.running_aggregates import ConversationMetrics
+
+        windows = RollingWindowAggregates()
+        now = 1_750_000_000.0
+
+        windows.add(ConversationMetrics(agent="leo", latency=1.0), now - 30)
+        windows.add(ConversationMetrics(agent="max", latency=3.0), now - 5 * 3600)
+        windows.add(ConversationMetrics(agent="lia"), now - 10 * 86400)
+        windows.add(ConversationMetrics(agent="leo"), now - 500 * 86400)  # fora da retenção
+
+        assert windows.window("15m", now=now).count == 1
+        assert windows.window("24h", now=now).agent_distribution() == {"leo": 1, "max": 1, "lia": 0, "unknown": 0}
+        assert windows.window("24h", now=now).averages()["avg_response_time_seconds"] == 2.0
+        assert windows.window("30d", now=now).count == 3
+        assert windows.window("all", now=now).count == 3
+
+        # Um ano depois, os buckets antigos foram reciclados
+        later = now + 400 * 86400
+        windows.add(ConversationMetrics(agent="max"), later)
+        assert windows.window("all", now=later).count == 1
+
     def test_analyze_sentiment(self, mock_config):
         """Testa análise de sentimento."""
         from src.analytics.conversation_analyzer import ConversationAnalyzer